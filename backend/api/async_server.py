@@ -0,0 +1,461 @@
+"""
+Asyncio API Backend for Code Execution
+Serves the compile endpoints on an aiohttp event loop backed by
+AsyncJudge0Compiler, so one process can hold thousands of submissions
+waiting on Judge0 without a thread per request
+
+Run with: python -m backend.api.async_server
+"""
+
+from aiohttp import web
+import asyncio
+import itertools
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compilers.async_judge0_compiler import AsyncJudge0Compiler
+from compilers.judge0_compiler import format_judge0_output, parse_response_fields
+from compilers.judge import parse_cases, run_cases_async
+from compilers.circuit_breaker import CircuitOpenError
+from compilers.quota import QuotaExceeded
+from compilers.connectivity import DEFAULT_PROBE_INTERVAL, DEFAULT_RETRY_INITIAL
+from compilers.language_detection import DEFAULT_MIN_CONFIDENCE, detect, detect_language, normalize_language
+from compilers.metrics import CONTENT_TYPE, REQUESTS, REQUEST_DURATION, request_outcome, render as render_metrics
+from compilers.tracing import current_trace, end_trace, span, start_trace
+from compilers.compression import (DEFAULT_MIN_SIZE as COMPRESS_MIN_SIZE, compress, compress_stream,
+                                   is_compressible, iter_json, negotiate, read_head)
+from fnmatch import fnmatch
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Same frontend origins as the Flask backend
+ALLOWED_ORIGINS = [
+    "http://localhost:8080",  # Vite dev server (default)
+    "http://localhost:5173",  # Vite dev server (alternative)
+    "http://localhost:3000",  # React dev server
+    "http://localhost:4000",  # Alternative frontend port
+    "https://*.railway.app",  # Railway production URLs
+    "https://*.vercel.app",   # Vercel frontend deployment
+    "https://*.netlify.app"   # Netlify frontend deployment
+]
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """Answer CORS preflights and tag responses for allowed origins"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+    else:
+        response = await handler(request)
+    origin = request.headers.get('Origin')
+    if origin and any(fnmatch(origin, allowed) for allowed in ALLOWED_ORIGINS):
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        add_vary(response, 'Origin')
+    return response
+
+def add_vary(response, header):
+    vary = response.headers.get('Vary')
+    response.headers['Vary'] = f'{vary}, {header}' if vary else header
+
+# Bodies at least this large are compressed off the event loop
+COMPRESS_EXECUTOR_SIZE = 256 * 1024
+
+@web.middleware
+async def compression_middleware(request, handler):
+    """Compress text responses of at least COMPRESS_MIN_SIZE bytes in the client's preferred encoding"""
+    response = await handler(request)
+    if (not isinstance(response, web.Response) or not isinstance(response.body, bytes)
+            or 'Content-Encoding' in response.headers or not is_compressible(response.content_type)):
+        return response
+    add_vary(response, 'Accept-Encoding')
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None or len(response.body) < COMPRESS_MIN_SIZE:
+        return response
+    if len(response.body) >= COMPRESS_EXECUTOR_SIZE:
+        response.body = await asyncio.get_running_loop().run_in_executor(None, compress, response.body, encoding)
+    else:
+        response.body = compress(response.body, encoding)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+class CompressedStreamResponse(web.StreamResponse):
+    """
+    Response whose body chunks are compressed as they are written
+
+    The body is produced in write_eof(), after every middleware has set its
+    headers, so middlewares treat it like any other returned response.
+    """
+
+    def __init__(self, chunks, encoding, status=200, content_type='application/json'):
+        super().__init__(status=status, headers={'Content-Type': content_type, 'Content-Encoding': encoding})
+        add_vary(self, 'Accept-Encoding')
+        self._chunks = chunks
+        self._encoding = encoding
+
+    async def write_eof(self, data=b''):
+        if self._chunks is not None:
+            chunks, self._chunks = self._chunks, None
+            for chunk in compress_stream(chunks, self._encoding):
+                await self.write(chunk)
+        await super().write_eof(data)
+
+def json_response(request, payload, status=200):
+    """
+    web.json_response() for responses carrying program output
+
+    When the client accepts compression and the body reaches
+    COMPRESS_MIN_SIZE, it is serialized and compressed chunk by chunk as it
+    is sent, so the JSON text and its compressed copy are never held whole.
+    """
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return web.json_response(payload, status=status)
+    chunks = iter_json(payload)
+    head, complete = read_head(chunks, COMPRESS_MIN_SIZE)
+    if complete:
+        return web.Response(body=head, status=status, content_type='application/json')
+    return CompressedStreamResponse(itertools.chain([head], chunks), encoding, status)
+
+# Routes whose requests are counted, timed and traced per language and outcome
+INSTRUMENTED_ROUTES = {'/api/compile', '/compile', '/api/compile/batch', '/api/judge'}
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    """
+    Count, time and trace execution requests
+
+    Handlers tag the request with its language and whether the program
+    succeeded; the trace follows the request's task under its X-Request-ID.
+    """
+    route = request.match_info.route.resource.canonical if request.match_info.route.resource else None
+    if route not in INSTRUMENTED_ROUTES or request.method != 'POST':
+        return await handler(request)
+    start = time.perf_counter()
+    trace, token = start_trace(f'POST {route}', request.headers.get('X-Request-ID'))
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        response.headers['X-Request-ID'] = trace.request_id
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        language = request.get('language', 'unknown')
+        outcome = request_outcome(status, request.get('succeeded', True))
+        REQUESTS.inc(route, language, outcome)
+        REQUEST_DURATION.observe(time.perf_counter() - start, route, language, outcome)
+        trace.log(status=status, language=language)
+        end_trace(token)
+
+def wants_timing(request, data):
+    """Whether the client asked for the request's trace in a `timing` block"""
+    return request.query.get('timing', '').lower() in ('1', 'true') or (
+        isinstance(data, dict) and data.get('timing') is True
+    )
+
+def response_fields(request, data=None):
+    """The optional response parts a request asked for with ?fields= or "fields" (None for all)"""
+    value = request.query.get('fields')
+    if value is None and isinstance(data, dict):
+        value = data.get('fields')
+    return parse_response_fields(value)
+
+def resolve_language(compiler, code, language):
+    """
+    Detect (when not given), normalize and check a request's language
+
+    Raises:
+        ValueError: When detection is too unsure or the language is unsupported
+    """
+    if not language:
+        with span('detect'):
+            detection = detect(code)
+        if detection.confidence < DEFAULT_MIN_CONFIDENCE:
+            raise ValueError(f'Could not detect the language (best guess "{detection.language}", '
+                             f'confidence {detection.confidence:.2f}). Specify "language" in the request.')
+        language = detection.language
+    language = normalize_language(language)
+
+    supported_languages = compiler.get_supported_languages()
+    if language not in supported_languages:
+        raise ValueError(f'Language "{language}" not supported. Supported: {", ".join(supported_languages)}')
+    return language
+
+def invalid_fields_response(error):
+    return web.json_response({
+        'success': False,
+        'error': str(error)
+    }, status=400)
+
+# Errors that shed a request with a Retry-After hint instead of running it
+RETRY_LATER_ERRORS = (CircuitOpenError, QuotaExceeded)
+
+def retry_later_response(error):
+    """Build the 429/503 response returned when the quota limiter or circuit breaker sheds a request"""
+    logger.warning(f"⚠️ Shedding request: {error}")
+    return web.json_response({
+        'success': False,
+        'error': str(error),
+        'retry_after': error.retry_after
+    }, status=error.status_code, headers={'Retry-After': str(error.retry_after)})
+
+async def api_compile_code(request):
+    """API endpoint to compile and run code using Judge0 API"""
+    compiler = request.app['judge0_compiler']
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+
+        if not data or 'code' not in data:
+            return web.json_response({
+                'success': False,
+                'error': 'No code provided'
+            }, status=400)
+
+        try:
+            fields = response_fields(request, data)
+        except ValueError as e:
+            return invalid_fields_response(e)
+
+        code = data['code']
+        syntax_only = data.get('syntax_only', False)
+        timeout = data.get('timeout', 30)
+        use_cache = data.get('cache', True) is not False
+        stdin = data.get('stdin') or ''
+        try:
+            if not isinstance(stdin, str):
+                raise ValueError('"stdin" must be a string')
+            language = resolve_language(compiler, code, data.get('language'))
+        except ValueError as e:
+            return web.json_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+
+        request['language'] = language
+        logger.info(f"🏛️ Executing {language} code via async Judge0 API")
+
+        if syntax_only:
+            result = await compiler.check_syntax(code, language, use_cache=use_cache)
+        else:
+            result = await compiler.compile_and_run(code, language, timeout, use_cache=use_cache, stdin=stdin)
+        request['succeeded'] = result.success
+
+        with span('format'):
+            response = format_judge0_output(result, language, fields=fields)
+        if wants_timing(request, data):
+            response['timing'] = current_trace().timing()
+        return json_response(request, response)
+
+    except RETRY_LATER_ERRORS as e:
+        return retry_later_response(e)
+    except Exception as e:
+        logger.error(f"❌ Error in compile endpoint: {e}")
+        return web.json_response({
+            'success': False,
+            'output': [],
+            'errors': [str(e)],
+            'exit_code': -1,
+            'execution_time': 0.0,
+            'language': 'unknown',
+            'formatted_output': f"Error: {str(e)}",
+            'compiler': 'Judge0 API'
+        }, status=500)
+
+async def api_compile_batch(request):
+    """API endpoint to compile and run many programs through Judge0 batch submissions"""
+    compiler = request.app['judge0_compiler']
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+
+        if not data or not isinstance(data.get('submissions'), list) or not data['submissions']:
+            return web.json_response({
+                'success': False,
+                'error': 'No submissions provided'
+            }, status=400)
+
+        try:
+            fields = response_fields(request, data)
+        except ValueError as e:
+            return invalid_fields_response(e)
+
+        timeout = data.get('timeout', 30)
+        use_cache = data.get('cache', True) is not False
+
+        submissions = []
+        for item in data['submissions']:
+            item = item if isinstance(item, dict) else {}
+            code = item.get('code', '')
+            submissions.append({
+                'code': code,
+                'language': normalize_language(item.get('language') or detect_language(code)),
+                'timeout': item.get('timeout', timeout),
+                'stdin': item.get('stdin') if isinstance(item.get('stdin'), str) else ''
+            })
+
+        request['language'] = 'batch'
+        results = await compiler.compile_and_run_many(submissions, timeout, use_cache=use_cache)
+        succeeded = sum(1 for result in results if result.success)
+        request['succeeded'] = succeeded == len(results)
+
+        with span('format'):
+            formatted = [
+                format_judge0_output(result, item['language'], fields=fields)
+                for item, result in zip(submissions, results)
+            ]
+        response = {
+            'success': succeeded == len(results),
+            'results': formatted,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'compiler': 'Judge0 API'
+        }
+        if wants_timing(request, data):
+            response['timing'] = current_trace().timing()
+        return json_response(request, response)
+
+    except RETRY_LATER_ERRORS as e:
+        return retry_later_response(e)
+    except Exception as e:
+        logger.error(f"❌ Error in batch compile endpoint: {e}")
+        return web.json_response({
+            'success': False,
+            'error': str(e),
+            'results': [],
+            'compiler': 'Judge0 API'
+        }, status=500)
+
+async def api_judge(request):
+    """API endpoint to run one program against test cases and return per-case verdicts"""
+    compiler = request.app['judge0_compiler']
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+
+        if not data or 'code' not in data:
+            return web.json_response({
+                'success': False,
+                'error': 'No code provided'
+            }, status=400)
+
+        try:
+            cases, options = parse_cases(data)
+            language = resolve_language(compiler, data['code'], data.get('language'))
+        except ValueError as e:
+            return web.json_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+
+        request['language'] = language
+        logger.info(f"⚖️ Judging {language} code against {len(cases)} test cases via async Judge0 API")
+
+        response = await run_cases_async(compiler, data['code'], language, cases, options,
+                                         data.get('timeout', 30), use_cache=data.get('cache', True) is not False)
+        request['succeeded'] = response['success']
+
+        response['language'] = language
+        response['compiler'] = 'Judge0 API'
+        if wants_timing(request, data):
+            response['timing'] = current_trace().timing()
+        return json_response(request, response)
+
+    except RETRY_LATER_ERRORS as e:
+        return retry_later_response(e)
+    except Exception as e:
+        logger.error(f"❌ Error in judge endpoint: {e}")
+        return web.json_response({
+            'success': False,
+            'error': str(e),
+            'cases': [],
+            'compiler': 'Judge0 API'
+        }, status=500)
+
+async def api_health_check(request):
+    """Health check endpoint for the API"""
+    compiler = request.app['judge0_compiler']
+    # Served from the background prober's cached state - no upstream call per hit
+    health = request.app['judge0_health']
+    available = health['available']
+
+    return web.json_response({
+        'status': 'healthy',
+        'execution_mode': 'judge0-async',
+        'message': 'EduRun AI Code Buddy API is running',
+        'compiler': {
+            'type': 'Judge0 API',
+            'status': 'available' if available else 'not available',
+            'platform_compatible': True,
+            'languages': compiler.get_supported_languages(),
+            'in_flight': compiler.get_in_flight(),
+            'last_checked_seconds_ago': (
+                round(time.time() - health['checked_at'], 1) if health['checked_at'] else None
+            ),
+            'polling': compiler.get_polling_stats(),
+            'endpoints': compiler.get_endpoint_stats(),
+            'coalescing': compiler.get_coalescing_stats(),
+            'result_cache': compiler.get_cache_stats()
+        }
+    })
+
+async def probe_judge0(app):
+    """Refresh the cached Judge0 availability, retrying sooner while it is down"""
+    compiler = app['judge0_compiler']
+    health = app['judge0_health']
+    while True:
+        health['available'] = await compiler.is_available()
+        health['checked_at'] = time.time()
+        await asyncio.sleep(DEFAULT_PROBE_INTERVAL if health['available'] else DEFAULT_RETRY_INITIAL)
+
+async def start_health_probe(app):
+    app['judge0_probe'] = asyncio.create_task(probe_judge0(app))
+
+async def stop_health_probe(app):
+    app['judge0_probe'].cancel()
+
+async def api_metrics(request):
+    """Prometheus metrics for requests, Judge0 upstream calls and language detection"""
+    return web.Response(body=render_metrics().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+async def close_compiler(app):
+    await app['judge0_compiler'].close()
+
+def create_app(compiler=None):
+    """Build the aiohttp application"""
+    app = web.Application(middlewares=[cors_middleware, metrics_middleware, compression_middleware], client_max_size=8 * 1024 * 1024)
+    app['judge0_compiler'] = compiler or AsyncJudge0Compiler()
+    app['judge0_health'] = {'available': False, 'checked_at': None}
+    app.on_startup.append(start_health_probe)
+    app.on_cleanup.append(stop_health_probe)
+    app.on_cleanup.append(close_compiler)
+
+    app.router.add_post('/api/compile', api_compile_code)
+    app.router.add_post('/compile', api_compile_code)
+    app.router.add_post('/api/compile/batch', api_compile_batch)
+    app.router.add_post('/api/judge', api_judge)
+    app.router.add_get('/api/health', api_health_check)
+    app.router.add_get('/health', api_health_check)
+    app.router.add_get('/api/metrics', api_metrics)
+    return app
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+
+    logger.info("🚀 Starting async Judge0-Powered Code Execution Backend...")
+    logger.info(f"🌐 Server starting on port {port}")
+    web.run_app(create_app(), host='0.0.0.0', port=port)
@@ -0,0 +1,123 @@
+"""
+Production Serving Entry Point
+Runs the Flask API under gunicorn with threaded workers sized to the number
+of Judge0 submissions expected in flight, initializes the compilers in each
+worker after it forks, and drains in-flight submissions on shutdown
+
+Run with: python -m backend.api.serve
+"""
+
+import math
+import multiprocessing
+import os
+import signal
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_PORT = int(os.environ.get('PORT', 5000))
+DEFAULT_EXPECTED_IN_FLIGHT = int(os.environ.get('WEB_EXPECTED_IN_FLIGHT', 64))
+DEFAULT_WORKERS = int(os.environ.get('WEB_CONCURRENCY', min(2, multiprocessing.cpu_count())))
+DEFAULT_THREADS = int(os.environ.get('WEB_THREADS', 0))
+DEFAULT_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', 120))
+DEFAULT_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+DEFAULT_KEEPALIVE = int(os.environ.get('WEB_KEEPALIVE', 5))
+
+# Request threads kept free for health checks and other quick calls
+SPARE_THREADS = 4
+
+
+def threads_per_worker(workers: int = DEFAULT_WORKERS,
+                       expected_in_flight: int = DEFAULT_EXPECTED_IN_FLIGHT) -> int:
+    """
+    Request threads each worker needs to hold its share of in-flight submissions
+
+    A /api/compile request keeps its thread until Judge0 finishes polling,
+    so threads, not CPU, bound concurrency.
+    """
+    return math.ceil(expected_in_flight / max(1, workers)) + SPARE_THREADS
+
+
+def _web_interface():
+    from . import web_interface
+    return web_interface
+
+
+def post_worker_init(worker):
+    """Create this worker's compilers and start draining on SIGTERM"""
+    web_interface = _web_interface()
+    web_interface.init_compilers()
+
+    # Stop taking submissions (and fail health checks) as soon as the stop
+    # signal arrives, while gunicorn lets the requests in progress finish
+    handle_exit = worker.handle_exit
+
+    def _handle_exit(signum, frame):
+        web_interface.begin_drain()
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, _handle_exit)
+
+
+def worker_exit(server, worker):
+    """Wait for background submissions of the exiting worker before it stops"""
+    web_interface = _web_interface()
+    if web_interface.compilers_initialized:
+        web_interface.shutdown_compilers(timeout=server.cfg.graceful_timeout)
+
+
+def gunicorn_options(port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS) -> dict:
+    """Gunicorn settings for the API"""
+    return {
+        'bind': f'0.0.0.0:{port}',
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': DEFAULT_THREADS or threads_per_worker(workers),
+        'timeout': DEFAULT_TIMEOUT,
+        'graceful_timeout': DEFAULT_GRACEFUL_TIMEOUT,
+        'keepalive': DEFAULT_KEEPALIVE,
+        # Compilers own threads and subprocesses, which don't survive a fork
+        'preload_app': False,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'accesslog': '-',
+    }
+
+
+def main():
+    options = gunicorn_options()
+
+    # One background job worker per request thread, so every request can drive its submission
+    os.environ.setdefault('JOB_WORKERS', str(options['threads']))
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn doesn't run on Windows; fall back to the threaded Flask server
+        logger.warning("⚠️ gunicorn not installed - serving with the threaded Flask server")
+        web_interface = _web_interface()
+        web_interface.init_compilers()
+        try:
+            web_interface.app.run(host='0.0.0.0', port=DEFAULT_PORT, threaded=True)
+        finally:
+            web_interface.shutdown_compilers(timeout=DEFAULT_GRACEFUL_TIMEOUT)
+        return
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return _web_interface().app
+
+    logger.info(f"🚀 Serving on port {DEFAULT_PORT} with {options['workers']} workers x "
+                f"{options['threads']} threads (sized for {DEFAULT_EXPECTED_IN_FLIGHT} in-flight submissions)")
+    ProductionServer().run()
+
+
+if __name__ == '__main__':
+    main()
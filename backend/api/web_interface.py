@@ -4,17 +4,41 @@ Provides REST API endpoints for code compilation and execution using Judge0 API
 Platform-compatible deployment for Railway, Heroku, Vercel, etc.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from compilers.judge0_compiler import Judge0Compiler, format_judge0_output
+from compilers.judge0_compiler import Judge0Compiler, format_judge0_output, parse_response_fields
+from compilers.jobs import Job, JobManager, JobQueueFull
+from compilers.connectivity import ConnectivityMonitor
+from compilers.circuit_breaker import CircuitOpenError
+from compilers.quota import QuotaExceeded
+from compilers.local_compiler import LocalCompiler
+from compilers.judge import parse_cases, run_cases
+from compilers.language_detection import DEFAULT_MIN_CONFIDENCE, detect, detect_language, normalize_language
+from compilers.metrics import CONTENT_TYPE, REQUESTS, REQUEST_DURATION, request_outcome, render as render_metrics
+from compilers.tracing import current_trace, end_trace, span, start_trace
+from compilers.compression import (DEFAULT_MAX_REQUEST_SIZE, DEFAULT_MIN_SIZE as COMPRESS_MIN_SIZE,
+                                   RequestBodyError, compress,
+                                   compress_stream, decompress_request, is_compressible, iter_json,
+                                   negotiate, read_head)
+from werkzeug.wsgi import get_input_stream
+import io
+import itertools
 import json
 import logging
+import queue
+import threading
+import time
+
+# Module import time, for startup timing
+STARTED_AT = time.time()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
+# Bodies are bounded before and after gzip decompression (as client_max_size does for the async server)
+app.config['MAX_CONTENT_LENGTH'] = DEFAULT_MAX_REQUEST_SIZE
 
 # Enable CORS for frontend integration (all origins for development, specific for production)
 CORS(app, origins=[
@@ -34,171 +58,421 @@ logger = logging.getLogger(__name__)
 # Global Judge0 compiler instance
 judge0_compiler = None
 
+# Background check that the Judge0 API is reachable
+judge0_connectivity = None
+
+# Local sandboxed compiler (only created when local execution is enabled)
+local_compiler = None
+
+# Backend used when a request doesn't pick one ('judge0' or 'local')
+DEFAULT_BACKEND = os.environ.get('EXECUTION_BACKEND', 'judge0').lower()
+LOCAL_EXECUTION_ENABLED = (
+    DEFAULT_BACKEND == 'local' or os.environ.get('LOCAL_EXECUTION', 'false').lower() == 'true'
+)
+
+# Bounded background executor that drives every submission
+job_manager = JobManager()
+
+# Compilers are created once, on startup or by the first request
+compilers_initialized = False
+startup_time_ms = None
+_init_lock = threading.Lock()
+
+# Set once the server has been asked to stop; health checks then fail
+draining = False
+
 def init_compilers():
-    """Initialize Judge0 compiler for platform-compatible code execution"""
-    global judge0_compiler
+    """
+    Initialize compilers without any network round trip
     
-    try:
-        judge0_compiler = Judge0Compiler()
-        if judge0_compiler.is_available():
-            supported_langs = judge0_compiler.get_supported_languages()
-            logger.info("✅ Judge0 compiler initialized successfully")
-            logger.info(f"🏛️ Judge0 supports: {', '.join(supported_langs)}")
-            logger.info("🌍 Platform-compatible execution ready!")
-            return True
-        else:
-            logger.error("❌ Judge0 API not accessible - check your API key")
+    The Judge0 compiler is usable immediately; its API connectivity is
+    verified in the background and retried until the API answers, so a
+    cold start never blocks on (or gives up because of) the network.
+    """
+    global judge0_compiler, local_compiler, judge0_connectivity, compilers_initialized, startup_time_ms
+    
+    with _init_lock:
+        if compilers_initialized:
+            return judge0_compiler is not None
+        init_start = time.perf_counter()
+        
+        # Local execution runs code on this host, so it is opt-in
+        if LOCAL_EXECUTION_ENABLED:
+            local_compiler = LocalCompiler()
+            if local_compiler.is_available():
+                logger.info(f"🖥️ Local execution supports: {', '.join(local_compiler.get_supported_languages())}")
+            else:
+                logger.error("❌ Local execution enabled but no toolchains found")
+                local_compiler = None
+        
+        try:
+            judge0_compiler = Judge0Compiler()
+            judge0_connectivity = ConnectivityMonitor(
+                judge0_compiler.connect, name='Judge0 API', probe=judge0_compiler.is_available
+            ).start()
+            logger.info(f"🏛️ Judge0 supports: {', '.join(judge0_compiler.get_supported_languages())}")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize Judge0 compiler: {e}")
             judge0_compiler = None
-            return False
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize Judge0 compiler: {e}")
-        judge0_compiler = None
-        return False
-
-def detect_language(code):
-    """Detect programming language based on code content"""
-    code_lower = code.lower().strip()
-    
-    # C++ indicators
-    cpp_indicators = [
-        '#include <iostream>',
-        '#include<iostream>',
-        'std::cout',
-        'std::cin',
-        'std::endl',
-        'int main()',
-        'int main(',
-        'using namespace std',
-        '#include <vector>',
-        '#include <string>',
-        'cout <<',
-        'cin >>'
-    ]
+        
+        compilers_initialized = True
+        startup_time_ms = round((time.time() - STARTED_AT) * 1000, 1)
+        logger.info(f"⏱️ Compilers initialized in {(time.perf_counter() - init_start) * 1000:.1f} ms "
+                    f"({startup_time_ms:.0f} ms after import)")
+        return judge0_compiler is not None
+
+def begin_drain():
+    """Stop accepting submissions and report unhealthy so the load balancer stops routing here"""
+    global draining
+    if draining:
+        return
+    draining = True
+    job_manager.stop_accepting()
+    logger.info("🛑 Shutdown requested - refusing new submissions")
+
+def shutdown_compilers(timeout=None):
+    """
+    Drain in-flight submissions, then stop background threads and workers
     
-    # JavaScript indicators
-    js_indicators = [
-        'console.log(',
-        'console.error(',
-        'function(',
-        'const ',
-        'let ',
-        'var ',
-        '=>',
-        'document.',
-        'window.',
-        'require(',
-        'module.exports'
-    ]
+    Returns:
+        True if every in-flight submission finished within `timeout` seconds
+    """
+    begin_drain()
+    drained = job_manager.drain(timeout)
+    if not drained:
+        stats = job_manager.stats()
+        logger.warning(f"⚠️ {stats['active'] + stats['inline']} submissions still running at shutdown")
+    job_manager.shutdown(wait=False)
+    if judge0_connectivity:
+        judge0_connectivity.stop()
+    if local_compiler:
+        local_compiler.close()
+    return drained
+
+@app.before_request
+def ensure_compilers():
+    """Initialize compilers on the first request when the app was imported by another server"""
+    if not compilers_initialized:
+        init_compilers()
+
+# Routes whose requests are counted, timed and traced per language and outcome
+INSTRUMENTED_ROUTES = {'/api/compile', '/compile', '/api/compile/stream', '/api/compile/batch', '/api/jobs',
+                       '/api/judge'}
+
+def instrumented_route():
+    """The rule of the current request if it is an instrumented execution request"""
+    route = request.url_rule.rule if request.url_rule else None
+    return route if route in INSTRUMENTED_ROUTES and request.method == 'POST' else None
+
+@app.before_request
+def start_request_trace():
+    """Start timing the request and, for execution requests, a trace under its X-Request-ID"""
+    g.request_started = time.perf_counter()
+    route = instrumented_route()
+    if route:
+        g.trace, g.trace_token = start_trace(f'POST {route}', request.headers.get('X-Request-ID'))
+
+# Execution routes that run in the request thread instead of as jobs
+INLINE_ROUTES = {'/api/compile/batch', '/api/judge'}
+
+@app.before_request
+def hold_inline_request():
+    """Register inline execution requests with the job manager so a shutdown drain waits for them"""
+    route = request.url_rule.rule if request.url_rule else None
+    if route in INLINE_ROUTES and request.method == 'POST':
+        try:
+            job_manager.hold()
+        except JobQueueFull as e:
+            return job_queue_full_response(e)
+        g.inline_held = True
+
+@app.before_request
+def decompress_request_body():
+    """Reject oversized bodies and inflate gzip-encoded ones (large sources) before the routes read them"""
+    limit = app.config['MAX_CONTENT_LENGTH']
+    if (request.content_length or 0) > limit:
+        return jsonify({
+            'success': False,
+            'error': f'Request body exceeds {limit} bytes'
+        }), 413
+    encoding = request.headers.get('Content-Encoding')
+    if not encoding:
+        return None
+    try:
+        # Read at most one byte past the cap so a body without a length stops early too
+        compressed = get_input_stream(request.environ).read(limit + 1)
+        if len(compressed) > limit:
+            raise RequestBodyError(f'Request body exceeds {limit} bytes', 413)
+        body = decompress_request(compressed, encoding, limit)
+    except RequestBodyError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status_code
+    request.environ['wsgi.input'] = io.BytesIO(body)
+    request.environ['CONTENT_LENGTH'] = str(len(body))
+    request.environ.pop('HTTP_CONTENT_ENCODING', None)
+    return None
+
+@app.after_request
+def compress_response(response):
+    """Compress buffered text responses of at least COMPRESS_MIN_SIZE bytes in the client's preferred encoding"""
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or not is_compressible(response.content_type)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if (encoding is None or response.status_code in (204, 304)
+            or (response.content_length or 0) < COMPRESS_MIN_SIZE):
+        return response
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    Count and time execution requests
     
-    # Python indicators
-    python_indicators = [
-        'print(',
-        'import ',
-        'from ',
-        'def ',
-        'class ',
-        'if __name__',
-        'elif',
-        'except:',
-        'try:',
-        '    ',  # Python indentation
-    ]
+    Routes tag the request with `g.language` and `g.succeeded`. Streamed
+    responses are timed up to their headers.
+    """
+    route = instrumented_route()
+    if route:
+        g.status_code = response.status_code
+        response.headers['X-Request-ID'] = g.trace.request_id
+        language = g.get('language', 'unknown')
+        outcome = request_outcome(response.status_code, g.get('succeeded', True))
+        REQUESTS.inc(route, language, outcome)
+        REQUEST_DURATION.observe(time.perf_counter() - g.request_started, route, language, outcome)
+    return response
+
+@app.teardown_request
+def release_inline_request(error=None):
+    """End the job manager's hold on an inline execution request"""
+    if g.pop('inline_held', False):
+        job_manager.release()
+
+@app.teardown_request
+def finish_request_trace(error=None):
+    """Log the request's trace (streamed responses log theirs when the stream ends)"""
+    trace = g.pop('trace', None)
+    if trace is not None:
+        end_trace(g.pop('trace_token'))
+        if not g.get('trace_streamed'):
+            trace.log(status=g.get('status_code', 500), language=g.get('language', 'unknown'))
+
+def response_fields(data=None):
+    """The optional response parts a request asked for with ?fields= or "fields" (None for all)"""
+    value = request.args.get('fields')
+    if value is None and isinstance(data, dict):
+        value = data.get('fields')
+    try:
+        return parse_response_fields(value)
+    except ValueError as e:
+        raise CompileRequestError(str(e))
+
+def json_response(payload, status=200):
+    """
+    jsonify() for responses carrying program output
     
-    # Score each language
-    cpp_score = sum(1 for indicator in cpp_indicators if indicator in code_lower)
-    js_score = sum(1 for indicator in js_indicators if indicator in code_lower)
-    python_score = sum(1 for indicator in python_indicators if indicator in code_lower)
-    
-    # Additional scoring logic
-    if '#include' in code_lower:
-        cpp_score += 3
-    if 'console.log' in code_lower or 'function' in code_lower:
-        js_score += 2
-    if 'print(' in code_lower or 'def ' in code_lower:
-        python_score += 2
-    
-    # Handle edge cases
-    for line in code.split('\n'):
-        line = line.strip()
-        if line.startswith('//'):
-            cpp_score += 1
-            js_score += 1
-        elif line.startswith('#') and not line.startswith('#include'):
-            python_score += 1
-        elif line.endswith(';') and '{' in code:
-            if 'main(' in code_lower:
-                cpp_score += 2
-            else:
-                js_score += 1
-        if ':' in code and not ';' in code:
-            python_score += 1
+    When the client accepts compression and the body reaches
+    COMPRESS_MIN_SIZE, it is serialized and compressed chunk by chunk as it
+    is sent, so the JSON text and its compressed copy are never held whole.
+    """
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return jsonify(payload), status
+    chunks = iter_json(payload, ensure_ascii=app.json.ensure_ascii, sort_keys=app.json.sort_keys,
+                       separators=(',', ':'))
+    head, complete = read_head(chunks, COMPRESS_MIN_SIZE)
+    if complete:
+        return Response(head, status=status, mimetype='application/json')
+    response = Response(compress_stream(itertools.chain([head], chunks), encoding),
+                        status=status, mimetype='application/json')
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def wants_timing(data):
+    """Whether the client asked for the request's trace in a `timing` block"""
+    return request.args.get('timing', '').lower() in ('1', 'true') or (
+        isinstance(data, dict) and data.get('timing') is True
+    )
+
+class CompileRequestError(Exception):
+    """Raised when a compile request body cannot be executed"""
+    
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+def get_compiler(backend):
+    """Return the compiler instance for a backend name, or None if unavailable"""
+    if backend == 'local':
+        return local_compiler
+    if backend == 'judge0':
+        return judge0_compiler
+    return None
+
+def resolve_backend(data):
+    """Pick the execution backend for a request body and return (name, compiler)"""
+    backend = str(data.get('backend') or DEFAULT_BACKEND).lower()
+    if backend not in ('judge0', 'local'):
+        raise CompileRequestError(f'Unknown backend "{backend}". Supported: judge0, local')
+    
+    compiler = get_compiler(backend)
+    if not compiler:
+        if backend == 'local':
+            raise CompileRequestError('Local compiler not available. Set LOCAL_EXECUTION=true on a host with toolchains.', 500)
+        raise CompileRequestError('Judge0 compiler not available. Check API configuration.', 500)
+    return backend, compiler
+
+def parse_compile_request(data):
+    """Validate a compile request body and resolve its language"""
+    if not data or 'code' not in data:
+        raise CompileRequestError('No code provided')
+    
+    code = data['code']
+    language = data.get('language', None)
+    stdin = data.get('stdin') or ''
+    if not isinstance(stdin, str):
+        raise CompileRequestError('"stdin" must be a string')
+    
+    # Auto-detect language if not specified; guesses too weak to trust are
+    # rejected instead of spending a run on the wrong compiler
+    if not language:
+        with span('detect'):
+            detection = detect(code)
+        if detection.confidence < DEFAULT_MIN_CONFIDENCE:
+            raise CompileRequestError(
+                f'Could not detect the language (best guess "{detection.language}", '
+                f'confidence {detection.confidence:.2f}). Specify "language" in the request.'
+            )
+        language = detection.language
+    
+    # Check if the selected backend is available
+    backend, compiler = resolve_backend(data)
+    
+    # Normalize language for Judge0
+    language = normalize_language(language)
+    
+    # Check if the backend supports this language
+    supported_languages = compiler.get_supported_languages()
+    if language not in supported_languages:
+        raise CompileRequestError(
+            f'Language "{language}" not supported. Supported: {", ".join(supported_languages)}'
+        )
     
-    # Return the language with highest score
-    scores = {'cpp': cpp_score, 'js': js_score, 'python': python_score}
-    return max(scores, key=scores.get)
+    # Label this request's metrics
+    g.language = language
+    
+    return {
+        'code': code,
+        'language': language,
+        'backend': backend,
+        'syntax_only': data.get('syntax_only', False),
+        'timeout': data.get('timeout', 30),
+        'stdin': stdin,
+        'use_cache': data.get('cache', True) is not False,
+        'timing': wants_timing(data),
+        'fields': response_fields(data)
+    }
+
+def execute_compile_request(spec, on_status=None):
+    """Run a parsed compile request on its selected compiler"""
+    compiler = get_compiler(spec['backend'])
+    if spec['syntax_only']:
+        return compiler.check_syntax(
+            spec['code'], spec['language'], use_cache=spec['use_cache'], on_status=on_status
+        )
+    return compiler.compile_and_run(
+        spec['code'], spec['language'], spec['timeout'], use_cache=spec['use_cache'], on_status=on_status,
+        stdin=spec['stdin']
+    )
+
+def submit_compile_job(spec):
+    """Queue a parsed compile request on the background job manager"""
+    logger.info(f"🏛️ Executing {spec['language']} code via {spec['backend']} backend")
+    return job_manager.submit(execute_compile_request, spec, language=spec['language'], backend=spec['backend'])
+
+def format_job_result(job, fields=None):
+    """Format a finished job's result with the display name of the backend that ran it"""
+    compiler = get_compiler(job.backend)
+    display_name = compiler.display_name if compiler else 'Judge0 API'
+    return format_judge0_output(job.result, job.language, display_name, fields)
+
+def sse_event(event, data):
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def job_queue_full_response(error):
+    """Build the 503 response returned when the job queue is saturated"""
+    logger.warning(f"⚠️ Rejecting submission: {error}")
+    response = jsonify({
+        'success': False,
+        'error': 'Server busy - too many submissions in progress. Try again shortly.'
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+# Errors that shed a request with a Retry-After hint instead of running it
+RETRY_LATER_ERRORS = (CircuitOpenError, QuotaExceeded)
+
+def retry_later_response(error):
+    """Build the 429/503 response returned when the quota limiter or circuit breaker sheds a request"""
+    logger.warning(f"⚠️ Shedding request: {error}")
+    response = jsonify({
+        'success': False,
+        'error': str(error),
+        'retry_after': error.retry_after
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, error.status_code
 
 # API Routes
 @app.route('/api/compile', methods=['POST'])
 def api_compile_code():
     """API endpoint to compile and run code using Judge0 API"""
     try:
-        data = request.get_json()
-        
-        if not data or 'code' not in data:
+        try:
+            spec = parse_compile_request(request.get_json())
+        except CompileRequestError as e:
             return jsonify({
                 'success': False,
-                'error': 'No code provided'
-            }), 400
-        
-        code = data['code']
-        syntax_only = data.get('syntax_only', False)
-        timeout = data.get('timeout', 30)
-        language = data.get('language', None)
-        
-        # Auto-detect language if not specified
-        if not language:
-            language = detect_language(code)
+                'error': str(e)
+            }), e.status_code
         
+        language = spec['language']
         logger.info(f"📝 Compiling {language} code using Judge0 API")
         
-        # Check if Judge0 is available
-        if not judge0_compiler:
-            return jsonify({
-                'success': False,
-                'error': 'Judge0 compiler not available. Check API configuration.'
-            }), 500
-        
-        # Normalize language for Judge0
-        if language in ['js', 'javascript']:
-            language = 'javascript'
-        elif language in ['cpp', 'c++']:
-            language = 'cpp'
-        
-        # Check if Judge0 supports this language
-        supported_languages = judge0_compiler.get_supported_languages()
-        if language not in supported_languages:
-            return jsonify({
-                'success': False,
-                'error': f'Language "{language}" not supported. Supported: {", ".join(supported_languages)}'
-            }), 400
+        # Execute code on the job executor and wait for it synchronously
+        try:
+            job = submit_compile_job(spec)
+        except JobQueueFull as e:
+            return job_queue_full_response(e)
         
-        logger.info(f"🏛️ Executing {language} code via Judge0 API")
-        
-        # Execute code
-        if syntax_only:
-            result = judge0_compiler.check_syntax(code, language)
-        else:
-            result = judge0_compiler.compile_and_run(code, language, timeout)
+        job.wait()
+        job_manager.discard(job.id)
+        if isinstance(job.exception, RETRY_LATER_ERRORS):
+            return retry_later_response(job.exception)
+        if job.status == Job.FAILED:
+            raise RuntimeError(job.error)
+        result = job.result
+        g.succeeded = result.success
         
         # Format and return response
-        response = format_judge0_output(result, language)
+        with span('format'):
+            response = format_job_result(job, spec['fields'])
+        if spec['timing']:
+            response['timing'] = current_trace().timing()
         
         if result.success:
             logger.info(f"✅ Execution successful - {language}")
         else:
             logger.warning(f"⚠️ Execution failed - {language}")
         
-        return jsonify(response)
+        return json_response(response)
         
     except Exception as e:
         logger.error(f"❌ Error in compile endpoint: {e}")
@@ -213,6 +487,275 @@ def api_compile_code():
             'compiler': 'Judge0 API'
         }), 500
 
+@app.route('/api/compile/stream', methods=['POST'])
+def api_compile_stream():
+    """API endpoint streaming execution progress and the result as Server-Sent Events"""
+    try:
+        spec = parse_compile_request(request.get_json())
+    except CompileRequestError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status_code
+    
+    # Status transitions are handed from the job's worker thread to this response
+    events = queue.Queue()
+    
+    def on_status(event, data):
+        events.put((event, data))
+    
+    def run_and_close(spec):
+        try:
+            return execute_compile_request(spec, on_status)
+        finally:
+            events.put(None)  # End of stream marker
+    
+    logger.info(f"🏛️ Streaming {spec['language']} execution via Judge0 API")
+    try:
+        job = job_manager.submit(run_and_close, spec, language=spec['language'], backend=spec['backend'])
+    except JobQueueFull as e:
+        return job_queue_full_response(e)
+    
+    # The stream outlives this handler, so it finishes the trace itself
+    trace = current_trace()
+    g.trace_streamed = True
+    
+    def stream_events():
+        yield sse_event('accepted', {'job_id': job.id, 'language': job.language})
+        
+        while True:
+            try:
+                item = events.get(timeout=15)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            yield sse_event(*item)
+        
+        job.wait()
+        job_manager.discard(job.id)
+        
+        if isinstance(job.exception, RETRY_LATER_ERRORS):
+            yield sse_event('error', {'success': False, 'errors': [job.error],
+                                      'retry_after': job.exception.retry_after})
+        elif job.status == Job.FAILED:
+            yield sse_event('error', {'success': False, 'errors': [job.error]})
+        else:
+            with trace.span('format'):
+                response = format_job_result(job, spec['fields'])
+            if spec['timing']:
+                response['timing'] = trace.timing()
+            yield sse_event('result', response)
+    
+    def generate():
+        try:
+            yield from stream_events()
+        finally:
+            trace.log(status=200, language=spec['language'])
+    
+    # Each event is flushed through the compressor so progress isn't held back
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    body = stream_with_context(generate())
+    if encoding:
+        body = compress_stream((event.encode('utf-8') for event in body), encoding, flush=True)
+        headers.update({'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+    
+    return Response(body, mimetype='text/event-stream', headers=headers)
+
+@app.route('/api/jobs', methods=['POST'])
+def api_create_job():
+    """API endpoint to queue code for background execution and return a job id"""
+    try:
+        spec = parse_compile_request(request.get_json())
+    except CompileRequestError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status_code
+    
+    try:
+        job = submit_compile_job(spec)
+    except JobQueueFull as e:
+        return job_queue_full_response(e)
+    
+    logger.info(f"📥 Queued {spec['language']} job {job.id}")
+    
+    status_url = f"/api/jobs/{job.id}"
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'language': job.language,
+        'status_url': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """API endpoint to get the status and result of a background job"""
+    job = job_manager.get(job_id)
+    
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': f'Job "{job_id}" not found or expired'
+        }), 404
+    
+    if job.status == Job.FINISHED:
+        try:
+            fields = response_fields()
+        except CompileRequestError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), e.status_code
+        response = format_job_result(job, fields)
+        response.update({'job_id': job.id, 'status': job.status})
+        return json_response(response)
+    
+    if job.status == Job.FAILED:
+        response = jsonify({
+            'success': False,
+            'job_id': job.id,
+            'status': job.status,
+            'output': [],
+            'errors': [job.error],
+            'exit_code': -1,
+            'execution_time': 0.0,
+            'language': job.language,
+            'formatted_output': f"Error: {job.error}",
+            'compiler': 'Judge0 API'
+        })
+        if isinstance(job.exception, RETRY_LATER_ERRORS):
+            response.headers['Retry-After'] = str(job.exception.retry_after)
+        return response
+    
+    return jsonify(job.to_dict())
+
+@app.route('/api/compile/batch', methods=['POST'])
+def api_compile_batch():
+    """API endpoint to compile and run many programs through Judge0 batch submissions"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('submissions'), list) or not data['submissions']:
+            return jsonify({
+                'success': False,
+                'error': 'No submissions provided'
+            }), 400
+        
+        try:
+            backend, compiler = resolve_backend(data)
+            fields = response_fields(data)
+        except CompileRequestError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), e.status_code
+        
+        timeout = data.get('timeout', 30)
+        use_cache = data.get('cache', True) is not False
+        
+        # Resolve each item's language; unsupported ones fail individually
+        submissions = []
+        for item in data['submissions']:
+            item = item if isinstance(item, dict) else {}
+            code = item.get('code', '')
+            language = normalize_language(item.get('language') or detect_language(code))
+            submissions.append({
+                'code': code,
+                'language': language,
+                'timeout': item.get('timeout', timeout),
+                'stdin': item.get('stdin') if isinstance(item.get('stdin'), str) else ''
+            })
+        
+        g.language = 'batch'
+        logger.info(f"🏛️ Executing batch of {len(submissions)} programs via {backend} backend")
+        
+        try:
+            results = compiler.compile_and_run_many(submissions, timeout, use_cache=use_cache)
+        except RETRY_LATER_ERRORS as e:
+            return retry_later_response(e)
+        with span('format'):
+            responses = [
+                format_judge0_output(result, item['language'], compiler.display_name, fields)
+                for item, result in zip(submissions, results)
+            ]
+        succeeded = sum(1 for result in results if result.success)
+        g.succeeded = succeeded == len(results)
+        
+        logger.info(f"✅ Batch finished - {succeeded}/{len(results)} succeeded")
+        
+        response = {
+            'success': succeeded == len(results),
+            'results': responses,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'compiler': compiler.display_name
+        }
+        if wants_timing(data):
+            response['timing'] = current_trace().timing()
+        return json_response(response)
+        
+    except Exception as e:
+        logger.error(f"❌ Error in batch compile endpoint: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'results': [],
+            'compiler': 'Judge0 API'
+        }), 500
+
+@app.route('/api/judge', methods=['POST'])
+def api_judge():
+    """API endpoint to run one program against test cases and return per-case verdicts"""
+    try:
+        data = request.get_json()
+        try:
+            spec = parse_compile_request(data)
+            cases, options = parse_cases(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        except CompileRequestError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), e.status_code
+        
+        compiler = get_compiler(spec['backend'])
+        logger.info(f"⚖️ Judging {spec['language']} code against {len(cases)} test cases via {spec['backend']} backend")
+        
+        try:
+            response = run_cases(compiler, spec['code'], spec['language'], cases, options,
+                                 spec['timeout'], use_cache=spec['use_cache'])
+        except RETRY_LATER_ERRORS as e:
+            return retry_later_response(e)
+        g.succeeded = response['success']
+        
+        logger.info(f"✅ Judging finished - {response['verdict']} ({response['passed']}/{response['total']} passed)")
+        
+        response['language'] = spec['language']
+        response['compiler'] = compiler.display_name
+        if spec['timing']:
+            response['timing'] = current_trace().timing()
+        return json_response(response)
+        
+    except Exception as e:
+        logger.error(f"❌ Error in judge endpoint: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'cases': [],
+            'compiler': 'Judge0 API'
+        }), 500
+
 # Legacy endpoint for backward compatibility
 @app.route('/compile', methods=['POST'])
 def compile_code():
@@ -224,25 +767,49 @@ def api_health_check():
     """Health check endpoint for the API"""
     global judge0_compiler
     
-    judge0_status = "available" if judge0_compiler and judge0_compiler.is_available() else "not available"
+    # Served from the background prober's cached state - no upstream call per hit
+    judge0_status = "available" if judge0_connectivity and judge0_connectivity.connected else "not available"
     
-    return jsonify({
-        'status': 'healthy',
+    response = jsonify({
+        'status': 'draining' if draining else 'healthy',
         'execution_mode': 'judge0',
         'message': 'EduRun AI Code Buddy API is running',
         'compiler': {
             'type': 'Judge0 API',
             'status': judge0_status,
             'platform_compatible': True,
-            'languages': judge0_compiler.get_supported_languages() if judge0_compiler else []
-        }
+            'languages': judge0_compiler.get_supported_languages() if judge0_compiler else [],
+            'http_pool': judge0_compiler.get_pool_stats() if judge0_compiler else None,
+            'polling': judge0_compiler.get_polling_stats() if judge0_compiler else None,
+            'result_cache': judge0_compiler.get_cache_stats() if judge0_compiler else None,
+            'local_syntax_check': judge0_compiler.syntax_checker.get_checked_languages() if judge0_compiler else [],
+            'connectivity': judge0_connectivity.stats() if judge0_connectivity else None,
+            'endpoints': judge0_compiler.get_endpoint_stats() if judge0_compiler else [],
+            'coalescing': judge0_compiler.get_coalescing_stats() if judge0_compiler else None
+        },
+        'startup_time_ms': startup_time_ms,
+        'default_backend': DEFAULT_BACKEND,
+        'local': {
+            'enabled': LOCAL_EXECUTION_ENABLED,
+            'status': 'available' if local_compiler and local_compiler.is_available() else 'not available',
+            'toolchains': local_compiler.get_toolchains() if local_compiler else {},
+            'warm_pool': local_compiler.get_warm_pool_stats() if local_compiler else None,
+            'artifact_cache': local_compiler.get_artifact_cache_stats() if local_compiler else None
+        },
+        'jobs': job_manager.stats()
     })
+    return response, 503 if draining else 200
 
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
     return api_health_check()
 
+@app.route('/api/metrics')
+def api_metrics():
+    """Prometheus metrics for requests, Judge0 upstream calls and language detection"""
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
 @app.route('/api/languages')
 def api_supported_languages():
     """Get list of supported languages"""
@@ -289,13 +856,14 @@ def api_supported_languages():
     })
 
 if __name__ == '__main__':
-    # Production configuration for Railway/Heroku/Render
+    # Development server; production deployments run `python -m backend.api.serve`
     port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_ENV') != 'production'
+    debug = os.environ.get('FLASK_ENV') == 'development'
     
     # Initialize Judge0 compiler on startup
     logger.info("🚀 Starting Judge0-Powered Code Execution Backend...")
     
+    # Returns immediately; Judge0 connectivity is verified in the background
     if init_compilers():
         logger.info("✅ Judge0 compiler initialized successfully")
         if judge0_compiler:
@@ -305,12 +873,17 @@ if __name__ == '__main__':
         logger.info("🔧 API Base URL: /api")
         logger.info("📖 Available endpoints:")
         logger.info("   POST /api/compile - Compile and run code via Judge0")
+        logger.info("   POST /api/compile/batch - Run many programs in Judge0 batches")
+        logger.info("   POST /api/compile/stream - Stream execution progress (SSE)")
+        logger.info("   POST /api/judge - Judge code against test cases")
+        logger.info("   POST /api/jobs - Queue code for background execution")
+        logger.info("   GET  /api/jobs/<id> - Background job status and result")
         logger.info("   GET  /api/health  - Health check")
         logger.info("   GET  /api/languages - Supported languages")
         logger.info("🏛️ Powered by Judge0 API - Platform Compatible!")
         app.run(debug=debug, host='0.0.0.0', port=port)
     else:
         logger.error("❌ Judge0 compiler initialization failed")
-        logger.error("🔑 Check your Judge0 API key and internet connection")
+        logger.error("🔑 Check your Judge0 API configuration")
         logger.info("🔄 Starting server anyway for debugging...")
         app.run(debug=debug, host='0.0.0.0', port=port)
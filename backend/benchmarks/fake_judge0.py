@@ -0,0 +1,317 @@
+"""
+Local Judge0 Stand-In
+A small HTTP server speaking the subset of the Judge0 API the compilers use
+(single and batch submissions, wait=true, status polling, /about and
+/languages), with configurable queue delay, processing time, error and 429
+rates. It never runs code, so benchmarks can load the backend without
+spending RapidAPI quota. Request counters are served from /bench/stats.
+
+Run with: python -m backend.benchmarks.fake_judge0 [--port 2358] [--queue-delay 0.05] [--processing-time 0.2]
+"""
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+# Judge0 status ids
+IN_QUEUE, PROCESSING, ACCEPTED = 1, 2, 3
+
+# Finished submissions are forgotten after this many seconds
+SUBMISSION_TTL = 300
+
+
+class FakeJudge0:
+    """
+    Threaded fake Judge0 server
+
+    A submission reports In Queue for `queue_delay` seconds, then Processing
+    for `processing_time` seconds, then Accepted with stdout echoing its
+    stdin (or `output_bytes` of filler). Each API request fails with HTTP
+    500 with probability `error_rate` and with 429 (plus Retry-After) with
+    probability `throttle_rate`.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, queue_delay: float = 0.0,
+                 processing_time: float = 0.1, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1, wait_enabled: bool = True,
+                 output_bytes: int = 0, seed: Optional[int] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            queue_delay: Seconds a submission stays In Queue
+            processing_time: Seconds a submission stays Processing
+            jitter: Random extra fraction of both delays (0.5 = up to +50%)
+            error_rate: Probability of answering a request with HTTP 500
+            throttle_rate: Probability of answering a request with HTTP 429
+            retry_after: Retry-After seconds sent with 429 answers
+            wait_enabled: Accept wait=true submissions (like ENABLE_WAIT_RESULT)
+            output_bytes: Size of the stdout of programs run without stdin
+            seed: Seed for the delay jitter and failure injection
+        """
+        self.queue_delay = queue_delay
+        self.processing_time = processing_time
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.wait_enabled = wait_enabled
+        self.output_bytes = output_bytes
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._submissions = {}
+        self._requests = Counter()
+        self._statuses = Counter()
+        self._created = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeJudge0':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-judge0', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> dict:
+        """Requests served per route, response statuses and bytes transferred"""
+        with self._lock:
+            return {
+                'requests': sum(self._requests.values()),
+                'routes': dict(self._requests),
+                'statuses': dict(self._statuses),
+                'submissions': self._created,
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._requests.clear()
+            self._statuses.clear()
+            self._created = 0
+            self._bytes_in = 0
+            self._bytes_out = 0
+
+    def _delay(self, seconds: float) -> float:
+        return seconds * (1 + self._random.random() * self.jitter) if self.jitter else seconds
+
+    def _create(self, body: dict, encoded: bool) -> str:
+        stdin = body.get('stdin') or ''
+        if encoded and stdin:
+            stdin = base64.b64decode(stdin).decode('utf-8', errors='replace')
+        now = time.monotonic()
+        token = uuid.uuid4().hex
+        with self._lock:
+            queued_until = now + self._delay(self.queue_delay)
+            self._submissions[token] = {
+                'queued_until': queued_until,
+                'done_at': queued_until + self._delay(self.processing_time),
+                'stdout': stdin or ('x' * (self.output_bytes - 1) + '\n' if self.output_bytes else 'Hello, World!\n'),
+            }
+            self._created += 1
+            if self._created % 1000 == 0:
+                self._expire(now)
+        return token
+
+    def _expire(self, now: float):
+        expired = [token for token, submission in self._submissions.items()
+                   if now - submission['done_at'] > SUBMISSION_TTL]
+        for token in expired:
+            del self._submissions[token]
+
+    def _view(self, token: str, encoded: bool, fields: Optional[list] = None) -> Optional[dict]:
+        submission = self._submissions.get(token)
+        if submission is None:
+            return None
+        now = time.monotonic()
+        if now < submission['queued_until']:
+            status = {'id': IN_QUEUE, 'description': 'In Queue'}
+        elif now < submission['done_at']:
+            status = {'id': PROCESSING, 'description': 'Processing'}
+        else:
+            status = {'id': ACCEPTED, 'description': 'Accepted'}
+        done = status['id'] == ACCEPTED
+
+        stdout = submission['stdout'] if done else None
+        if stdout is not None and encoded:
+            stdout = base64.b64encode(stdout.encode()).decode()
+        view = {
+            'token': token,
+            'status': status,
+            'stdout': stdout,
+            'stderr': None,
+            'compile_output': None,
+            'message': None,
+            'exit_code': 0 if done else None,
+            'time': f'{self.processing_time:.3f}' if done else None,
+            'memory': 3200 if done else None,
+        }
+        if fields and '*' not in fields:
+            view = {key: value for key, value in view.items() if key in fields}
+        return view
+
+    def _inject_failure(self) -> Optional[int]:
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.error_rate:
+            return 500
+        if roll < self.error_rate + self.throttle_rate:
+            return 429
+        return None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload, route: Optional[str] = None, headers: Optional[dict] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                if route:
+                    with fake._lock:
+                        fake._requests[route] += 1
+                        fake._statuses[str(status)] += 1
+                        fake._bytes_out += len(body)
+
+            def _read_body(self) -> dict:
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                with fake._lock:
+                    fake._bytes_in += len(raw)
+                return json.loads(raw or b'{}')
+
+            def _route(self, method: str):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                encoded = query.get('base64_encoded', ['false'])[0] == 'true'
+                fields = query['fields'][0].split(',') if 'fields' in query else None
+                path = url.path.rstrip('/')
+
+                if path == '/bench/stats':
+                    return self._send(200, fake.stats())
+                if path == '/bench/reset' and method == 'POST':
+                    fake.reset_stats()
+                    return self._send(200, {'reset': True})
+
+                if path == '/submissions/batch':
+                    route = f'{method} /submissions/batch'
+                elif path.startswith('/submissions/'):
+                    route = f'{method} /submissions/{{token}}'
+                else:
+                    route = f'{method} {path}'
+
+                body = self._read_body() if method == 'POST' else {}
+                failure = fake._inject_failure()
+                if failure == 500:
+                    return self._send(500, {'error': 'Injected upstream failure'}, route)
+                if failure == 429:
+                    return self._send(429, {'message': 'Too many requests'}, route,
+                                      {'Retry-After': str(fake.retry_after)})
+
+                if method == 'GET' and path == '/about':
+                    return self._send(200, {'version': 'fake', 'homepage': 'https://judge0.com'}, route)
+                if method == 'GET' and path == '/languages':
+                    return self._send(200, [{'id': 71, 'name': 'Python (3.8.1)'}], route)
+
+                if method == 'POST' and path == '/submissions':
+                    if query.get('wait', ['false'])[0] == 'true':
+                        if not fake.wait_enabled:
+                            return self._send(400, {'error': 'wait not allowed'}, route)
+                        token = fake._create(body, encoded)
+                        time.sleep(max(0.0, fake._submissions[token]['done_at'] - time.monotonic()))
+                        return self._send(201, fake._view(token, encoded, fields), route)
+                    return self._send(201, {'token': fake._create(body, encoded)}, route)
+
+                if method == 'POST' and path == '/submissions/batch':
+                    tokens = []
+                    for submission in body.get('submissions', []):
+                        if not submission.get('source_code'):
+                            tokens.append({'source_code': ["can't be blank"]})
+                        else:
+                            tokens.append({'token': fake._create(submission, encoded)})
+                    return self._send(201, tokens, route)
+
+                if method == 'GET' and path == '/submissions/batch':
+                    tokens = query.get('tokens', [''])[0].split(',')
+                    return self._send(200, {'submissions': [
+                        fake._view(token, encoded, fields) for token in tokens
+                    ]}, route)
+
+                if method == 'GET' and path.startswith('/submissions/'):
+                    view = fake._view(path.rsplit('/', 1)[-1], encoded, fields)
+                    if view is None:
+                        return self._send(404, {'error': 'Not found'}, route)
+                    return self._send(200, view, route)
+
+                return self._send(404, {'error': 'Not found'}, route)
+
+            def do_GET(self):
+                self._route('GET')
+
+            def do_POST(self):
+                self._route('POST')
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2358)
+    parser.add_argument('--queue-delay', type=float, default=0.0, help='seconds a submission stays In Queue')
+    parser.add_argument('--processing-time', type=float, default=0.1, help='seconds a submission stays Processing')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra fraction of both delays')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of an HTTP 500 answer')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='probability of an HTTP 429 answer')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429')
+    parser.add_argument('--no-wait', action='store_true', help='reject wait=true submissions')
+    parser.add_argument('--output-bytes', type=int, default=0, help='stdout size of programs run without stdin')
+    args = parser.parse_args()
+
+    fake = FakeJudge0(args.host, args.port, args.queue_delay, args.processing_time, args.jitter,
+                      args.error_rate, args.throttle_rate, args.retry_after, not args.no_wait,
+                      args.output_bytes)
+    print(f"Fake Judge0 listening on {fake.url}")
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
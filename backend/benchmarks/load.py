@@ -0,0 +1,392 @@
+"""
+Compile API Load Benchmark
+Starts the local Judge0 stand-in, drives /api/compile (and optionally
+/api/compile/batch) at a target request rate with a mix of languages and
+payload sizes, and reports throughput, latency percentiles, upstream Judge0
+calls per request and memory. Results can be saved as JSON and compared
+against a previous run.
+
+Requests are sent open-loop: each is scheduled at a fixed offset from the
+start and its latency is measured from that scheduled time, so a slow
+server is charged for the requests queued behind it.
+
+Run with: python -m backend.benchmarks.load [--rps 20] [--duration 30] [--json out.json] [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.language_detection import SAMPLES
+
+# Metrics compared by --compare, and whether higher is better
+COMPARED_METRICS = {
+    'throughput_rps': True,
+    'success_rate': True,
+    'latency_ms.p50': False,
+    'latency_ms.p95': False,
+    'latency_ms.p99': False,
+    'upstream.requests_per_request': False,
+    'upstream.bytes_per_program': False,
+    'memory.peak_rss_mb': False,
+}
+
+
+def parse_mix(value: str) -> dict:
+    """Parse 'python:5,cpp:2' (or 'python,cpp') into weights"""
+    mix = {}
+    for entry in value.split(','):
+        name, _, weight = entry.partition(':')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def make_program(language: str, size: int, unique: Optional[int]) -> str:
+    """
+    A runnable sample program padded with comments to about `size` characters
+
+    `unique` is embedded in the padding so distinct requests miss the result
+    cache and request coalescing; None yields the same program every time.
+    """
+    first, _, rest = SAMPLES[language][0].partition('\n')
+    marker = '#' if language in ('python', 'ruby') else '//'
+    header = f"{marker} request {unique if unique is not None else 'shared'}\n"
+    filler = f"{marker} {'x' * 70}\n"
+    padding = header + filler * max(0, (size - len(first) - len(rest) - len(header)) // len(filler))
+    return f"{first}\n{padding}{rest}"
+
+
+class Target:
+    """Sends compile requests to the in-process Flask app or to a running server"""
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url.rstrip('/') if url else None
+        self._local = threading.local()
+
+    def post(self, path: str, body: dict) -> tuple:
+        """POST a JSON body, returning (status code, response JSON or None)"""
+        if self.url:
+            session = getattr(self._local, 'session', None)
+            if session is None:
+                session = self._local.session = requests.Session()
+            response = session.post(self.url + path, json=body, timeout=120)
+            try:
+                return response.status_code, response.json()
+            except ValueError:
+                return response.status_code, None
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            from api.web_interface import app
+            client = self._local.client = app.test_client()
+        response = client.post(path, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+
+def start_fake_judge0(args) -> tuple:
+    """Start the Judge0 stand-in in a child process, returning (process, url)"""
+    command = [
+        sys.executable, '-m', 'benchmarks.fake_judge0', '--port', '0',
+        '--queue-delay', str(args.queue_delay), '--processing-time', str(args.processing_time),
+        '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+        '--throttle-rate', str(args.throttle_rate), '--output-bytes', str(args.output_bytes),
+    ]
+    if args.no_wait:
+        command.append('--no-wait')
+    process = subprocess.Popen(
+        command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE, text=True
+    )
+    # The stand-in announces its address once it is listening
+    line = process.stdout.readline()
+    if 'listening on' not in line:
+        process.kill()
+        raise RuntimeError(f"Fake Judge0 failed to start: {line!r}")
+    return process, line.rsplit(' ', 1)[-1].strip()
+
+
+def configure_app(fake_url: str, args):
+    """Point the in-process app at the stand-in and initialize its compilers"""
+    endpoint = {'name': 'fake', 'url': fake_url}
+    if args.quota_rps:
+        # A key makes the endpoint paced like a RapidAPI plan
+        endpoint.update(key='benchmark', rps=args.quota_rps)
+    os.environ['JUDGE0_ENDPOINTS'] = json.dumps([endpoint])
+
+    from api import web_interface
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    web_interface.init_compilers()
+    return web_interface
+
+
+def upstream_stats(fake_url: str, reset: bool = False) -> dict:
+    if reset:
+        return requests.post(f'{fake_url}/bench/reset', timeout=5).json()
+    return requests.get(f'{fake_url}/bench/stats', timeout=5).json()
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+
+
+def run_load(target: Target, args) -> List[dict]:
+    """Send requests on an open-loop schedule and record each outcome"""
+    languages = parse_mix(args.languages)
+    sizes = parse_mix(args.sizes)
+    chooser = random.Random(args.seed)
+    total = int(args.rps * args.duration)
+
+    plan = []
+    for index in range(total):
+        language = chooser.choices(list(languages), list(languages.values()))[0]
+        size = int(chooser.choices(list(sizes), list(sizes.values()))[0])
+        unique = None if chooser.random() < args.repeat_ratio else index
+        if chooser.random() < args.batch_ratio:
+            body = {'submissions': [
+                {'code': make_program(language, size, None if unique is None else f'{unique}.{item}'),
+                 'language': language}
+                for item in range(args.batch_size)
+            ]}
+            plan.append(('batch', language, size, '/api/compile/batch', body))
+            continue
+        body = {'code': make_program(language, size, unique)}
+        # Leaving the language out exercises detection on the request path
+        if chooser.random() >= args.detect_ratio:
+            body['language'] = language
+        plan.append(('compile', language, size, '/api/compile', body))
+
+    records = []
+    records_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def send(offset: float, kind: str, language: str, size: int, path: str, body: dict):
+        try:
+            status, payload = target.post(path, body)
+            error = None
+        except Exception as e:
+            status, payload, error = 0, None, str(e)
+        latency = time.perf_counter() - started - offset
+        if kind == 'batch':
+            success = status == 200 and bool(payload) and all(
+                result.get('success') for result in payload.get('results', [])
+            )
+        else:
+            success = status == 200 and bool(payload) and payload.get('success') is True
+        with records_lock:
+            records.append({
+                'kind': kind, 'language': language, 'size': size, 'status': status,
+                'success': success, 'latency': latency, 'error': error,
+            })
+
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix='load') as pool:
+        for index, request in enumerate(plan):
+            offset = index / args.rps
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, offset, *request)
+    return records
+
+
+def summarize(records: List[dict], elapsed: float) -> dict:
+    latencies = sorted(record['latency'] * 1000 for record in records)
+
+    def distribution(values: List[float]) -> dict:
+        return {
+            'p50': round(percentile(values, 0.50), 1),
+            'p95': round(percentile(values, 0.95), 1),
+            'p99': round(percentile(values, 0.99), 1),
+            'max': round(values[-1], 1) if values else 0.0,
+            'mean': round(sum(values) / len(values), 1) if values else 0.0,
+        }
+
+    by_language = defaultdict(list)
+    by_size = defaultdict(list)
+    for record in records:
+        by_language[record['language']].append(record['latency'] * 1000)
+        by_size[record['size']].append(record['latency'] * 1000)
+
+    successes = sum(1 for record in records if record['success'])
+    return {
+        'requests': len(records),
+        'elapsed_s': round(elapsed, 2),
+        'throughput_rps': round(len(records) / elapsed, 2) if elapsed else 0.0,
+        'success_rate': round(successes / len(records), 4) if records else 0.0,
+        'statuses': dict(Counter(str(record['status']) for record in records)),
+        'errors': dict(Counter(record['error'] for record in records if record['error'])),
+        'latency_ms': distribution(latencies),
+        'latency_ms_by_language': {
+            language: distribution(sorted(values)) for language, values in sorted(by_language.items())
+        },
+        'latency_ms_by_size': {
+            str(size): distribution(sorted(values)) for size, values in sorted(by_size.items())
+        },
+    }
+
+
+def lookup(report: dict, path: str):
+    for key in path.split('.'):
+        report = report.get(key) if isinstance(report, dict) else None
+    return report
+
+
+def compare(report: dict, baseline: dict):
+    print(f"\n{'metric':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        old, new = lookup(baseline, metric), lookup(report, metric)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        flag = '  ⚠️' if worse and abs(change) > 0.1 else ''
+        print(f"{metric:<32}{old:>12}{new:>12}{change:>+9.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    load = parser.add_argument_group('load')
+    load.add_argument('--rps', type=float, default=20.0, help='target requests per second')
+    load.add_argument('--duration', type=float, default=15.0, help='seconds of load')
+    load.add_argument('--concurrency', type=int, default=64, help='most requests in flight at once')
+    load.add_argument('--languages', default='python:5,javascript:2,cpp:2,java:1',
+                      help='language mix as name:weight pairs')
+    load.add_argument('--sizes', default='200:6,2000:3,20000:1',
+                      help='source size mix in characters as size:weight pairs')
+    load.add_argument('--detect-ratio', type=float, default=0.1,
+                      help='fraction of compile requests sent without a language')
+    load.add_argument('--repeat-ratio', type=float, default=0.0,
+                      help='fraction of requests reusing a shared program (cache and coalescing hits)')
+    load.add_argument('--batch-ratio', type=float, default=0.0,
+                      help='fraction of requests sent to /api/compile/batch')
+    load.add_argument('--batch-size', type=int, default=5, help='programs per batch request')
+    load.add_argument('--seed', type=int, default=1, help='seed of the request mix')
+    load.add_argument('--url', help='drive a running server instead of the in-process app '
+                                    '(point its Judge0 endpoint at --fake-url)')
+    load.add_argument('--fake-url', help='use an already running fake Judge0 instead of starting one')
+    load.add_argument('--quota-rps', type=float, default=0.0,
+                      help='pace the in-process app like a RapidAPI plan of this many requests per second')
+    load.add_argument('--tracemalloc', action='store_true',
+                      help='also trace Python allocations (slower, in-process only)')
+    load.add_argument('--verbose', action='store_true', help='keep the app INFO logs')
+
+    fake = parser.add_argument_group('fake Judge0')
+    fake.add_argument('--queue-delay', type=float, default=0.05, help='seconds a submission stays In Queue')
+    fake.add_argument('--processing-time', type=float, default=0.2, help='seconds a submission stays Processing')
+    fake.add_argument('--jitter', type=float, default=0.5, help='random extra fraction of both delays')
+    fake.add_argument('--error-rate', type=float, default=0.0, help='probability of an upstream HTTP 500')
+    fake.add_argument('--throttle-rate', type=float, default=0.0, help='probability of an upstream HTTP 429')
+    fake.add_argument('--no-wait', action='store_true', help='reject wait=true submissions')
+    fake.add_argument('--output-bytes', type=int, default=0, help='stdout size of each program')
+
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--compare', help='compare against the results of a previous --json run')
+    args = parser.parse_args()
+
+    process = None
+    fake_url = args.fake_url
+    if not fake_url:
+        process, fake_url = start_fake_judge0(args)
+    try:
+        web_interface = None if args.url else configure_app(fake_url, args)
+        target = Target(args.url)
+
+        # Start counting after startup checks and allocations
+        upstream_stats(fake_url, reset=True)
+        gc.collect()
+        rss_before = peak_rss_mb()
+        if args.tracemalloc and not args.url:
+            tracemalloc.start()
+
+        print(f"Driving {'the in-process app' if not args.url else args.url} at {args.rps:g} req/s "
+              f"for {args.duration:g}s (fake Judge0 at {fake_url})")
+        started = time.perf_counter()
+        records = run_load(target, args)
+        elapsed = time.perf_counter() - started
+
+        report = {'config': {key: value for key, value in vars(args).items()
+                             if key not in ('json', 'compare', 'verbose')}}
+        report.update(summarize(records, elapsed))
+
+        upstream = upstream_stats(fake_url)
+        programs = sum(args.batch_size if record['kind'] == 'batch' else 1 for record in records)
+        upstream['requests_per_request'] = round(upstream['requests'] / len(records), 2) if records else 0.0
+        upstream['submissions_per_program'] = round(upstream['submissions'] / programs, 3) if programs else 0.0
+        upstream['bytes_per_program'] = (round((upstream['bytes_in'] + upstream['bytes_out']) / programs)
+                                         if programs else 0)
+        report['upstream'] = upstream
+
+        report['memory'] = {'rss_before_mb': rss_before, 'peak_rss_mb': peak_rss_mb()}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report['memory'].update(traced_current_mb=round(current / 2 ** 20, 1),
+                                    traced_peak_mb=round(peak / 2 ** 20, 1))
+
+        if web_interface is not None and web_interface.judge0_compiler is not None:
+            compiler = web_interface.judge0_compiler
+            report['app'] = {
+                'cache': compiler.get_cache_stats(),
+                'coalescing': compiler.get_coalescing_stats(),
+                'jobs': web_interface.job_manager.stats(),
+            }
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latency = report['latency_ms']
+    print(f"\nrequests {report['requests']}  throughput {report['throughput_rps']} req/s  "
+          f"success {report['success_rate']:.1%}  statuses {report['statuses']}")
+    print(f"latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    for language, values in report['latency_ms_by_language'].items():
+        print(f"  {language:<12} p50 {values['p50']:>8}  p95 {values['p95']:>8}  p99 {values['p99']:>8}")
+    print(f"upstream    {upstream['requests']} requests ({upstream['requests_per_request']} per request)  "
+          f"{upstream['routes']}")
+    print(f"            {upstream['bytes_out'] / 1e6:.2f} MB received, {upstream['bytes_in'] / 1e6:.2f} MB sent "
+          f"({upstream['bytes_per_program']} bytes per program)")
+    print(f"memory      peak RSS {report['memory']['peak_rss_mb']} MB" +
+          (f"  traced peak {report['memory']['traced_peak_mb']} MB" if 'traced_peak_mb' in report['memory'] else ''))
+
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(report, json.load(handle))
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Response Formatting Memory Benchmark
+Measures peak traced memory, time and JSON size of formatting and
+serializing one execution result with very large program output, for the
+previous eager formatter and for format_judge0_output with its output cap
+and with each `fields` selection.
+
+Run with: python -m backend.benchmarks.output_formatting [--sizes 1000000,10000000,50000000] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compilers.base_compiler import CompilerResult
+from compilers.judge0_compiler import (DEFAULT_MAX_RESPONSE_OUTPUT, format_judge0_output,
+                                       parse_response_fields)
+
+
+def legacy_format_judge0_output(result, language='unknown', compiler='Judge0 API'):
+    """The eager formatter format_judge0_output replaced (no cap, every part built)"""
+    output_lines = result.output.split('\n') if result.output else []
+    error_lines = result.error.split('\n') if result.error else []
+    output_lines = [line for line in output_lines if line.strip()]
+    error_lines = [line for line in error_lines if line.strip()]
+    status = "✅ SUCCESS" if result.success else "❌ FAILED"
+    title = 'JUDGE0' if compiler == 'Judge0 API' else compiler.upper()
+    formatted_output = f"""=== {title} EXECUTION RESULT: {status} ===
+Language: {language.upper()}
+Exit Code: {result.exit_code}
+Execution Time: {result.execution_time:.2f}s
+
+📄 PROGRAM OUTPUT:
+{'─' * 50}
+{result.output if result.output else '(no output)'}
+{'─' * 50}
+
+{f'❌ ERRORS:' if error_lines else ''}
+{result.error if result.error else ''}
+
+🏛️ Powered by {compiler}
+═══════════════════════════════════════════════════"""
+    return {
+        'success': result.success,
+        'output': output_lines,
+        'errors': error_lines,
+        'exit_code': result.exit_code,
+        'execution_time': result.execution_time,
+        'language': language,
+        'formatted_output': formatted_output.strip(),
+        'compiler': compiler,
+        'platform_compatible': True
+    }
+
+
+def large_result(size: int, line_length: int = 80) -> CompilerResult:
+    """A successful result whose stdout is `size` characters of numbered lines"""
+    line = 'x' * (line_length - 9)
+    lines = (size // line_length) + 1
+    output = ''.join(f'{index:08d} {line}\n' for index in range(lines))[:size]
+    return CompilerResult(True, output, '', 0, 0.5)
+
+
+def measure(formatter, result: CompilerResult) -> dict:
+    """Peak traced allocation, seconds and JSON bytes for formatting and serializing once"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    body = json.dumps(formatter(result))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'peak_mb': round(peak / 1e6, 2), 'ms': round(elapsed * 1000, 1),
+            'json_mb': round(len(body) / 1e6, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000000,10000000,50000000',
+                        help='comma-separated program output sizes in characters')
+    parser.add_argument('--max-output', type=int, default=DEFAULT_MAX_RESPONSE_OUTPUT,
+                        help='output cap passed to format_judge0_output')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    variants = {
+        'legacy': legacy_format_judge0_output,
+        'uncapped': lambda result: format_judge0_output(result, 'python', max_output=0),
+        'capped': lambda result: format_judge0_output(result, 'python', max_output=args.max_output),
+    }
+    for selection in ('output', 'formatted_output', 'success'):
+        fields = parse_response_fields(selection)
+        variants[f'fields={selection}'] = (
+            lambda result, fields=fields: format_judge0_output(result, 'python', fields=fields,
+                                                               max_output=args.max_output))
+
+    report = {'max_output': args.max_output, 'results': []}
+    print(f"{'output size':>12}  {'variant':<24}{'peak MB':>10}{'ms':>10}{'JSON MB':>10}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        result = large_result(size)
+        for name, formatter in variants.items():
+            row = {'size': size, 'variant': name}
+            row.update(measure(formatter, result))
+            report['results'].append(row)
+            print(f"{size:>12}  {name:<24}{row['peak_mb']:>10.1f}{row['ms']:>10.1f}{row['json_mb']:>10.3f}")
+        del result
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Compiled-Artifact Cache
+This module keeps the binaries built by local compile steps on disk, keyed
+on a hash of the source, language, compiler version and compile flags, so
+repeated runs of the same program (re-clicked "Run", every case of a judged
+submission) compile once. Failed compiles are kept too, with their output.
+Entries are evicted least-recently-used once the cache outgrows its size
+bound, and population is serialized per key across threads and processes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows (neither is local execution)
+    fcntl = None
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_ENABLED = os.environ.get('LOCAL_ARTIFACT_CACHE', 'true').lower() == 'true'
+# Binaries in the cache are executed, so it must be private to the server's
+# uid: the default is per-uid and every directory is checked on start-up
+DEFAULT_DIRECTORY = (os.environ.get('LOCAL_ARTIFACT_CACHE_DIR')
+                     or os.path.join(tempfile.gettempdir(), f'sefa-artifacts-{os.getuid()}'))
+DEFAULT_MAX_BYTES = int(os.environ.get('LOCAL_ARTIFACT_CACHE_MB', 256)) * 1024 * 1024
+
+# Keys share this many lock files, so lock files never accumulate
+LOCK_STRIPES = 256
+
+
+def make_key(language: str, source: str, compiler: str, flags: list) -> str:
+    """Hash everything that determines a compile step's output"""
+    source_hash = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    material = json.dumps([language, compiler, list(flags), source_hash], ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class Artifact(NamedTuple):
+    """The outcome of one cached compile step"""
+    returncode: int
+    output: str  # Compiler messages (warnings, or the errors of a failed compile)
+    path: Optional[str]  # The compiled binary, None when compilation failed
+
+
+class ArtifactCache:
+    """
+    Content-addressed, size-bounded LRU store of compiled binaries
+
+    Each entry is a `<key>.json` record (return code and compiler output)
+    plus a `<key>.bin` binary for successful compiles. Files are written
+    to a temporary name and renamed into place, so readers never see a
+    partial entry and lookups need no lock. Recency is the record's
+    modification time, refreshed on every hit.
+
+    The directory must belong to the server's uid and be closed to other
+    users, since anyone who can write to it chooses what the server runs.
+
+    Raises:
+        OSError: If the directory can't be created or is not private
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        for path in (directory, os.path.join(directory, 'locks')):
+            self._make_private(path)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _make_private(path: str):
+        """Create `path` with mode 0700, or check that an existing one is ours and private"""
+        try:
+            os.mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode):
+            raise NotADirectoryError(f'{path} is not a directory')
+        if info.st_uid != os.geteuid():
+            raise PermissionError(f'{path} is owned by uid {info.st_uid}, not {os.geteuid()}')
+        if info.st_mode & 0o077:
+            raise PermissionError(f'{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})')
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key: str, destination: str) -> Optional[Artifact]:
+        """
+        Return the cached compile outcome for `key`, or None on a miss
+
+        The binary of a successful compile is copied to `destination` (the
+        returned path) from a handle opened during the lookup, so eviction
+        unlinking it meanwhile can't take it away before it runs, and the
+        run can't modify the cached copy.
+        """
+        record_path = self._path(key, '.json')
+        try:
+            with open(record_path, encoding='utf-8') as handle:
+                record = json.load(handle)
+            path = None
+            if record['returncode'] == 0:
+                descriptor = os.open(self._path(key, '.bin'), os.O_RDONLY | os.O_NOFOLLOW)
+                with os.fdopen(descriptor, 'rb') as source, open(destination, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                os.chmod(destination, 0o755)
+                path = destination
+            os.utime(record_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return Artifact(record['returncode'], record.get('output', ''), path)
+
+    def put(self, key: str, returncode: int, output: str, binary: Optional[str] = None) -> Optional[Artifact]:
+        """
+        Store a compile outcome, copying `binary` into the cache
+
+        Returns:
+            The stored Artifact, or None when it couldn't be stored (too
+            large for the cache, or the disk write failed)
+        """
+        try:
+            if binary is not None:
+                if os.path.getsize(binary) > self.max_bytes:
+                    return None
+                self._write(self._path(key, '.bin'), source=binary, mode=0o755)
+            record = json.dumps({'returncode': returncode, 'output': output}).encode('utf-8')
+            self._write(self._path(key, '.json'), data=record)
+        except OSError:
+            return None
+        with self._lock:
+            self._stores += 1
+        self._evict()
+        return Artifact(returncode, output, self._path(key, '.bin') if binary is not None else None)
+
+    def _write(self, path: str, data: bytes = b'', source: Optional[str] = None, mode: int = 0o644):
+        """Write `data` (or a copy of the file `source`) under a temporary name and rename it into place"""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as handle:
+                if source is not None:
+                    with open(source, 'rb') as source_handle:
+                        shutil.copyfileobj(source_handle, handle)
+                else:
+                    handle.write(data)
+            os.chmod(temporary, mode)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def lock(self, key: str):
+        """
+        Hold the compile lock for `key` (shared with 1/LOCK_STRIPES of other keys)
+
+        Callers check `get` again once they hold it, so concurrent misses on
+        one program compile it once and the rest reuse the result.
+        """
+        if fcntl is None:
+            yield
+            return
+        stripe = int(key[:8], 16) % LOCK_STRIPES
+        with open(os.path.join(self.directory, 'locks', f'{stripe:03d}.lock'), 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _evict(self):
+        """Delete least-recently-used entries until the cache fits in `max_bytes`"""
+        entries, total = {}, 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    key, suffix = os.path.splitext(item.name)
+                    if suffix not in ('.json', '.bin') or not item.is_file():
+                        continue
+                    info = item.stat()
+                    recency, size = entries.get(key, (0.0, 0))
+                    if suffix == '.json':
+                        recency = info.st_mtime
+                    entries[key] = (recency, size + info.st_size)
+                    total += info.st_size
+        except OSError:
+            return
+        for key, (_, size) in sorted(entries.items(), key=lambda entry: entry[1][0]):
+            if total <= self.max_bytes:
+                break
+            # The record goes first so the entry stops being served before its binary does
+            for suffix in ('.json', '.bin'):
+                try:
+                    os.unlink(self._path(key, suffix))
+                except OSError:
+                    pass
+            total -= size
+            with self._lock:
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        """Return the cache location, bound and this process's hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': True,
+                'directory': self.directory,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'stores': self._stores,
+                'evictions': self._evictions,
+            }
@@ -0,0 +1,532 @@
+"""
+Asyncio Judge0 Code Compiler Module
+This module provides the Judge0Compiler API as coroutines on top of aiohttp,
+so a single event loop can keep thousands of submissions in flight while
+they wait on Judge0 without holding a thread each
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from typing import List, Optional
+
+import aiohttp
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .endpoints import Endpoint, EndpointPool
+from .judge0_compiler import CompilerResult, Judge0Base, RESULT_FIELDS, STATUS_FIELDS, is_cacheable
+from .polling import PollingStrategy
+from .quota import QuotaLimiter, QuotaExceeded
+from .result_cache import ResultCache, make_key
+from .single_flight import AsyncSingleFlight
+from .metrics import POLLS, upstream_operation
+from .tracing import add_span, annotate, span
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_CONNECTION_LIMIT = int(os.environ.get('JUDGE0_ASYNC_POOL_SIZE', 100))
+DEFAULT_RETRIES = int(os.environ.get('JUDGE0_POOL_RETRIES', 3))
+DEFAULT_BACKOFF = float(os.environ.get('JUDGE0_POOL_BACKOFF', 0.3))
+
+# Gateway errors worth retrying for idempotent requests
+RETRY_STATUSES = (502, 503, 504)
+
+
+class AsyncResponse:
+    """Status, headers and body of a completed aiohttp request"""
+
+    def __init__(self, status_code: int, headers: dict, text: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncJudge0Compiler(Judge0Base):
+    """
+    Asyncio counterpart of Judge0Compiler
+
+    Every public method returns an awaitable with the same result as its
+    Judge0Compiler namesake. The aiohttp session is created lazily inside
+    the running event loop and keeps up to `connection_limit` keep-alive
+    connections open.
+    """
+
+    def __init__(self, api_key: Optional[str] = None,
+                 polling: Optional[PollingStrategy] = None,
+                 cache: Optional[ResultCache] = None,
+                 connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF,
+                 breaker: Optional[CircuitBreaker] = None,
+                 quota: Optional[QuotaLimiter] = None,
+                 endpoints: Optional[EndpointPool] = None,
+                 coalescer: Optional[AsyncSingleFlight] = None):
+        super().__init__(api_key, polling, cache, breaker=breaker, quota=quota, endpoints=endpoints)
+        self.coalescer = coalescer or AsyncSingleFlight()
+        self.connection_limit = connection_limit
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._in_flight = 0
+
+        logger.info("🏛️ Async Judge0 RapidAPI compiler initialized")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the pooled aiohttp session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _request(self, endpoint: Endpoint, method: str, path: str, timeout: float,
+                       charge: bool = True, transfer: Optional[dict] = None, **kwargs) -> AsyncResponse:
+        """
+        Send a request to a Judge0 endpoint, retrying idempotent GETs with exponential backoff
+
+        Every attempt is paced by the endpoint's quota limiter, except a first
+        attempt whose token was already taken at admission (`charge=False`).
+        Body sizes of every attempt are added to `transfer` ({'sent': n, 'received': n}).
+        """
+        attempts = self.retries + 1 if method == 'GET' else 1
+        operation = upstream_operation(method, path)
+        if 'json' in kwargs:
+            # Serialized once up front so the bytes sent are known
+            kwargs['data'] = json.dumps(kwargs.pop('json')).encode()
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            if charge or attempt:
+                await asyncio.sleep(endpoint.quota.reserve())
+            start = time.perf_counter()
+            try:
+                async with self._get_session().request(
+                    method, f"{endpoint.base_url}{path}", headers=endpoint.headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+                ) as response:
+                    body = await response.read()
+                    text = body.decode('utf-8', errors='replace')
+                    if transfer is not None:
+                        transfer['sent'] += len(kwargs.get('data') or b'')
+                        transfer['received'] += len(body)
+                    endpoint.record(time.perf_counter() - start, response.status, operation)
+                    endpoint.quota.observe(response.status, response.headers)
+                    if response.status in RETRY_STATUSES and not last_attempt:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, (), status=response.status
+                        )
+                    return AsyncResponse(response.status, dict(response.headers), text)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not isinstance(e, aiohttp.ClientResponseError):
+                    endpoint.record(time.perf_counter() - start, operation=operation)
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def is_available(self) -> bool:
+        """Check if any Judge0 endpoint is accessible"""
+        for endpoint in self.endpoints:
+            try:
+                if (await self._request(endpoint, 'GET', '/about', timeout=5)).status_code == 200:
+                    return True
+            except Exception:
+                pass
+        return False
+
+    async def get_language_info(self) -> dict:
+        """Get detailed language information from the first Judge0 endpoint that answers"""
+        for endpoint in self.endpoints:
+            try:
+                response = await self._request(endpoint, 'GET', '/languages', timeout=10)
+                if response.status_code == 200:
+                    return response.json()
+            except Exception:
+                pass
+        return {}
+
+    async def compile_and_run(self, code: str, language: str = 'python', timeout: int = 30,
+                              use_cache: bool = True, stdin: str = '') -> CompilerResult:
+        """
+        Compile and execute code using Judge0 API
+
+        Args:
+            code: Source code to execute
+            language: Programming language ('python', 'javascript', 'cpp', etc.)
+            timeout: Execution timeout in seconds
+            use_cache: Serve and store identical runs from the result cache and join
+                identical runs already in flight
+            stdin: Input fed to the program
+
+        Returns:
+            CompilerResult with execution details
+
+        Raises:
+            QuotaExceeded: If no endpoint's quota can take the submission in time
+            CircuitOpenError: If every endpoint has been failing and the result isn't cached
+        """
+        language = language.lower().strip()
+
+        language_id = self.language_map.get(language)
+        if not language_id:
+            return self._unsupported_language(language)
+
+        submission_data = self._build_submission(code, language_id, timeout, stdin)
+
+        cache_key = make_key(submission_data)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"♻️ Returning cached {language} result")
+                annotate(cache='hit')
+                return cached
+
+        async def run() -> CompilerResult:
+            result = await self._submit(language, submission_data, timeout)
+            if use_cache and is_cacheable(result):
+                self.cache.put(cache_key, result, len(result.output) + len(result.error))
+            return result
+
+        # Identical submissions already in flight are joined instead of resubmitted,
+        # unless the caller opted out of reusing results (e.g. to re-run a random program)
+        with span('execute', language=language) as execution:
+            if use_cache:
+                result, shared = await self.coalescer.do(cache_key, run)
+            else:
+                result, shared = await run(), False
+            execution.set(coalesced=shared)
+        if shared:
+            logger.info(f"🔗 Joined an identical in-flight {language} submission")
+        return result
+
+    async def _submit(self, language: str, submission_data: dict, timeout: int) -> CompilerResult:
+        """
+        Run one prepared payload on the least loaded endpoint, failing over
+        while submissions fail upstream
+
+        Admission takes the submission's quota token, so the POST isn't charged again.
+        """
+        tried, result = [], None
+        self._in_flight += 1
+        try:
+            while True:
+                picked = self._route(tried, [result])
+                if picked is None:
+                    break
+                endpoint, wait = picked
+                if wait:
+                    with span('quota_wait', endpoint=endpoint.name):
+                        await asyncio.sleep(wait)
+                try:
+                    result = await self._execute(endpoint, language, submission_data, timeout)
+                finally:
+                    self.endpoints.release(endpoint)
+                self._record_outcome(endpoint, [result])
+                tried.append(endpoint)
+        finally:
+            self._in_flight -= 1
+        return result
+
+    async def _execute(self, endpoint: Endpoint, language: str, submission_data: dict,
+                       timeout: int) -> CompilerResult:
+        """Submit one prepared payload to a Judge0 endpoint and wait for its result"""
+        start_time = time.time()
+        transfer = {'sent': 0, 'received': 0}
+
+        try:
+            logger.info(f"📤 Submitting {language} code to Judge0 API...")
+
+            budget = self.polling.budget(timeout)
+            wait = self.polling.should_wait(submission_data['wall_time_limit'])
+            payload = self._encode_submission(submission_data)
+
+            submit_started = time.perf_counter()
+            response = await self._request(
+                endpoint, 'POST', '/submissions', charge=False, transfer=transfer,
+                timeout=submission_data['wall_time_limit'] + 30 if wait else 30,
+                params=self._params(RESULT_FIELDS, wait='true') if wait else self._params(),
+                json=payload
+            )
+
+            # Instances with ENABLE_WAIT_RESULT off reject wait=true; fall back to polling
+            if wait and response.status_code == 400 and 'wait' in response.text.lower():
+                logger.warning("⚠️ Judge0 wait=true mode disabled upstream - switching to polling")
+                self.polling.use_sync_wait = False
+                response = await self._request(endpoint, 'POST', '/submissions', timeout=30,
+                                               transfer=transfer, params=self._params(), json=payload)
+            add_span('submit', time.perf_counter() - submit_started, endpoint=endpoint.name,
+                     wait=wait, http_status=response.status_code)
+
+            if response.status_code != 201:
+                error_msg = f"Submission failed: HTTP {response.status_code} - {response.text}"
+                logger.error(f"❌ {error_msg}")
+                return CompilerResult(False, "", error_msg, 1, time.time() - start_time)
+
+            submission = response.json()
+            token = submission['token']
+            submitted_at = time.time()
+            logger.info(f"✅ Code submitted successfully - Token: {token}")
+
+            if submission.get('status', {}).get('id') not in [None, 1, 2]:
+                self._record_finished(language, start_time, polls=0)
+                return self._build_result(self._decode_result(submission), start_time)
+
+            # Status-only polls leave the output for one final fetch
+            fields = STATUS_FIELDS if self.status_polling else RESULT_FIELDS
+            for poll_count, delay in enumerate(self.polling.delays(language, budget)):
+                await asyncio.sleep(delay)
+
+                # Polls stick to the endpoint that owns the token
+                poll_started = time.perf_counter()
+                result_response = await self._request(endpoint, 'GET', f"/submissions/{token}", timeout=10,
+                                                      transfer=transfer, params=self._params(fields))
+
+                if result_response.status_code != 200:
+                    add_span('poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                             http_status=result_response.status_code)
+                    logger.warning(f"⚠️ Status check failed: {result_response.status_code}")
+                    continue
+
+                result = result_response.json()
+                status_id = result.get('status', {}).get('id')
+                status_description = result.get('status', {}).get('description', 'Unknown')
+                add_span('poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                         status=status_description)
+
+                if status_id in [1, 2]:  # Still processing
+                    continue
+
+                if fields == STATUS_FIELDS:
+                    with span('fetch_result'):
+                        result_response = await self._request(endpoint, 'GET', f"/submissions/{token}",
+                                                              timeout=10, transfer=transfer,
+                                                              params=self._params(RESULT_FIELDS))
+                    if result_response.status_code != 200:
+                        # The next poll asks for the full result instead
+                        logger.warning(f"⚠️ Result fetch failed: {result_response.status_code}")
+                        fields = RESULT_FIELDS
+                        continue
+                    result = result_response.json()
+
+                self._record_finished(language, start_time, poll_count + 1, submitted_at)
+                return self._build_result(self._decode_result(result), start_time)
+
+            logger.error("⏰ Polling timeout - execution results not ready")
+            return CompilerResult(
+                False, "",
+                f"Execution timeout - results not available within {budget:.0f} seconds",
+                124, time.time() - start_time
+            )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Judge0 API request failed: {e}")
+            return CompilerResult(
+                False, "", f"API request failed: {str(e) or type(e).__name__}", 1,
+                time.time() - start_time
+            )
+        except Exception as e:
+            logger.error(f"❌ Unexpected error in Judge0 execution: {e}")
+            return CompilerResult(
+                False, "", f"Execution error: {str(e)}", 1,
+                time.time() - start_time
+            )
+        finally:
+            self._record_transfer(transfer)
+
+    async def compile_and_run_many(self, submissions: List[dict], timeout: int = 30,
+                                   use_cache: bool = True) -> List[CompilerResult]:
+        """
+        Compile and execute several programs using Judge0 batch submissions
+
+        Args:
+            submissions: List of dicts with 'code', 'language' and optional 'timeout' and 'stdin'
+            timeout: Default execution timeout in seconds for items without one
+            use_cache: Serve and store identical runs from the result cache
+
+        Returns:
+            List of CompilerResult in the same order as `submissions`
+
+        Raises:
+            QuotaExceeded: If no endpoint's quota can take any chunk in time
+            CircuitOpenError: If every endpoint has been failing and no chunk was sent
+        """
+        results: List[Optional[CompilerResult]] = [None] * len(submissions)
+
+        pending = []
+        for index, item in enumerate(submissions):
+            language = str(item.get('language') or 'python').lower().strip()
+            language_id = self.language_map.get(language)
+            if not language_id:
+                results[index] = self._unsupported_language(language)
+                continue
+            item_timeout = item.get('timeout', timeout)
+            submission_data = self._build_submission(item.get('code', ''), language_id, item_timeout,
+                                                     item.get('stdin') or '')
+            cached = self.cache.get(make_key(submission_data)) if use_cache else None
+            if cached is not None:
+                results[index] = cached
+                continue
+            pending.append((index, submission_data))
+
+        # Chunks are independent, so run them concurrently
+        chunks = [pending[offset:offset + self.max_batch_size]
+                  for offset in range(0, len(pending), self.max_batch_size)]
+        self._in_flight += len(pending)
+        try:
+            chunk_results = await asyncio.gather(*(self._run_chunk(chunk) for chunk in chunks),
+                                                 return_exceptions=True)
+        finally:
+            self._in_flight -= len(pending)
+
+        for finished in chunk_results:
+            if isinstance(finished, BaseException) and not isinstance(finished, (QuotaExceeded, CircuitOpenError)):
+                raise finished
+        # Shed only if no chunk was admitted; otherwise unadmitted chunks fail individually
+        rejected = [finished for finished in chunk_results if isinstance(finished, BaseException)]
+        if rejected and len(rejected) == len(chunks):
+            raise rejected[0]
+
+        payloads = dict(pending)
+        for chunk, finished in zip(chunks, chunk_results):
+            if isinstance(finished, BaseException):
+                finished = [(index, CompilerResult(False, "", str(finished), 1, 0.0)) for index, _ in chunk]
+            for index, result in finished:
+                results[index] = result
+                if use_cache and is_cacheable(result):
+                    self.cache.put(make_key(payloads[index]), result, len(result.output) + len(result.error))
+
+        return results
+
+    async def _run_chunk(self, chunk: List[tuple]) -> List[tuple]:
+        """Route one chunk to the least loaded endpoint, failing over while it fails upstream"""
+        tried, finished = [], []
+        while True:
+            picked = self._route(tried, [result for _, result in finished], len(chunk))
+            if picked is None:
+                return finished
+            endpoint, wait = picked
+            if wait:
+                with span('quota_wait', endpoint=endpoint.name):
+                    await asyncio.sleep(wait)
+            try:
+                finished = await self._run_batch(endpoint, chunk)
+            finally:
+                self.endpoints.release(endpoint, len(chunk))
+            self._record_outcome(endpoint, [result for _, result in finished])
+            tried.append(endpoint)
+
+    async def _run_batch(self, endpoint: Endpoint, chunk: List[tuple]) -> List[tuple]:
+        """Submit one chunk through an endpoint's /submissions/batch and poll until it finishes"""
+        start_time = time.time()
+        transfer = {'sent': 0, 'received': 0}
+
+        def _fail(message: str, exit_code: int = 1) -> List[tuple]:
+            return [(index, CompilerResult(False, "", message, exit_code, time.time() - start_time))
+                    for index, _ in chunk]
+
+        try:
+            logger.info(f"📤 Submitting batch of {len(chunk)} programs to Judge0 API...")
+
+            submit_started = time.perf_counter()
+            response = await self._request(
+                endpoint, 'POST', '/submissions/batch', timeout=30, charge=False, transfer=transfer,
+                params=self._params(),
+                json={'submissions': [self._encode_submission(payload) for _, payload in chunk]}
+            )
+            add_span('batch_submit', time.perf_counter() - submit_started, endpoint=endpoint.name,
+                     size=len(chunk), http_status=response.status_code)
+
+            if response.status_code != 201:
+                error_msg = f"Batch submission failed: HTTP {response.status_code} - {response.text}"
+                logger.error(f"❌ {error_msg}")
+                return _fail(error_msg)
+
+            tokens = {}
+            finished = []
+            for (index, _), entry in zip(chunk, response.json()):
+                if isinstance(entry, dict) and entry.get('token'):
+                    tokens[entry['token']] = index
+                else:
+                    error_msg = f"Submission rejected: {json.dumps(entry)}"
+                    finished.append((index, CompilerResult(False, "", error_msg, 1, time.time() - start_time)))
+
+            logger.info(f"✅ Batch submitted successfully - {len(tokens)} tokens")
+
+            budget = self.polling.budget(max(payload['wall_time_limit'] for _, payload in chunk))
+
+            poll_count = -1
+            for poll_count, delay in enumerate(self.polling.delays(None, budget)):
+                if not tokens:
+                    break
+                await asyncio.sleep(delay)
+
+                poll_started = time.perf_counter()
+                # Running items come back without output and finished ones leave
+                # `tokens`, so each output is fetched once without status-only polls
+                result_response = await self._request(
+                    endpoint, 'GET', '/submissions/batch', timeout=10, transfer=transfer,
+                    params=self._params(RESULT_FIELDS, tokens=','.join(tokens))
+                )
+
+                if result_response.status_code != 200:
+                    add_span('batch_poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                             http_status=result_response.status_code)
+                    logger.warning(f"⚠️ Batch status check failed: {result_response.status_code}")
+                    continue
+
+                for result in result_response.json().get('submissions', []):
+                    if not result or result.get('token') not in tokens:
+                        continue
+                    if result.get('status', {}).get('id') in [1, 2]:  # Still processing
+                        continue
+                    finished.append((tokens.pop(result['token']),
+                                     self._build_result(self._decode_result(result), start_time)))
+
+                add_span('batch_poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                         running=len(tokens))
+
+            POLLS.observe(poll_count + 1, 'batch')
+            if tokens:
+                logger.error(f"⏰ Polling timeout - {len(tokens)} batch results not ready")
+            for index in tokens.values():
+                finished.append((index, CompilerResult(
+                    False, "",
+                    f"Execution timeout - results not available within {budget:.0f} seconds",
+                    124, time.time() - start_time
+                )))
+
+            return finished
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Judge0 batch request failed: {e}")
+            return _fail(f"API request failed: {str(e) or type(e).__name__}")
+        except Exception as e:
+            logger.error(f"❌ Unexpected error in Judge0 batch execution: {e}")
+            return _fail(f"Execution error: {str(e)}")
+        finally:
+            self._record_transfer(transfer, len(chunk))
+
+    async def check_syntax(self, code: str, language: str = 'python', use_cache: bool = True) -> CompilerResult:
+        """
+        Check code syntax without full execution
+
+        Local checks run on the default executor so the event loop never blocks.
+        """
+        if self.syntax_checker.supports(language):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.syntax_checker.check, code, language)
+
+        logger.info(f"🔍 Checking {language} syntax via Judge0...")
+        source, language = self._syntax_check_source(code, language)
+        return await self.compile_and_run(source, language, 10, use_cache=use_cache)
+
+    def get_in_flight(self) -> int:
+        """Number of submissions currently waiting on Judge0"""
+        return self._in_flight
@@ -0,0 +1,72 @@
+"""
+Compiler Backend Interface
+This module defines the result type and the interface shared by every
+execution backend (Judge0 API, local subprocesses), so the API layer can
+pick a backend per deployment or per request
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, List, NamedTuple, Optional
+
+class CompilerResult(NamedTuple):
+    """Data class to hold compilation results"""
+    success: bool
+    output: str
+    error: str
+    exit_code: int
+    execution_time: float
+    diagnostics: tuple = ()  # Diagnostic entries from syntax checks
+    status: str = ''  # Backend verdict, e.g. 'Accepted', 'Time Limit Exceeded' ('' for infrastructure errors)
+    run_time: Optional[float] = None  # Seconds the program itself ran, when the backend measures it
+    memory_kb: Optional[int] = None  # Peak memory of the run, when the backend measures it
+
+# Progress callback: receives an event name and its payload
+StatusCallback = Callable[[str, dict], None]
+
+class BaseCompiler(ABC):
+    """
+    Interface implemented by every code execution backend
+    """
+
+    # Backend identifier used for selection ('judge0', 'local')
+    name = 'base'
+
+    # Human readable name shown in API responses
+    display_name = 'Compiler'
+
+    @abstractmethod
+    def compile_and_run(self, code: str, language: str = 'python', timeout: int = 30,
+                        use_cache: bool = True,
+                        on_status: Optional[StatusCallback] = None,
+                        stdin: str = '') -> CompilerResult:
+        """Compile and execute code with `stdin` as its input, returning its CompilerResult"""
+
+    @abstractmethod
+    def check_syntax(self, code: str, language: str = 'python', use_cache: bool = True,
+                     on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """Check code syntax without full execution"""
+
+    @abstractmethod
+    def get_supported_languages(self) -> list:
+        """Get list of supported programming languages"""
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check if the backend can currently execute code"""
+
+    def compile_and_run_many(self, submissions: List[dict], timeout: int = 30,
+                             use_cache: bool = True) -> List[CompilerResult]:
+        """
+        Compile and execute several programs, returning results in input order
+
+        Each submission is a dict with 'code', 'language' and optional
+        'timeout' and 'stdin'. Backends with a native batch API or parallel
+        runners override this; the default runs the submissions one after another.
+        """
+        return [
+            self.compile_and_run(
+                item.get('code', ''), str(item.get('language') or 'python'),
+                item.get('timeout', timeout), use_cache=use_cache, stdin=item.get('stdin') or ''
+            )
+            for item in submissions
+        ]
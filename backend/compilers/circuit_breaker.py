@@ -0,0 +1,138 @@
+"""
+Circuit Breaker for Upstream Calls
+This module stops sending work to an upstream API after consecutive
+failures, failing fast with a retry hint instead of making every caller
+wait out a full timeout, and lets a single trial call through after a
+cool-down to detect recovery
+"""
+
+import math
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_FAILURE_THRESHOLD = int(os.environ.get('JUDGE0_BREAKER_THRESHOLD', 5))
+DEFAULT_RESET_TIMEOUT = float(os.environ.get('JUDGE0_BREAKER_RESET', 30.0))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+    status_code = 503
+
+    def __init__(self, retry_after: int, name: str = 'upstream'):
+        super().__init__(f"{name} unavailable after repeated failures - retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open circuit breaker
+
+    CLOSED passes every call. `failure_threshold` consecutive failures open
+    the circuit, which rejects calls for `reset_timeout` seconds, then
+    HALF_OPEN admits one trial call: its success closes the circuit, its
+    failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str = 'upstream',
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self._times_opened = 0
+        self._rejected = 0
+
+    def _cooled_down(self, now: float) -> bool:
+        return now - self._opened_at >= self.reset_timeout
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now (may claim the half-open trial)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._cooled_down(time.monotonic()):
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info(f"🔌 {self.name} circuit half-open - sending a trial request")
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def check(self):
+        """
+        Claim permission for a call
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.retry_after(), self.name)
+
+    def rejecting(self) -> bool:
+        """Whether calls are currently being rejected (does not claim the trial)"""
+        with self._lock:
+            if self._state == self.OPEN:
+                return not self._cooled_down(time.monotonic())
+            return self._state == self.HALF_OPEN and self._trial_in_flight
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit will admit a call again (at least 1)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 1
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            return max(1, math.ceil(remaining))
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                logger.info(f"✅ {self.name} circuit closed - upstream recovered")
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                    logger.warning(f"🚫 {self.name} circuit open after {self._consecutive_failures} "
+                                   f"consecutive failures - failing fast for {self.reset_timeout:.0f}s")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        """Return the circuit state and counters"""
+        with self._lock:
+            state = self._state
+            if state == self.OPEN and self._cooled_down(time.monotonic()):
+                state = self.HALF_OPEN
+            return {
+                'state': state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+            }
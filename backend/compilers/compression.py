@@ -0,0 +1,183 @@
+"""
+HTTP Body Compression
+This module negotiates gzip or brotli response encoding from a request's
+Accept-Encoding, compresses bodies in one piece or chunk by chunk as they
+are produced, and inflates gzip-encoded request bodies under a size cap.
+Both API servers share it; brotli is used when the module is installed.
+"""
+
+import json
+import os
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: responses fall back to gzip
+    brotli = None
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_COMPRESS = os.environ.get('COMPRESS_RESPONSES', 'true').lower() == 'true'
+DEFAULT_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+DEFAULT_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+DEFAULT_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+DEFAULT_MAX_REQUEST_SIZE = int(os.environ.get('COMPRESS_MAX_REQUEST_SIZE', 8 * 1024 * 1024))
+
+# Encodings in order of preference when the client accepts several equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Media types worth compressing (images and archives already are)
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript')
+
+# Serialized JSON is handed to the compressor in pieces of about this size
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+class RequestBodyError(ValueError):
+    """A compressed request body that can't be accepted"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def negotiate(accept_encoding: Optional[str], enabled: bool = DEFAULT_COMPRESS) -> Optional[str]:
+    """
+    Pick the response encoding for an Accept-Encoding header
+
+    Returns:
+        'br', 'gzip', or None to send the body as is
+    """
+    if not enabled or not accept_encoding:
+        return None
+    weights = {}
+    for entry in accept_encoding.split(','):
+        name, _, params = entry.strip().partition(';')
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get('*', 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class Compressor:
+    """Incremental gzip or brotli compressor"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=DEFAULT_BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+        else:
+            self._zlib = zlib.compressobj(DEFAULT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        """Everything compressed so far, so a client can decode it now (e.g. one SSE event)"""
+        if self.encoding == 'br':
+            return self._brotli.flush()
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=DEFAULT_BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    compressor = zlib.compressobj(DEFAULT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, flush: bool = False) -> Iterator[bytes]:
+    """
+    Compress a body as its chunks are produced
+
+    With `flush` every chunk is decodable as soon as it arrives, at some
+    cost in ratio; use it for event streams, not for large bodies.
+    """
+    compressor = Compressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if flush:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def iter_json(payload, chunk_size: int = JSON_CHUNK_SIZE, **dumps_options) -> Iterator[bytes]:
+    """Serialize `payload` as UTF-8 JSON in pieces of about `chunk_size` bytes, never as one string"""
+    pending, size = [], 0
+    for piece in json.JSONEncoder(**dumps_options).iterencode(payload):
+        pending.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(pending).encode('utf-8')
+            pending, size = [], 0
+    if pending:
+        yield ''.join(pending).encode('utf-8')
+
+
+def read_head(chunks: Iterator[bytes], size: int) -> Tuple[bytes, bool]:
+    """
+    Read chunks until at least `size` bytes are buffered
+
+    Returns:
+        (the bytes read, whether `chunks` is exhausted); a small body is
+        then sent as is, a large one compressed starting with these bytes
+    """
+    head, length = [], 0
+    for chunk in chunks:
+        head.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            return b''.join(head), False
+    return b''.join(head), True
+
+
+def decompress_request(body: bytes, encoding: Optional[str],
+                       max_size: int = DEFAULT_MAX_REQUEST_SIZE) -> bytes:
+    """
+    Inflate a request body sent with Content-Encoding
+
+    Raises:
+        RequestBodyError: For an unsupported encoding (415), a corrupt body
+            (400), or one that inflates past `max_size` bytes (413)
+    """
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding == 'identity':
+        return body
+    if encoding not in ('gzip', 'x-gzip'):
+        raise RequestBodyError(f'Unsupported Content-Encoding "{encoding}" (use gzip)', 415)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        # Inflate at most one byte past the cap so a compression bomb stops early
+        data = decompressor.decompress(body, max_size + 1)
+    except zlib.error as e:
+        raise RequestBodyError(f'Invalid gzip request body: {e}')
+    if len(data) > max_size:
+        raise RequestBodyError(f'Request body exceeds {max_size} bytes once decompressed', 413)
+    if not decompressor.eof:
+        raise RequestBodyError('Invalid gzip request body: truncated')
+    return data
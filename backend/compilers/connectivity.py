@@ -0,0 +1,163 @@
+"""
+Background Connectivity Verification and Health Probing
+This module checks that an upstream API is reachable from a background
+thread, retrying with exponential backoff until it answers, then keeps
+probing it periodically. Health endpoints read the cached state instead of
+calling the upstream on every hit.
+"""
+
+import os
+import threading
+import time
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_RETRY_INITIAL = float(os.environ.get('JUDGE0_CONNECT_RETRY_INITIAL', 2.0))
+DEFAULT_RETRY_MAX = float(os.environ.get('JUDGE0_CONNECT_RETRY_MAX', 60.0))
+DEFAULT_PROBE_INTERVAL = float(os.environ.get('JUDGE0_HEALTH_INTERVAL', 30.0))
+
+
+class ConnectivityMonitor:
+    """
+    Runs `check` in a daemon thread until it returns True, then `probe`
+    every `interval` seconds
+
+    Failed connection attempts are retried after `retry_initial` seconds,
+    doubling up to `retry_max`. A failed probe marks the upstream
+    unreachable and falls back to connection attempts. `on_connected` runs
+    in the same thread after every successful connection.
+    """
+
+    PENDING = 'pending'
+    CONNECTING = 'connecting'
+    CONNECTED = 'connected'
+    UNREACHABLE = 'unreachable'
+
+    def __init__(self, check: Callable[[], bool], name: str = 'upstream',
+                 on_connected: Optional[Callable[[], None]] = None,
+                 probe: Optional[Callable[[], bool]] = None,
+                 interval: float = DEFAULT_PROBE_INTERVAL,
+                 retry_initial: float = DEFAULT_RETRY_INITIAL,
+                 retry_max: float = DEFAULT_RETRY_MAX):
+        """
+        Args:
+            check: Connection attempt, returns True when the upstream answers
+            name: Upstream name used in logs
+            on_connected: Called after each successful connection
+            probe: Periodic health check while connected (defaults to `check`)
+            interval: Seconds between probes (0 stops after the first connection)
+            retry_initial: First delay after a failed connection attempt
+            retry_max: Upper bound of the retry backoff
+        """
+        self.check = check
+        self.probe = probe or check
+        self.name = name
+        self.on_connected = on_connected
+        self.interval = interval
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+
+        self.state = self.PENDING
+        self.attempts = 0
+        self.probes = 0
+        self.probe_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_check_ms: Optional[float] = None
+        self.last_checked_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.connected_at: Optional[float] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> 'ConnectivityMonitor':
+        """Start verifying in the background (only the first call has an effect)"""
+        with self._lock:
+            if self._thread is None:
+                self.started_at = time.time()
+                self._thread = threading.Thread(target=self._run, name=f'{self.name}-connect', daemon=True)
+                self._thread.start()
+        return self
+
+    def _attempt(self, fn: Callable[[], bool]) -> bool:
+        """Run one check, recording its outcome; returns whether it succeeded"""
+        check_start = time.perf_counter()
+        try:
+            ok = bool(fn())
+            error = None if ok else 'check failed'
+        except Exception as e:
+            ok, error = False, str(e)
+        self.last_check_ms = round((time.perf_counter() - check_start) * 1000, 1)
+        self.last_checked_at = time.time()
+        self.last_error = error
+        return ok
+
+    def _run(self):
+        delay = self.retry_initial
+        while not self._stop.is_set():
+            # Connect, backing off until the upstream answers
+            if self.state != self.UNREACHABLE:
+                self.state = self.CONNECTING
+            self.attempts += 1
+            if not self._attempt(self.check):
+                self.state = self.UNREACHABLE
+                logger.warning(f"⚠️ {self.name} not reachable (attempt {self.attempts}): "
+                               f"{self.last_error} - retrying in {delay:.0f}s")
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.retry_max)
+                continue
+
+            delay = self.retry_initial
+            if self.connected_at is None:
+                self.connected_at = time.time()
+                logger.info(f"✅ {self.name} reachable after {self.attempts} attempt(s), "
+                            f"{(self.connected_at - self.started_at) * 1000:.0f} ms after startup")
+            else:
+                logger.info(f"✅ {self.name} reachable again")
+            self.state = self.CONNECTED
+            if self.on_connected:
+                try:
+                    self.on_connected()
+                except Exception as e:
+                    logger.warning(f"⚠️ {self.name} post-connect step failed: {e}")
+            if self.interval <= 0:
+                return
+
+            # Probe while healthy; a failed probe goes back to connecting
+            while not self._stop.wait(self.interval):
+                self.probes += 1
+                if not self._attempt(self.probe):
+                    self.probe_failures += 1
+                    self.state = self.UNREACHABLE
+                    logger.warning(f"⚠️ {self.name} health probe failed: {self.last_error}")
+                    break
+            self._stop.wait(delay)
+
+    @property
+    def connected(self) -> bool:
+        return self.state == self.CONNECTED
+
+    def stats(self) -> dict:
+        """Return the cached upstream state for health reporting"""
+        return {
+            'state': self.state,
+            'attempts': self.attempts,
+            'probes': self.probes,
+            'probe_failures': self.probe_failures,
+            'last_error': self.last_error,
+            'last_check_ms': self.last_check_ms,
+            'last_checked_seconds_ago': (
+                round(time.time() - self.last_checked_at, 1) if self.last_checked_at else None
+            ),
+            'time_to_connect_ms': (
+                round((self.connected_at - self.started_at) * 1000, 1) if self.connected_at else None
+            ),
+        }
+
+    def stop(self):
+        """Stop connecting and probing"""
+        self._stop.set()
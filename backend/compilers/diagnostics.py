@@ -0,0 +1,191 @@
+"""
+Syntax Diagnostics
+This module checks Python source in-process with compile() and parses the
+syntax-only output of local toolchains (gcc/clang, node, go, rustc) into
+structured (line, column, message) diagnostics. Output about files the
+source includes is redacted first, so a check can't be used to read them.
+"""
+
+import re
+import traceback
+from typing import List, NamedTuple, Tuple
+
+class Diagnostic(NamedTuple):
+    """A single syntax problem at a 1-based line and column"""
+    line: int
+    column: int
+    message: str
+    severity: str = 'error'
+
+# "main.c:3:5: error: expected ';'" (gcc, clang) and "./main.go:3:2: undefined: x" (go)
+LOCATED_PATTERN = re.compile(
+    r'^(?:\S*/)?(?P<file>main\.\w+):(?P<line>\d+):(?P<column>\d+):\s*'
+    r'(?:(?P<severity>fatal error|error|warning|note):\s*)?(?P<message>.*)$'
+)
+
+# node --check: "main.js:3" ... caret line ... "SyntaxError: Unexpected token"
+NODE_LOCATION_PATTERN = re.compile(r'^(?:\S*/)?main\.js:(?P<line>\d+)$')
+NODE_ERROR_PATTERN = re.compile(r'^(?P<message>\w*Error: .*)$')
+
+# rustc: "error[E0425]: cannot find value" followed by "  --> main.rs:2:5"
+RUST_HEADER_PATTERN = re.compile(r'^(?P<severity>error|warning)(?:\[\w+\])?: (?P<message>.*)$')
+RUST_LOCATION_PATTERN = re.compile(r'^\s*--> (?:\S*/)?main\.rs:(?P<line>\d+):(?P<column>\d+)$')
+
+# The submitted source as toolchains name it ("main.c", "./main.go")
+OWN_FILE_PATTERN = re.compile(r'^(?:\./)?main\.\w+$')
+
+# gcc/clang: a line about the source ("main.c:3:5: error: ...", "main.c: In function 'main':"),
+# a driver message ("cc1: out of memory ...") and the include chain leading to another file
+GCC_OWN_PATTERN = re.compile(r'^(?:\./)?main\.\w+:')
+GCC_TOOL_PATTERN = re.compile(r'^(?:[\w+-]+: |compilation terminated\.$)')
+GCC_INCLUDED_PATTERN = re.compile(r'^(?:In file included from|\s+from) (?P<file>[^\s:]+):(?P<line>\d+)[:,]')
+GCC_ERROR_PATTERN = re.compile(r':\d+:\d+:\s*(?:fatal error|error):')
+
+# rustc: "  --> x.rs:1:7" and "  ::: x.rs:1:7" spans
+RUST_SPAN_PATTERN = re.compile(r'^\s*(?:-->|:::) (?P<file>.+?):\d+:\d+$')
+
+INCLUDED_ERROR = 'an included file has errors (its content is not shown)'
+
+
+def check_python(code: str, filename: str = 'main.py') -> Tuple[List[Diagnostic], str]:
+    """
+    Compile Python source without running it
+
+    Returns:
+        (diagnostics, message) - empty list and '' when the code compiles
+    """
+    try:
+        compile(code, filename, 'exec', dont_inherit=True)
+    except SyntaxError as e:
+        message = ''.join(traceback.format_exception_only(type(e), e)).rstrip()
+        return [Diagnostic(e.lineno or 1, e.offset or 1, f"{type(e).__name__}: {e.msg}")], message
+    except (ValueError, RecursionError, MemoryError) as e:
+        message = f"{type(e).__name__}: {e}"
+        return [Diagnostic(1, 1, message)], message
+    return [], ''
+
+
+def _parse_located(output: str) -> List[Diagnostic]:
+    diagnostics = []
+    for line in output.splitlines():
+        match = LOCATED_PATTERN.match(line.strip())
+        if not match:
+            continue
+        severity = match.group('severity') or 'error'
+        if severity == 'note':
+            continue
+        diagnostics.append(Diagnostic(
+            int(match.group('line')), int(match.group('column')), match.group('message'),
+            'error' if severity == 'fatal error' else severity
+        ))
+    return diagnostics
+
+
+def _parse_node(output: str) -> List[Diagnostic]:
+    lines = output.splitlines()
+    line_number = None
+    column = 1
+    for index, text in enumerate(lines):
+        location = NODE_LOCATION_PATTERN.match(text.strip())
+        if location and line_number is None:
+            line_number = int(location.group('line'))
+            # The caret line sits under the echoed source line
+            for caret_line in lines[index + 1:index + 4]:
+                if caret_line.strip() and set(caret_line.strip()) == {'^'}:
+                    column = caret_line.index('^') + 1
+                    break
+            continue
+        error = NODE_ERROR_PATTERN.match(text.strip())
+        if error:
+            return [Diagnostic(line_number or 1, column, error.group('message'))]
+    return []
+
+
+def _parse_rust(output: str) -> List[Diagnostic]:
+    diagnostics = []
+    header = None
+    for line in output.splitlines():
+        match = RUST_HEADER_PATTERN.match(line)
+        if match:
+            header = match
+            continue
+        location = RUST_LOCATION_PATTERN.match(line)
+        if location and header is not None:
+            diagnostics.append(Diagnostic(
+                int(location.group('line')), int(location.group('column')),
+                header.group('message'), header.group('severity')
+            ))
+            header = None
+    return diagnostics
+
+
+def _redact_gcc(output: str, source: str) -> str:
+    """
+    Keep only the lines about the source itself, replacing the errors of each
+    included file with one error at its #include line
+    """
+    kept = []
+    site = None
+    foreign = False
+    reported = set()
+    for line in output.splitlines():
+        included = GCC_INCLUDED_PATTERN.match(line)
+        if included:
+            if OWN_FILE_PATTERN.match(included.group('file')):
+                site = (included.group('file'), included.group('line'))
+            continue
+        if GCC_OWN_PATTERN.match(line):
+            foreign, site = False, None
+            kept.append(line)
+        elif line[:1].isspace():
+            # Source excerpts and continuations belong to the line above
+            if not foreign:
+                kept.append(line)
+        elif GCC_TOOL_PATTERN.match(line):
+            kept.append(line)
+        else:
+            foreign = True
+            if GCC_ERROR_PATTERN.search(line) and site not in reported:
+                reported.add(site)
+                file, number = site or (source, '1')
+                kept.append(f"{file}:{number}:1: error: {INCLUDED_ERROR}")
+    return '\n'.join(kept)
+
+
+def _redact_rust(output: str, source: str) -> str:
+    """Replace every message that points into an included file with a bare error"""
+    kept = []
+    for block in output.split('\n\n'):
+        spans = [RUST_SPAN_PATTERN.match(line) for line in block.splitlines()]
+        if any(span and not OWN_FILE_PATTERN.match(span.group('file')) for span in spans):
+            block = f"error: {INCLUDED_ERROR}"
+        kept.append(block)
+    return '\n\n'.join(kept)
+
+
+REDACTORS = {
+    'c': _redact_gcc,
+    'cpp': _redact_gcc,
+    'rust': _redact_rust,
+}
+
+
+def redact_included(language: str, output: str, source: str) -> str:
+    """Strip the content of files other than `source` (the submitted file) from a toolchain's output"""
+    redactor = REDACTORS.get(language)
+    return redactor(output, source) if redactor else output
+
+
+PARSERS = {
+    'c': _parse_located,
+    'cpp': _parse_located,
+    'go': _parse_located,
+    'javascript': _parse_node,
+    'rust': _parse_rust,
+}
+
+
+def parse_diagnostics(language: str, output: str) -> List[Diagnostic]:
+    """Extract structured diagnostics from a toolchain's syntax-check output"""
+    parser = PARSERS.get(language)
+    return parser(output) if parser else []
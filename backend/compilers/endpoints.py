@@ -0,0 +1,279 @@
+"""
+Judge0 Endpoint Pool and Routing
+This module spreads Judge0 submissions across several upstreams (RapidAPI
+keys and self-hosted Judge0 instances), routing each one to the healthy
+endpoint with the fewest outstanding submissions relative to its weight,
+and keeps per-endpoint health, quota and latency statistics
+"""
+
+import json
+import os
+import threading
+import logging
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .metrics import IN_FLIGHT, UPSTREAM_DURATION, UPSTREAM_RESPONSES
+from .quota import (DEFAULT_BURST, DEFAULT_DAILY_LIMIT, DEFAULT_RATE, QuotaLimiter,
+                    QuotaExceeded, get_shared_limiter)
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_BASE_URL = os.environ.get('JUDGE0_BASE_URL', 'https://judge0-ce.p.rapidapi.com')
+DEFAULT_API_KEY = os.environ.get('RAPIDAPI_KEY', 'f38545accbmshb4e9fc5c29c4434p176d69jsnaccce6804686')
+DEFAULT_ENDPOINTS = os.environ.get('JUDGE0_ENDPOINTS', '')
+
+# Weight of the newest request in the moving latency average
+LATENCY_DECAY = 0.2
+
+
+class Endpoint:
+    """
+    One Judge0 upstream with its credentials, circuit breaker and quota
+
+    `outstanding` counts submissions currently owned by the endpoint, from
+    submission until their last poll. `max_concurrency` caps it (0 means
+    uncapped); an idle endpoint always accepts work, however large.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: Optional[str] = None,
+                 auth_token: Optional[str] = None, weight: float = 1.0,
+                 max_concurrency: int = 0,
+                 breaker: Optional[CircuitBreaker] = None,
+                 quota: Optional[QuotaLimiter] = None):
+        """
+        Args:
+            name: Endpoint name used in logs and stats
+            base_url: Judge0 API root, e.g. https://judge0-ce.p.rapidapi.com
+            api_key: RapidAPI key (sent with the X-RapidAPI-Host of `base_url`)
+            auth_token: X-Auth-Token of a self-hosted instance
+            weight: Relative share of submissions routed to the endpoint
+            max_concurrency: Most outstanding submissions (0 is uncapped)
+            breaker: Circuit breaker guarding the endpoint
+            quota: Plan quota limiter (self-hosted endpoints default to unpaced)
+        """
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.weight = weight if weight > 0 else 1.0
+        self.max_concurrency = max_concurrency
+
+        self.headers = {'Content-Type': 'application/json'}
+        if api_key:
+            self.headers['X-RapidAPI-Key'] = api_key
+            self.headers['X-RapidAPI-Host'] = urlparse(self.base_url).hostname or ''
+        if auth_token:
+            self.headers['X-Auth-Token'] = auth_token
+
+        self.breaker = breaker or CircuitBreaker(f'Judge0 {name}')
+        self.quota = quota or QuotaLimiter(f'Judge0 {name}', rate=DEFAULT_RATE if api_key else 0)
+
+        self.outstanding = 0
+        self.submissions = 0
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._total_latency = 0.0
+        self._ewma_latency: Optional[float] = None
+        self._statuses = Counter()
+
+    def has_capacity(self, cost: int = 1) -> bool:
+        return (not self.max_concurrency or self.outstanding == 0
+                or self.outstanding + cost <= self.max_concurrency)
+
+    def load(self) -> float:
+        """Routing score: outstanding submissions per unit of weight, counting the next one"""
+        return (self.outstanding + 1) / self.weight
+
+    def record(self, latency: float, status_code: Optional[int] = None, operation: str = 'request'):
+        """Record one HTTP request's latency and status (None for a transport error)"""
+        UPSTREAM_DURATION.observe(latency, self.name, operation)
+        UPSTREAM_RESPONSES.inc(self.name, operation, 'error' if status_code is None else str(status_code))
+        with self._lock:
+            self._requests += 1
+            self._total_latency += latency
+            if self._ewma_latency is None:
+                self._ewma_latency = latency
+            else:
+                self._ewma_latency += LATENCY_DECAY * (latency - self._ewma_latency)
+            if status_code is None or status_code >= 500 or status_code == 429:
+                self._errors += 1
+            self._statuses['error' if status_code is None else str(status_code)] += 1
+
+    @property
+    def latency(self) -> float:
+        return self._ewma_latency or 0.0
+
+    def stats(self) -> dict:
+        """Return routing, latency, health and quota statistics"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'base_url': self.base_url,
+                'weight': self.weight,
+                'max_concurrency': self.max_concurrency,
+                'outstanding': self.outstanding,
+                'submissions': self.submissions,
+                'requests': self._requests,
+                'errors': self._errors,
+                'avg_latency_ms': (
+                    round(self._total_latency / self._requests * 1000, 1) if self._requests else None
+                ),
+                'ewma_latency_ms': (
+                    round(self._ewma_latency * 1000, 1) if self._ewma_latency is not None else None
+                ),
+                'statuses': dict(self._statuses),
+                'circuit_breaker': self.breaker.stats(),
+                'quota': self.quota.stats(),
+            }
+
+
+class EndpointPool:
+    """
+    Thread-safe least-outstanding-requests router over Judge0 endpoints
+
+    `acquire` picks the endpoint with the lowest outstanding-per-weight load
+    (lower recent latency breaks ties) among those with spare concurrency,
+    a closed circuit and quota to admit the work, and charges the work to
+    it until `release`. Callers fail over by acquiring again with the
+    endpoints already tried excluded.
+    """
+
+    def __init__(self, endpoints: List[Endpoint]):
+        if not endpoints:
+            raise ValueError("At least one Judge0 endpoint is required")
+        self.endpoints = list(endpoints)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def single(cls, api_key: Optional[str] = None, base_url: str = DEFAULT_BASE_URL,
+               breaker: Optional[CircuitBreaker] = None,
+               quota: Optional[QuotaLimiter] = None) -> 'EndpointPool':
+        """Pool holding the one RapidAPI endpoint used without JUDGE0_ENDPOINTS"""
+        return cls([Endpoint(
+            'default', base_url, api_key or DEFAULT_API_KEY,
+            breaker=breaker or CircuitBreaker('Judge0 API'),
+            quota=quota or get_shared_limiter(),
+        )])
+
+    @classmethod
+    def from_config(cls, config: Iterable[dict]) -> 'EndpointPool':
+        """
+        Build a pool from endpoint dicts as found in JUDGE0_ENDPOINTS
+
+        Keys: url (required), name, key (RapidAPI), auth_token (self-hosted),
+        weight, max_concurrency, and the quota overrides rps, burst, per_day.
+        """
+        endpoints = []
+        for index, entry in enumerate(config):
+            if not isinstance(entry, dict) or not entry.get('url'):
+                raise ValueError(f"Judge0 endpoint #{index + 1} needs a 'url'")
+            name = str(entry.get('name') or urlparse(entry['url']).hostname or f'endpoint-{index + 1}')
+            # Each RapidAPI key has its own plan; self-hosted instances are unpaced by default
+            quota = QuotaLimiter(
+                f'Judge0 {name}',
+                rate=float(entry.get('rps', DEFAULT_RATE if entry.get('key') else 0)),
+                burst=int(entry.get('burst', DEFAULT_BURST)),
+                daily_limit=int(entry.get('per_day', DEFAULT_DAILY_LIMIT)),
+            )
+            endpoints.append(Endpoint(
+                name, entry['url'],
+                api_key=entry.get('key'),
+                auth_token=entry.get('auth_token'),
+                weight=float(entry.get('weight', 1.0)),
+                max_concurrency=int(entry.get('max_concurrency', 0)),
+                quota=quota,
+            ))
+        return cls(endpoints)
+
+    @classmethod
+    def from_env(cls) -> 'EndpointPool':
+        """Build the pool from JUDGE0_ENDPOINTS (a JSON list), or the single default endpoint"""
+        if not DEFAULT_ENDPOINTS.strip():
+            return cls.single()
+        try:
+            config = json.loads(DEFAULT_ENDPOINTS)
+        except ValueError as e:
+            raise ValueError(f"JUDGE0_ENDPOINTS is not valid JSON: {e}")
+        pool = cls.from_config(config if isinstance(config, list) else [config])
+        logger.info(f"🔀 Routing Judge0 submissions across {len(pool)} endpoints: "
+                    f"{', '.join(endpoint.name for endpoint in pool.endpoints)}")
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def __iter__(self):
+        return iter(self.endpoints)
+
+    def acquire(self, cost: int = 1, exclude: Iterable[Endpoint] = ()) -> Tuple[Endpoint, float]:
+        """
+        Route `cost` submissions to the least loaded endpoint that admits them
+
+        Returns:
+            (endpoint, seconds to wait for its quota before submitting)
+
+        Raises:
+            QuotaExceeded: If every candidate is out of quota or at capacity
+            CircuitOpenError: If every candidate's circuit is open
+        """
+        exclude = set(exclude)
+        with self._lock:
+            candidates = sorted(
+                (endpoint for endpoint in self.endpoints
+                 if endpoint not in exclude and endpoint.has_capacity(cost)),
+                key=lambda endpoint: (endpoint.load(), endpoint.latency)
+            )
+            if not candidates:
+                raise QuotaExceeded(1, "All Judge0 endpoints are at capacity", 503)
+
+            errors = []
+            for endpoint in candidates:
+                if endpoint.breaker.rejecting():
+                    errors.append(CircuitOpenError(endpoint.breaker.retry_after(), endpoint.breaker.name))
+                    continue
+                try:
+                    wait = endpoint.quota.admit(cost)
+                except QuotaExceeded as e:
+                    errors.append(e)
+                    continue
+                # Checked after the quota so a refused admission never claims the
+                # half-open trial; a refused trial hands the tokens back instead
+                if not endpoint.breaker.allow():
+                    endpoint.quota.refund(cost, wait)
+                    errors.append(CircuitOpenError(endpoint.breaker.retry_after(), endpoint.breaker.name))
+                    continue
+                endpoint.outstanding += cost
+                endpoint.submissions += cost
+                IN_FLIGHT.inc(endpoint.name, amount=cost)
+                return endpoint, wait
+
+        # Nothing admitted the work: report the soonest retry
+        raise min(errors, key=lambda error: error.retry_after)
+
+    def release(self, endpoint: Endpoint, cost: int = 1):
+        """Return `cost` submissions' worth of capacity to `endpoint`"""
+        with self._lock:
+            released = min(cost, endpoint.outstanding)
+            endpoint.outstanding -= released
+        IN_FLIGHT.dec(endpoint.name, amount=released)
+
+    def stats(self) -> List[dict]:
+        """Return per-endpoint statistics"""
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+
+_shared_endpoints: Optional[EndpointPool] = None
+_shared_endpoints_lock = threading.Lock()
+
+
+def get_shared_endpoints() -> EndpointPool:
+    """Return the process-wide Judge0 endpoint pool, creating it on first use"""
+    global _shared_endpoints
+    if _shared_endpoints is None:
+        with _shared_endpoints_lock:
+            if _shared_endpoints is None:
+                _shared_endpoints = EndpointPool.from_env()
+    return _shared_endpoints
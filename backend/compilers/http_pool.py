@@ -0,0 +1,166 @@
+"""
+Pooled HTTP Transport for Judge0
+This module provides a shared, thread-safe keep-alive session so every call
+to the Judge0 API reuses warm TCP/TLS connections instead of handshaking again
+"""
+
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_POOL_SIZE = int(os.environ.get('JUDGE0_POOL_SIZE', 20))
+DEFAULT_RETRIES = int(os.environ.get('JUDGE0_POOL_RETRIES', 3))
+DEFAULT_BACKOFF = float(os.environ.get('JUDGE0_POOL_BACKOFF', 0.3))
+DEFAULT_WARM_CONNECTIONS = int(os.environ.get('JUDGE0_POOL_WARM', 4))
+
+
+class HTTPPool:
+    """
+    Keep-alive connection pool shared by all Judge0 API calls
+
+    Wraps a single requests.Session whose adapter keeps up to `pool_size`
+    idle connections per host. Idempotent GETs are retried at the transport
+    level with exponential backoff; POSTs are never retried so a submission
+    is not created twice.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=False,
+        )
+
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._total_latency = 0.0
+        self._warmed = 0
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session and record its latency"""
+        start = time.time()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._requests += 1
+                self._errors += 1
+                self._total_latency += time.time() - start
+            raise
+        with self._lock:
+            self._requests += 1
+            self._total_latency += time.time() - start
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def warm(self, url: str, headers: Optional[dict] = None,
+             connections: int = DEFAULT_WARM_CONNECTIONS, timeout: int = 10) -> int:
+        """
+        Pre-open `connections` keep-alive connections to the host of `url`
+
+        The requests are issued concurrently so each one checks out its own
+        connection; once they return, the connections sit idle in the pool.
+
+        Returns:
+            Number of warm-up requests that succeeded
+        """
+        connections = max(1, min(connections, self.pool_size))
+
+        def _hit(_):
+            try:
+                response = self.get(url, headers=headers, timeout=timeout)
+                return response.status_code < 500
+            except requests.RequestException:
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            warmed = sum(1 for ok in executor.map(_hit, range(connections)) if ok)
+
+        with self._lock:
+            self._warmed += warmed
+        logger.info(f"🔥 HTTP pool pre-warmed {warmed}/{connections} connections")
+        return warmed
+
+    def stats(self) -> dict:
+        """Return pool usage statistics for sizing the pool"""
+        hosts = []
+        pools = self._adapter.poolmanager.pools
+        with pools.lock:
+            host_pools = list(pools._container.items())
+        for key, pool in host_pools:
+            hosts.append({
+                'host': f"{key.key_scheme}://{key.key_host}:{key.key_port}",
+                'connections_opened': pool.num_connections,
+                'requests_sent': pool.num_requests,
+                'idle_connections': sum(1 for conn in list(pool.pool.queue) if conn) if pool.pool else 0,
+                'max_size': pool.pool.maxsize if pool.pool else 0,
+            })
+
+        with self._lock:
+            requests_total = self._requests
+            avg_latency = self._total_latency / requests_total if requests_total else 0.0
+            return {
+                'pool_size': self.pool_size,
+                'retries': self.retries,
+                'backoff_factor': self.backoff_factor,
+                'requests': requests_total,
+                'errors': self._errors,
+                'avg_latency': round(avg_latency, 4),
+                'warmed_connections': self._warmed,
+                'hosts': hosts,
+            }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_shared_pool: Optional[HTTPPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> HTTPPool:
+    """Return the process-wide HTTP pool, creating it on first use"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = HTTPPool()
+    return _shared_pool
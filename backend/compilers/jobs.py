@@ -0,0 +1,251 @@
+"""
+Background Execution Jobs
+This module runs submissions on a bounded pool of worker threads so HTTP
+handlers can hand work off and return immediately, with finished jobs kept
+around for a limited time so clients can collect their results
+"""
+
+import contextvars
+import os
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .tracing import add_span
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_WORKERS = int(os.environ.get('JOB_WORKERS', 16))
+DEFAULT_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 200))
+DEFAULT_TTL = float(os.environ.get('JOB_TTL', 600))
+
+
+class JobQueueFull(Exception):
+    """Raised when the job manager cannot accept more work"""
+
+
+class Job:
+    """A single submission tracked by the JobManager"""
+
+    # Job lifecycle states
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+    def __init__(self, language: str = 'unknown', backend: str = 'judge0'):
+        self.id = uuid.uuid4().hex
+        self.language = language
+        self.backend = backend
+        self.status = Job.QUEUED
+        self.result = None
+        self.error: Optional[str] = None
+        self.exception: Optional[Exception] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False if `timeout` elapsed first"""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        """Describe the job's progress (without its result)"""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'language': self.language,
+            'backend': self.backend,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """
+    Bounded background executor for submissions
+
+    At most `max_workers` jobs run at once and at most `max_pending` more may
+    wait for a worker; beyond that `submit` raises JobQueueFull. Finished
+    jobs are discarded `ttl` seconds after completion. `drain` stops
+    accepting jobs and waits for the ones in progress, for graceful shutdown;
+    requests that run inline instead of as jobs register with `hold` and
+    `release` so the drain waits for them too.
+    Jobs run in a copy of the submitter's context, so request-scoped state
+    such as the request's trace follows them onto the worker thread.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 ttl: float = DEFAULT_TTL):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='judge0-job')
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._jobs = {}
+        self._active = 0
+        self._inline = 0
+        self._draining = False
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._expired = 0
+        self._last_gc = time.monotonic()
+
+    def submit(self, fn: Callable, *args, language: str = 'unknown', backend: str = 'judge0',
+               **kwargs) -> Job:
+        """
+        Queue `fn(*args, **kwargs)` for background execution
+
+        Returns:
+            The Job tracking the call
+
+        Raises:
+            JobQueueFull: If all workers are busy and the wait queue is full
+        """
+        self._collect_garbage()
+
+        job = Job(language, backend)
+        with self._lock:
+            if self._draining:
+                self._rejected += 1
+                raise JobQueueFull("Server is shutting down")
+            if self._active >= self.max_workers + self.max_pending:
+                self._rejected += 1
+                raise JobQueueFull(f"Job queue full ({self._active} jobs in progress)")
+            self._active += 1
+            self._jobs[job.id] = job
+
+        try:
+            self._executor.submit(contextvars.copy_context().run, self._run, job, fn, args, kwargs)
+        except RuntimeError as e:
+            # Executor already shut down
+            with self._lock:
+                self._active -= 1
+                self._jobs.pop(job.id, None)
+            raise JobQueueFull(str(e))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job with `job_id`, or None if unknown or expired"""
+        self._collect_garbage()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str):
+        """Forget a job whose result has already been delivered"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def hold(self):
+        """
+        Count work running outside the executor (an inline request) as in
+        progress until `release`, so `drain` waits for it
+
+        Raises:
+            JobQueueFull: If the manager is draining
+        """
+        with self._lock:
+            if self._draining:
+                self._rejected += 1
+                raise JobQueueFull("Server is shutting down")
+            self._inline += 1
+
+    def release(self):
+        """End work registered with `hold`"""
+        with self._lock:
+            self._inline -= 1
+            if self._active == 0 and self._inline == 0:
+                self._idle.notify_all()
+
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict):
+        job.status = Job.RUNNING
+        job.started_at = time.time()
+        add_span('job_queue', job.started_at - job.created_at)
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = Job.FINISHED
+        except Exception as e:
+            logger.error(f"❌ Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.exception = e
+            job.status = Job.FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active -= 1
+                if job.status == Job.FINISHED:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                if self._active == 0 and self._inline == 0:
+                    self._idle.notify_all()
+            job._done.set()
+
+    def _collect_garbage(self):
+        """Drop finished jobs older than the TTL (at most once a second)"""
+        now = time.monotonic()
+        if now - self._last_gc < 1.0:
+            return
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            self._last_gc = now
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.done and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            self._expired += len(expired)
+
+    def stats(self) -> dict:
+        """Return executor occupancy and job counters"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'active': self._active,
+                'inline': self._inline,
+                'tracked': len(self._jobs),
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'expired': self._expired,
+                'ttl': self.ttl,
+                'draining': self._draining,
+            }
+
+    def stop_accepting(self):
+        """Reject every further submission with JobQueueFull"""
+        with self._lock:
+            self._draining = True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs and wait for those in progress, and for held
+        inline work, to finish
+
+        Returns:
+            True if everything finished within `timeout` seconds
+        """
+        with self._lock:
+            self._draining = True
+            if self._active or self._inline:
+                logger.info(f"⏳ Draining {self._active} in-flight jobs and {self._inline} inline requests")
+            return self._idle.wait_for(lambda: self._active == 0 and self._inline == 0, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs, optionally waiting for running ones to finish"""
+        self._executor.shutdown(wait=wait)
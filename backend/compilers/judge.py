@@ -0,0 +1,235 @@
+"""
+Test-Case Judging
+This module runs one program against a list of (stdin, expected output)
+cases through a backend's compile_and_run_many, so the cases share Judge0
+batch submissions or run side by side locally, compares every output with
+its expected text under a configurable normalization, and reports a
+verdict, time and memory per case. With stop_on_failure the cases go out
+in waves and the rest are skipped once a wave fails, saving quota.
+"""
+
+import math
+import os
+from typing import List, NamedTuple, Optional
+
+from .base_compiler import CompilerResult
+from .judge0_compiler import truncate_output
+from .tracing import span
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_MAX_CASES = int(os.environ.get('JUDGE_MAX_CASES', 50))
+DEFAULT_MAX_CASE_OUTPUT = int(os.environ.get('JUDGE_MAX_CASE_OUTPUT', 4096))
+
+# 'exact' compares byte for byte, 'lines' ignores trailing whitespace and
+# blank lines at the end, 'tokens' compares whitespace-separated words
+COMPARE_MODES = ('exact', 'lines', 'tokens')
+
+
+class JudgeOptions(NamedTuple):
+    """How outputs are compared and whether judging stops at the first failure"""
+    compare: str = 'lines'
+    ignore_case: bool = False
+    float_tolerance: Optional[float] = None  # Absolute or relative difference allowed between numbers
+    stop_on_failure: bool = False
+
+
+def parse_cases(data: dict, max_cases: int = DEFAULT_MAX_CASES) -> tuple:
+    """
+    Validate the cases and options of a judge request body
+
+    Returns:
+        (list of {'name', 'stdin', 'expected_output'} dicts, JudgeOptions)
+
+    Raises:
+        ValueError: With a message for the client when the body is invalid
+    """
+    cases = data.get('cases')
+    if not isinstance(cases, list) or not cases:
+        raise ValueError('No test cases provided')
+    if len(cases) > max_cases:
+        raise ValueError(f'Too many test cases ({len(cases)}); the limit is {max_cases}')
+
+    parsed = []
+    for index, case in enumerate(cases):
+        if not isinstance(case, dict) or not isinstance(case.get('expected_output'), str):
+            raise ValueError(f'Test case {index} needs an "expected_output" string')
+        stdin = case.get('stdin') or ''
+        if not isinstance(stdin, str):
+            raise ValueError(f'Test case {index} has a non-string "stdin"')
+        parsed.append({
+            'name': str(case.get('name') or f'case {index + 1}'),
+            'stdin': stdin,
+            'expected_output': case['expected_output']
+        })
+
+    compare = str(data.get('compare') or 'lines').lower()
+    if compare not in COMPARE_MODES:
+        raise ValueError(f'Unknown compare mode "{compare}". Supported: {", ".join(COMPARE_MODES)}')
+    tolerance = data.get('float_tolerance')
+    if tolerance is not None:
+        if isinstance(tolerance, bool) or not isinstance(tolerance, (int, float)) or tolerance < 0:
+            raise ValueError('"float_tolerance" must be a non-negative number')
+        if compare == 'exact':
+            raise ValueError('"float_tolerance" needs compare mode "lines" or "tokens"')
+
+    return parsed, JudgeOptions(
+        compare=compare,
+        ignore_case=data.get('ignore_case') is True,
+        float_tolerance=float(tolerance) if tolerance is not None else None,
+        stop_on_failure=data.get('stop_on_failure') is True
+    )
+
+
+def _tokens_match(actual: List[str], expected: List[str], tolerance: Optional[float]) -> bool:
+    if len(actual) != len(expected):
+        return False
+    for got, want in zip(actual, expected):
+        if got == want:
+            continue
+        if tolerance is None:
+            return False
+        try:
+            got_number, want_number = float(got), float(want)
+        except ValueError:
+            return False
+        if not math.isclose(got_number, want_number, rel_tol=tolerance, abs_tol=tolerance):
+            return False
+    return True
+
+
+def compare_output(actual: str, expected: str, options: JudgeOptions = JudgeOptions()) -> bool:
+    """Whether a program's output matches the expected output under `options`"""
+    if options.ignore_case:
+        actual, expected = actual.casefold(), expected.casefold()
+    if options.compare == 'exact':
+        return actual == expected
+    if options.compare == 'tokens':
+        return _tokens_match(actual.split(), expected.split(), options.float_tolerance)
+
+    actual_lines = [line.rstrip() for line in actual.replace('\r\n', '\n').split('\n')]
+    expected_lines = [line.rstrip() for line in expected.replace('\r\n', '\n').split('\n')]
+    while actual_lines and not actual_lines[-1]:
+        actual_lines.pop()
+    while expected_lines and not expected_lines[-1]:
+        expected_lines.pop()
+    if options.float_tolerance is None:
+        return actual_lines == expected_lines
+    return len(actual_lines) == len(expected_lines) and all(
+        _tokens_match(got.split(), want.split(), options.float_tolerance)
+        for got, want in zip(actual_lines, expected_lines)
+    )
+
+
+def case_verdict(result: CompilerResult, passed: bool) -> str:
+    """'Accepted' or 'Wrong Answer' for a completed run, otherwise the backend's status"""
+    if result.success:
+        return 'Accepted' if passed else 'Wrong Answer'
+    return result.status or 'Internal Error'
+
+
+def plan_waves(count: int, options: JudgeOptions, wave_size: int) -> List[range]:
+    """
+    Split the case indexes into the groups sent to the backend together
+
+    Without stop_on_failure every case goes in one call. With it, the first
+    case runs alone (a compile error or wrong answer there costs one run),
+    then the rest go `wave_size` at a time.
+    """
+    if not options.stop_on_failure:
+        return [range(count)]
+    waves, start, size = [], 0, 1
+    while start < count:
+        waves.append(range(start, min(count, start + size)))
+        start += size
+        size = max(1, wave_size)
+    return waves
+
+
+def wave_size_for(compiler) -> int:
+    """Cases a backend runs in one compile_and_run_many call without queueing"""
+    return getattr(compiler, 'max_batch_size', None) or getattr(compiler, 'max_parallel', 1)
+
+
+def _wave_items(code: str, language: str, timeout: int, cases: List[dict], wave: range) -> List[dict]:
+    return [{'code': code, 'language': language, 'timeout': timeout, 'stdin': cases[index]['stdin']}
+            for index in wave]
+
+
+def judge_case(index: int, case: dict, result: CompilerResult, options: JudgeOptions,
+               max_output: int = DEFAULT_MAX_CASE_OUTPUT) -> dict:
+    """Per-case report: verdict, run time (s), memory (KB) and, on failure, what was expected"""
+    passed = result.success and compare_output(result.output, case['expected_output'], options)
+    output, omitted = truncate_output(result.output, max_output)
+    report = {
+        'index': index,
+        'name': case['name'],
+        'verdict': case_verdict(result, passed),
+        'passed': passed,
+        'time': result.run_time,
+        'memory': result.memory_kb,
+        'wall_time': round(result.execution_time, 3),
+        'exit_code': result.exit_code,
+        'output': output,
+        'truncated': omitted > 0
+    }
+    if not passed:
+        report['expected_output'] = truncate_output(case['expected_output'], max_output)[0]
+        report['error'] = truncate_output(result.error, max_output)[0]
+    return report
+
+
+def summarize(cases: List[dict], reports: List[Optional[dict]]) -> dict:
+    """Overall verdict and counts, with skipped cases filled in"""
+    for index, case in enumerate(cases):
+        if reports[index] is None:
+            reports[index] = {'index': index, 'name': case['name'], 'verdict': 'Skipped', 'passed': False}
+    passed = sum(1 for report in reports if report['passed'])
+    skipped = sum(1 for report in reports if report['verdict'] == 'Skipped')
+    verdict = next((report['verdict'] for report in reports
+                    if not report['passed'] and report['verdict'] != 'Skipped'), 'Accepted')
+    return {
+        'success': passed == len(cases),
+        'verdict': verdict,
+        'passed': passed,
+        'failed': len(cases) - passed - skipped,
+        'skipped': skipped,
+        'total': len(cases),
+        'cases': reports
+    }
+
+
+def run_cases(compiler, code: str, language: str, cases: List[dict], options: JudgeOptions,
+              timeout: int = 30, use_cache: bool = True) -> dict:
+    """
+    Judge `code` against every case on a synchronous backend
+
+    Returns:
+        The summarize() report; backend errors such as QuotaExceeded propagate
+    """
+    reports: List[Optional[dict]] = [None] * len(cases)
+    for wave in plan_waves(len(cases), options, wave_size_for(compiler)):
+        with span('judge_wave', cases=len(wave)):
+            results = compiler.compile_and_run_many(_wave_items(code, language, timeout, cases, wave),
+                                                    timeout, use_cache=use_cache)
+        with span('compare'):
+            for index, result in zip(wave, results):
+                reports[index] = judge_case(index, cases[index], result, options)
+        if options.stop_on_failure and not all(reports[index]['passed'] for index in wave):
+            break
+    return summarize(cases, reports)
+
+
+async def run_cases_async(compiler, code: str, language: str, cases: List[dict], options: JudgeOptions,
+                          timeout: int = 30, use_cache: bool = True) -> dict:
+    """run_cases for the asyncio backend"""
+    reports: List[Optional[dict]] = [None] * len(cases)
+    for wave in plan_waves(len(cases), options, wave_size_for(compiler)):
+        with span('judge_wave', cases=len(wave)):
+            results = await compiler.compile_and_run_many(_wave_items(code, language, timeout, cases, wave),
+                                                          timeout, use_cache=use_cache)
+        with span('compare'):
+            for index, result in zip(wave, results):
+                reports[index] = judge_case(index, cases[index], result, options)
+        if options.stop_on_failure and not all(reports[index]['passed'] for index in wave):
+            break
+    return summarize(cases, reports)
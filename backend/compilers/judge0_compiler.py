@@ -5,39 +5,135 @@ for platform-compatible deployment (Railway, Heroku, Vercel, etc.)
 """
 
 import requests
+import re
 import time
 import json
+import base64
 import logging
-from typing import NamedTuple, Optional
+from typing import List, Optional
 import os
 
+from .base_compiler import BaseCompiler, CompilerResult, StatusCallback
+from .http_pool import HTTPPool, DEFAULT_WARM_CONNECTIONS, get_shared_pool
+from .polling import PollingStrategy, get_shared_strategy
+from .result_cache import ResultCache, get_shared_cache, make_key
+from .syntax_checker import SyntaxChecker, get_shared_checker
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .quota import QuotaLimiter, QuotaExceeded
+from .endpoints import Endpoint, EndpointPool, get_shared_endpoints
+from .single_flight import SingleFlight
+from .metrics import POLLS, QUEUE_WAIT, SUBMISSION_BYTES, upstream_operation
+from .tracing import add_span, annotate, count, span
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class CompilerResult(NamedTuple):
-    """Data class to hold compilation results"""
-    success: bool
-    output: str
-    error: str
-    exit_code: int
-    execution_time: float
+# Languages whose Judge0 run includes a separate compile step
+COMPILED_LANGUAGES = {'c', 'cpp', 'c++', 'java', 'csharp', 'go', 'rust'}
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_BASE64 = os.environ.get('JUDGE0_BASE64', 'true').lower() == 'true'
+DEFAULT_STATUS_POLLING = os.environ.get('JUDGE0_STATUS_POLLING', 'false').lower() == 'true'
+
+# Submission fields requested from Judge0: enough to build a result, or just the status
+RESULT_FIELDS = 'token,status,stdout,stderr,compile_output,exit_code,time,memory'
+STATUS_FIELDS = 'token,status'
+
+# Payload and result fields carried base64-encoded when JUDGE0_BASE64 is on
+ENCODED_SUBMISSION_FIELDS = ('source_code', 'stdin', 'expected_output')
+ENCODED_RESULT_FIELDS = ('stdout', 'stderr', 'compile_output', 'message')
 
-class Judge0Compiler:
+# Most characters of output (and of errors) returned per result; the middle of longer output is dropped
+DEFAULT_MAX_RESPONSE_OUTPUT = int(os.environ.get('RESPONSE_MAX_OUTPUT', 1048576))
+
+# Response parts built only when requested through the `fields` option
+RESPONSE_FIELDS = ('output', 'errors', 'formatted_output')
+
+# Response parts always returned (accepted in `fields` for convenience)
+BASE_RESPONSE_FIELDS = ('success', 'exit_code', 'execution_time', 'language', 'compiler',
+                        'platform_compatible', 'truncated', 'omitted_chars', 'diagnostics', 'timing')
+
+def is_cacheable(result: CompilerResult) -> bool:
     """
-    A class to compile and run code using Judge0 API via RapidAPI
-    Works on any platform - no Docker required!
+    Whether a result reflects the program itself rather than the infrastructure
+    
+    HTTP errors, rejected submissions and polling timeouts (exit code 124) say
+    nothing about the code and must be retried, so they are never cached.
+    """
+    if result.exit_code == 124 and not result.success:
+        return False
+    infra_prefixes = ('Submission failed', 'Batch submission failed', 'Submission rejected',
+                      'API request failed', 'Execution error', 'Execution timeout')
+    return not result.error.startswith(infra_prefixes)
+
+def is_upstream_failure(result: CompilerResult) -> bool:
     """
+    Whether a result means Judge0 itself failed, as counted by the circuit breaker
     
-    def __init__(self, api_key: Optional[str] = None):
+    Connection errors, polling timeouts and 5xx/429 answers count; rejected
+    submissions and other 4xx answers are about the request, not the upstream.
+    """
+    status = re.match(r'(?:Batch s|S)ubmission failed: HTTP (\d+)', result.error)
+    if status:
+        code = int(status.group(1))
+        return code >= 500 or code == 429
+    return result.error.startswith(('API request failed', 'Execution error', 'Execution timeout'))
+
+def should_fail_over(results: List[CompilerResult]) -> bool:
+    """
+    Whether a call's results justify resubmitting it to another endpoint
+    
+    Every result must be an upstream failure; polling timeouts are excluded
+    since the program may simply be slow and a resubmission would double the wait.
+    """
+    return bool(results) and all(
+        is_upstream_failure(result) and not result.error.startswith('Execution timeout')
+        for result in results
+    )
+
+class Judge0Base:
+    """
+    Configuration and payload/result helpers shared by the Judge0 clients
+    """
+    
+    def __init__(self, api_key: Optional[str] = None,
+                 polling: Optional[PollingStrategy] = None,
+                 cache: Optional[ResultCache] = None,
+                 syntax_checker: Optional[SyntaxChecker] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 quota: Optional[QuotaLimiter] = None,
+                 endpoints: Optional[EndpointPool] = None):
         """
-        Initialize Judge0 compiler with RapidAPI credentials
+        Initialize Judge0 client configuration with RapidAPI credentials
         
         Args:
-            api_key: RapidAPI key for Judge0 CE (from environment or parameter)
+            api_key: RapidAPI key for a single Judge0 CE endpoint
+            polling: Result polling strategy (defaults to the shared process strategy)
+            cache: Result cache for identical runs (defaults to the shared process cache)
+            syntax_checker: Local syntax checker (defaults to the shared process checker)
+            breaker: Circuit breaker guarding that single endpoint
+            quota: Plan quota limiter of that single endpoint
+            endpoints: Judge0 endpoints to route across (defaults to the shared
+                process pool configured by JUDGE0_ENDPOINTS, unless one of
+                `api_key`, `breaker` or `quota` asks for a dedicated endpoint)
         """
-        self.api_key = api_key or "f38545accbmshb4e9fc5c29c4434p176d69jsnaccce6804686"
-        self.base_url = "https://judge0-ce.p.rapidapi.com"
+        if endpoints is None:
+            if api_key or breaker or quota:
+                endpoints = EndpointPool.single(api_key, breaker=breaker, quota=quota)
+            else:
+                endpoints = get_shared_endpoints()
+        # Each endpoint owns its credentials, circuit breaker and quota
+        self.endpoints = endpoints
+        
+        # Adaptive poll scheduling shared with the other compiler instances
+        self.polling = polling or get_shared_strategy()
+        
+        # Content-addressed cache of finished results
+        self.cache = cache or get_shared_cache()
+        
+        # Syntax-only requests are answered locally when a checker exists
+        self.syntax_checker = syntax_checker or get_shared_checker()
         
         # Judge0 Language ID mapping
         self.language_map = {
@@ -55,41 +151,341 @@ class Judge0Compiler:
             'ruby': 72,        # Ruby (2.7.0)
         }
         
-        # RapidAPI headers
-        self.headers = {
-            'Content-Type': 'application/json',
-            'X-RapidAPI-Key': self.api_key,
-            'X-RapidAPI-Host': 'judge0-ce.p.rapidapi.com'
+        # Judge0's default MAX_SUBMISSION_BATCH_SIZE
+        self.max_batch_size = int(os.environ.get('JUDGE0_MAX_BATCH_SIZE', 20))
+        
+        # Binary-safe transport, and polls that fetch output only once the run finished
+        self.base64 = DEFAULT_BASE64
+        self.status_polling = DEFAULT_STATUS_POLLING
+    
+    def get_supported_languages(self) -> list:
+        """Get list of supported programming languages"""
+        return list(self.language_map.keys())
+    
+    def get_cache_stats(self) -> dict:
+        """Get hit/miss counters and occupancy of the result cache"""
+        return self.cache.stats()
+    
+    def get_coalescing_stats(self) -> dict:
+        """Get in-flight executions and upstream calls saved by request coalescing"""
+        return self.coalescer.stats()
+    
+    def get_endpoint_stats(self) -> list:
+        """Get per-endpoint routing, latency, circuit breaker and quota statistics"""
+        return self.endpoints.stats()
+    
+    def _record_outcome(self, endpoint: Endpoint, results: List[CompilerResult]):
+        """Feed the endpoint's circuit breaker: a call fails only if every result is an upstream failure"""
+        if results and all(is_upstream_failure(result) for result in results):
+            endpoint.breaker.record_failure()
+        else:
+            endpoint.breaker.record_success()
+    
+    def _route(self, tried: List[Endpoint], results: List[CompilerResult], cost: int = 1):
+        """
+        Pick the endpoint for the next attempt at a call
+        
+        The first attempt goes to the least loaded endpoint. Later attempts
+        fail over to an endpoint not tried yet, but only while the previous
+        attempt's results are upstream failures.
+        
+        Returns:
+            (endpoint, seconds to wait for its quota), or None when the
+            previous results should stand
+            
+        Raises:
+            QuotaExceeded, CircuitOpenError: If no endpoint admits the first attempt
+        """
+        if tried:
+            if len(tried) >= len(self.endpoints) or not should_fail_over(results):
+                return None
+        try:
+            picked = self.endpoints.acquire(cost, exclude=tried)
+        except (QuotaExceeded, CircuitOpenError):
+            if not tried:
+                raise
+            return None
+        if tried:
+            logger.warning(f"🔀 Judge0 endpoint {tried[-1].name} failed ({results[0].error[:80]}) - "
+                           f"failing over to {picked[0].name}")
+        return picked
+    
+    def get_polling_stats(self) -> dict:
+        """Get the per-language completion times learned by the polling strategy"""
+        return self.polling.stats()
+    
+    def _record_finished(self, language: str, start_time: float, polls: int,
+                         submitted_at: Optional[float] = None):
+        """Feed a finished submission's timing to the polling strategy and the metrics"""
+        self.polling.record(language, time.time() - start_time)
+        POLLS.observe(polls, language)
+        if submitted_at is not None:
+            QUEUE_WAIT.observe(time.time() - submitted_at, language)
+            add_span('judge0_queue', time.time() - submitted_at, polls=polls)
+    
+    def _unsupported_language(self, language: str) -> CompilerResult:
+        """Build the result returned for a language Judge0 does not support"""
+        supported = ', '.join(self.language_map.keys())
+        return CompilerResult(
+            False, "", 
+            f"Unsupported language: {language}. Supported: {supported}", 
+            1, 0.0
+        )
+    
+    def _build_submission(self, code: str, language_id: int, timeout: int, stdin: str = '') -> dict:
+        """Build the Judge0 submission payload for a single program"""
+        return {
+            "source_code": code,
+            "language_id": language_id,
+            "stdin": stdin or "",
+            "cpu_time_limit": min(timeout, 15),  # Judge0 free tier limit
+            "memory_limit": 128000,  # 128MB
+            "wall_time_limit": min(timeout + 5, 20)
         }
+    
+    def _params(self, fields: Optional[str] = None, **params) -> dict:
+        """Query parameters of a Judge0 submissions call (returning `fields` when given)"""
+        params['base64_encoded'] = 'true' if self.base64 else 'false'
+        if fields:
+            params['fields'] = fields
+        return params
+    
+    def _encode_submission(self, payload: dict) -> dict:
+        """The payload as sent to Judge0: text fields base64-encoded when base64 transport is on"""
+        if not self.base64:
+            return payload
+        encoded = dict(payload)
+        for field in ENCODED_SUBMISSION_FIELDS:
+            if encoded.get(field):
+                encoded[field] = base64.b64encode(encoded[field].encode('utf-8')).decode('ascii')
+        return encoded
+    
+    def _decode_result(self, result: dict) -> dict:
+        """
+        Decode the base64 text fields of a Judge0 submission
+        
+        Output that isn't valid UTF-8 (binary writes, truncated multi-byte
+        characters) is decoded with replacement characters instead of failing.
+        """
+        if not self.base64 or not isinstance(result, dict):
+            return result
+        decoded = dict(result)
+        for field in ENCODED_RESULT_FIELDS:
+            if decoded.get(field):
+                decoded[field] = base64.b64decode(decoded[field]).decode('utf-8', errors='replace')
+        return decoded
+    
+    def _record_transfer(self, transfer: dict, submissions: int = 1):
+        """Record the Judge0 payload bytes one call moved, per submission and on the request's trace"""
+        for direction, total in transfer.items():
+            per_submission = total / max(1, submissions)
+            for _ in range(submissions):
+                SUBMISSION_BYTES.observe(per_submission, direction)
+        count(upstream_bytes_sent=transfer['sent'], upstream_bytes_received=transfer['received'])
+    
+    def _notify(self, on_status: Optional[StatusCallback], event: str, **data):
+        """Report a progress event to `on_status`, never letting it break execution"""
+        if on_status is None:
+            return
+        try:
+            on_status(event, data)
+        except Exception as e:
+            logger.warning(f"⚠️ Status callback failed for {event}: {e}")
+    
+    def _notify_finished(self, on_status: Optional[StatusCallback], language: str, result: dict):
+        """Report the compile step (for compiled languages) and the final status"""
+        status = result.get('status', {})
+        if language in COMPILED_LANGUAGES:
+            self._notify(on_status, 'compiled',
+                         status_id=status.get('id'),
+                         compile_output=result.get('compile_output') or "",
+                         compiled=status.get('id') != 6)  # 6 = Compilation Error
+        self._notify(on_status, 'finished',
+                     status_id=status.get('id'),
+                     status=status.get('description', 'Unknown'))
+    
+    def _syntax_check_source(self, code: str, language: str) -> tuple:
+        """Build the (source, language) pair that Judge0 runs to check syntax"""
+        if language.lower() == 'python':
+            # Python syntax check using ast.parse (repr keeps quotes in the code intact)
+            syntax_check_code = f'''
+import ast
+import sys
+
+try:
+    code = {code!r}
+    ast.parse(code)
+    print("✅ Syntax is valid")
+except SyntaxError as e:
+    print(f"❌ SyntaxError: {{e}}")
+    sys.exit(1)
+except Exception as e:
+    print(f"❌ Error: {{e}}")
+    sys.exit(1)
+'''
+            return syntax_check_code, 'python'
+        
+        # For compiled languages, compilation IS syntax checking
+        return code, language
+    
+    def _build_result(self, result: dict, start_time: float) -> CompilerResult:
+        """Convert a finished Judge0 submission into a CompilerResult"""
+        status_id = result.get('status', {}).get('id')
+        status_description = result.get('status', {}).get('description', 'Unknown')
+        
+        execution_time = time.time() - start_time
+        
+        stdout = result.get('stdout') or ""
+        stderr = result.get('stderr') or ""
+        compile_output = result.get('compile_output') or ""
+        exit_code = result.get('exit_code') or 0
+        
+        # Build error message
+        error_parts = []
+        if compile_output.strip():
+            error_parts.append(f"Compilation Error:\n{compile_output.strip()}")
+        if stderr.strip():
+            error_parts.append(f"Runtime Error:\n{stderr.strip()}")
+        
+        error_output = "\n\n".join(error_parts)
+        
+        # Determine success
+        success = (status_id == 3)  # Status 3 = Accepted
+        
+        if success:
+            logger.info(f"🎉 Execution successful - Output: {stdout[:50]}...")
+        else:
+            logger.warning(f"⚠️ Execution failed - Status: {status_description}")
+        
+        # Judge0 reports the run's CPU time in seconds (as a string) and memory in KB
+        run_time = result.get('time')
+        
+        return CompilerResult(
+            success=success,
+            output=stdout,
+            error=error_output,
+            exit_code=exit_code,
+            execution_time=execution_time,
+            status=status_description,
+            run_time=float(run_time) if run_time is not None else None,
+            memory_kb=result.get('memory')
+        )
+
+class Judge0Compiler(Judge0Base, BaseCompiler):
+    """
+    A class to compile and run code using Judge0 API via RapidAPI
+    Works on any platform - no Docker required!
+    """
+    
+    name = 'judge0'
+    display_name = 'Judge0 API'
+    
+    def __init__(self, api_key: Optional[str] = None, http_pool: Optional[HTTPPool] = None,
+                 polling: Optional[PollingStrategy] = None,
+                 cache: Optional[ResultCache] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 quota: Optional[QuotaLimiter] = None,
+                 endpoints: Optional[EndpointPool] = None,
+                 coalescer: Optional[SingleFlight] = None):
+        """
+        Initialize Judge0 compiler with RapidAPI credentials
         
+        Args:
+            api_key: RapidAPI key for a single Judge0 CE endpoint
+            http_pool: Pooled HTTP transport (defaults to the shared process pool)
+            polling: Result polling strategy (defaults to the shared process strategy)
+            cache: Result cache for identical runs (defaults to the shared process cache)
+            breaker: Circuit breaker guarding that single endpoint
+            quota: Plan quota limiter of that single endpoint
+            endpoints: Judge0 endpoints to route across (defaults to the shared process pool)
+            coalescer: Single-flight group joining identical in-flight submissions
+        """
+        super().__init__(api_key, polling, cache, breaker=breaker, quota=quota, endpoints=endpoints)
+        
+        # Shared keep-alive transport reused by every API call
+        self.http = http_pool or get_shared_pool()
+        
+        # Identical concurrent submissions share one Judge0 execution
+        self.coalescer = coalescer or SingleFlight()
+        
+        # No network calls here; connect() verifies the API when the caller chooses
         logger.info("🏛️ Judge0 RapidAPI compiler initialized")
+    
+    def _request(self, endpoint: Endpoint, method: str, path: str, charge: bool = True,
+                 transfer: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+        Send one request to a Judge0 endpoint through the pooled transport
         
-        # Test API connectivity
+        The request is paced by the endpoint's quota limiter unless its token
+        was already taken at admission (`charge=False`); its latency and the
+        plan quota headers of the answer are recorded on the endpoint, and its
+        body sizes are added to `transfer` ({'sent': n, 'received': n}).
+        """
+        if charge:
+            endpoint.quota.acquire()
+        operation = upstream_operation(method, path)
+        start = time.perf_counter()
         try:
-            self._test_connection()
-        except Exception as e:
-            logger.warning(f"⚠️ Judge0 API test failed: {e}")
+            response = self.http.request(method, f"{endpoint.base_url}{path}", headers=endpoint.headers, **kwargs)
+        except requests.RequestException:
+            endpoint.record(time.perf_counter() - start, operation=operation)
+            raise
+        endpoint.record(time.perf_counter() - start, response.status_code, operation)
+        endpoint.quota.observe(response.status_code, response.headers)
+        if transfer is not None:
+            transfer['sent'] += len(response.request.body or b'')
+            transfer['received'] += len(response.content)
+        return response
     
-    def _test_connection(self):
-        """Test connection to Judge0 API"""
+    def connect(self) -> bool:
+        """Test API connectivity and pre-warm pooled connections of every reachable endpoint"""
+        connected = False
+        for endpoint in self.endpoints:
+            if not self._test_connection(endpoint):
+                continue
+            connected = True
+            try:
+                self.warm_connections(endpoint=endpoint)
+            except Exception as e:
+                logger.warning(f"⚠️ Judge0 connection warm-up failed for {endpoint.name}: {e}")
+        return connected
+    
+    def _test_connection(self, endpoint: Endpoint):
+        """Test connection to one Judge0 endpoint"""
         try:
-            response = requests.get(
-                f"{self.base_url}/about",
-                headers=self.headers,
-                timeout=10
-            )
+            response = self._request(endpoint, 'GET', '/about', timeout=10)
             if response.status_code == 200:
                 about_info = response.json()
-                logger.info(f"✅ Judge0 API connected - Version: {about_info.get('version', 'Unknown')}")
+                logger.info(f"✅ Judge0 API connected ({endpoint.name}) - "
+                            f"Version: {about_info.get('version', 'Unknown')}")
                 return True
             else:
-                logger.error(f"❌ Judge0 API connection failed: {response.status_code}")
+                logger.error(f"❌ Judge0 API connection failed ({endpoint.name}): {response.status_code}")
                 return False
         except Exception as e:
-            logger.error(f"❌ Judge0 API connection error: {e}")
+            logger.error(f"❌ Judge0 API connection error ({endpoint.name}): {e}")
             return False
     
-    def compile_and_run(self, code: str, language: str = 'python', timeout: int = 30) -> CompilerResult:
+    def warm_connections(self, connections: Optional[int] = None,
+                         endpoint: Optional[Endpoint] = None) -> int:
+        """Pre-open keep-alive connections to a Judge0 host (every endpoint's by default)"""
+        connections = connections or DEFAULT_WARM_CONNECTIONS
+        warmed = 0
+        for target in ([endpoint] if endpoint else self.endpoints):
+            # Warm-up requests count against the plan, but aren't worth pacing
+            target.quota.reserve(connections)
+            warmed += self.http.warm(f"{target.base_url}/about", headers=target.headers,
+                                     connections=connections)
+        return warmed
+    
+    def get_pool_stats(self) -> dict:
+        """Get usage statistics of the pooled HTTP transport"""
+        return self.http.stats()
+    
+    def compile_and_run(self, code: str, language: str = 'python', timeout: int = 30,
+                        use_cache: bool = True,
+                        on_status: Optional[StatusCallback] = None,
+                        stdin: str = '') -> CompilerResult:
         """
         Compile and execute code using Judge0 API
         
@@ -97,46 +493,120 @@ class Judge0Compiler:
             code: Source code to execute
             language: Programming language ('python', 'javascript', 'cpp', etc.)
             timeout: Execution timeout in seconds
+            use_cache: Serve and store identical runs from the result cache and join
+                identical runs already in flight
+            on_status: Called with (event, data) on every status transition
+            stdin: Input fed to the program
             
         Returns:
             CompilerResult with execution details
+            
+        Raises:
+            QuotaExceeded: If no endpoint's quota can take the submission in time
+            CircuitOpenError: If every endpoint has been failing and the result isn't cached
+        """
+        # Normalize language name
+        language = language.lower().strip()
+        
+        # Get Judge0 language ID
+        language_id = self.language_map.get(language)
+        if not language_id:
+            return self._unsupported_language(language)
+        
+        # Prepare submission data
+        submission_data = self._build_submission(code, language_id, timeout, stdin)
+        
+        # Identical deterministic runs are answered from the cache
+        cache_key = make_key(submission_data)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"♻️ Returning cached {language} result")
+                annotate(cache='hit')
+                self._notify(on_status, 'finished', status='Cached', cached=True)
+                return cached
+        
+        def run() -> CompilerResult:
+            result = self._submit(language, submission_data, timeout, on_status)
+            if use_cache and is_cacheable(result):
+                self.cache.put(cache_key, result, len(result.output) + len(result.error))
+            return result
+        
+        # Identical submissions already in flight are joined instead of resubmitted,
+        # unless the caller opted out of reusing results (e.g. to re-run a random program)
+        with span('execute', language=language) as execution:
+            if use_cache:
+                result, shared = self.coalescer.do(cache_key, run)
+            else:
+                result, shared = run(), False
+            execution.set(coalesced=shared)
+        if shared:
+            logger.info(f"🔗 Joined an identical in-flight {language} submission")
+            self._notify(on_status, 'finished', status='Coalesced', coalesced=True)
+        return result
+    
+    def _submit(self, language: str, submission_data: dict, timeout: int,
+                on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """
+        Run one prepared payload on the least loaded endpoint, failing over
+        while submissions fail upstream
+        
+        Admission takes the submission's quota token, so the POST isn't charged again.
         """
+        tried, result = [], None
+        while True:
+            picked = self._route(tried, [result])
+            if picked is None:
+                break
+            endpoint, wait = picked
+            if wait:
+                with span('quota_wait', endpoint=endpoint.name):
+                    time.sleep(wait)
+            try:
+                result = self._execute(endpoint, language, submission_data, timeout, on_status)
+            finally:
+                self.endpoints.release(endpoint)
+            self._record_outcome(endpoint, [result])
+            tried.append(endpoint)
+        return result
+    
+    def _execute(self, endpoint: Endpoint, language: str, submission_data: dict, timeout: int,
+                 on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """Submit one prepared payload to a Judge0 endpoint and wait for its result"""
         start_time = time.time()
+        transfer = {'sent': 0, 'received': 0}
         
         try:
-            # Normalize language name
-            language = language.lower().strip()
-            
-            # Get Judge0 language ID
-            language_id = self.language_map.get(language)
-            if not language_id:
-                supported = ', '.join(self.language_map.keys())
-                return CompilerResult(
-                    False, "", 
-                    f"Unsupported language: {language}. Supported: {supported}", 
-                    1, 0.0
-                )
-            
             logger.info(f"📤 Submitting {language} code to Judge0 API...")
             
-            # Prepare submission data
-            submission_data = {
-                "source_code": code,
-                "language_id": language_id,
-                "stdin": "",
-                "cpu_time_limit": min(timeout, 15),  # Judge0 free tier limit
-                "memory_limit": 128000,  # 128MB
-                "wall_time_limit": min(timeout + 5, 20)
-            }
+            # Short runs can be answered synchronously by Judge0's wait=true mode,
+            # unless the caller wants to observe the intermediate statuses
+            budget = self.polling.budget(timeout)
+            wait = on_status is None and self.polling.should_wait(submission_data['wall_time_limit'])
+            payload = self._encode_submission(submission_data)
             
             # Submit code for execution
-            response = requests.post(
-                f"{self.base_url}/submissions",
-                headers=self.headers,
-                json=submission_data,
-                timeout=30
+            submit_started = time.perf_counter()
+            response = self._request(
+                endpoint, 'POST', '/submissions', charge=False, transfer=transfer,
+                params=self._params(RESULT_FIELDS, wait='true') if wait else self._params(),
+                json=payload,
+                timeout=submission_data['wall_time_limit'] + 30 if wait else 30
             )
             
+            # Instances with ENABLE_WAIT_RESULT off reject wait=true; fall back to polling
+            if wait and response.status_code == 400 and 'wait' in response.text.lower():
+                logger.warning("⚠️ Judge0 wait=true mode disabled upstream - switching to polling")
+                self.polling.use_sync_wait = False
+                response = self._request(
+                    endpoint, 'POST', '/submissions', transfer=transfer,
+                    params=self._params(),
+                    json=payload,
+                    timeout=30
+                )
+            add_span('submit', time.perf_counter() - submit_started, endpoint=endpoint.name,
+                     wait=wait, http_status=response.status_code)
+            
             if response.status_code != 201:
                 error_msg = f"Submission failed: HTTP {response.status_code} - {response.text}"
                 logger.error(f"❌ {error_msg}")
@@ -146,31 +616,38 @@ class Judge0Compiler:
             
             submission = response.json()
             token = submission['token']
+            submitted_at = time.time()
             logger.info(f"✅ Code submitted successfully - Token: {token}")
+            self._notify(on_status, 'submitted', token=token)
             
-            # Poll for execution results
-            max_polls = 30  # 30 seconds max wait
-            poll_interval = 1  # 1 second intervals
+            # Judge0 may answer a wait=true submission with the finished result
+            if submission.get('status', {}).get('id') not in [None, 1, 2]:
+                self._record_finished(language, start_time, polls=0)
+                return self._build_result(self._decode_result(submission), start_time)
             
-            for poll_count in range(max_polls):
-                time.sleep(poll_interval)
+            # Poll for execution results; status-only polls leave the output for one final fetch
+            fields = STATUS_FIELDS if self.status_polling else RESULT_FIELDS
+            last_status_id = None
+            for poll_count, delay in enumerate(self.polling.delays(language, budget)):
+                time.sleep(delay)
                 
                 # Get submission status
-                result_response = requests.get(
-                    f"{self.base_url}/submissions/{token}",
-                    headers=self.headers,
-                    timeout=10
-                )
+                # Polls stick to the endpoint that owns the token
+                poll_started = time.perf_counter()
+                result_response = self._request(endpoint, 'GET', f"/submissions/{token}", transfer=transfer,
+                                                params=self._params(fields), timeout=10)
                 
                 if result_response.status_code != 200:
+                    add_span('poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                             http_status=result_response.status_code)
                     logger.warning(f"⚠️ Status check failed: {result_response.status_code}")
                     continue
                 
                 result = result_response.json()
                 status_id = result.get('status', {}).get('id')
                 status_description = result.get('status', {}).get('description', 'Unknown')
-                
-                logger.info(f"📊 Poll {poll_count + 1}: Status {status_id} - {status_description}")
+                add_span('poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                         status=status_description)
                 
                 # Judge0 Status IDs:
                 # 1 = In Queue, 2 = Processing
@@ -179,46 +656,36 @@ class Judge0Compiler:
                 # 6 = Compilation Error, 11 = Runtime Error, etc.
                 
                 if status_id in [1, 2]:  # Still processing
+                    if status_id != last_status_id:
+                        last_status_id = status_id
+                        self._notify(on_status, 'queued' if status_id == 1 else 'processing',
+                                     status_id=status_id, status=status_description)
                     continue
                 
-                # Execution completed - extract results
-                execution_time = time.time() - start_time
-                
-                stdout = result.get('stdout') or ""
-                stderr = result.get('stderr') or ""
-                compile_output = result.get('compile_output') or ""
-                exit_code = result.get('exit_code') or 0
-                
-                # Build error message
-                error_parts = []
-                if compile_output.strip():
-                    error_parts.append(f"Compilation Error:\n{compile_output.strip()}")
-                if stderr.strip():
-                    error_parts.append(f"Runtime Error:\n{stderr.strip()}")
-                
-                error_output = "\n\n".join(error_parts)
-                
-                # Determine success
-                success = (status_id == 3)  # Status 3 = Accepted
-                
-                if success:
-                    logger.info(f"🎉 Execution successful - Output: {stdout[:50]}...")
-                else:
-                    logger.warning(f"⚠️ Execution failed - Status: {status_description}")
+                # Execution completed - fetch the output once if the polls left it out
+                if fields == STATUS_FIELDS:
+                    with span('fetch_result'):
+                        result_response = self._request(endpoint, 'GET', f"/submissions/{token}",
+                                                        transfer=transfer, params=self._params(RESULT_FIELDS),
+                                                        timeout=10)
+                    if result_response.status_code != 200:
+                        # The next poll asks for the full result instead
+                        logger.warning(f"⚠️ Result fetch failed: {result_response.status_code}")
+                        fields = RESULT_FIELDS
+                        continue
+                    result = result_response.json()
                 
-                return CompilerResult(
-                    success=success,
-                    output=stdout,
-                    error=error_output,
-                    exit_code=exit_code,
-                    execution_time=execution_time
-                )
+                # Extract results
+                result = self._decode_result(result)
+                self._record_finished(language, start_time, poll_count + 1, submitted_at)
+                self._notify_finished(on_status, language, result)
+                return self._build_result(result, start_time)
             
             # Polling timeout
             logger.error("⏰ Polling timeout - execution results not ready")
             return CompilerResult(
                 False, "", 
-                "Execution timeout - results not available within 30 seconds", 
+                f"Execution timeout - results not available within {budget:.0f} seconds", 
                 124, time.time() - start_time
             )
             
@@ -234,114 +701,318 @@ class Judge0Compiler:
                 False, "", f"Execution error: {str(e)}", 1, 
                 time.time() - start_time
             )
+        finally:
+            self._record_transfer(transfer)
     
-    def check_syntax(self, code: str, language: str = 'python') -> CompilerResult:
+    def compile_and_run_many(self, submissions: List[dict], timeout: int = 30,
+                             use_cache: bool = True) -> List[CompilerResult]:
         """
-        Check code syntax without full execution
+        Compile and execute several programs using Judge0 batch submissions
+        
+        Args:
+            submissions: List of dicts with 'code', 'language' and optional 'timeout' and 'stdin'
+            timeout: Default execution timeout in seconds for items without one
+            use_cache: Serve and store identical runs from the result cache
+            
+        Returns:
+            List of CompilerResult in the same order as `submissions`
+            
+        Raises:
+            QuotaExceeded: If no endpoint's quota can take the first chunk in time
+            CircuitOpenError: If every endpoint has been failing before any chunk was sent
         """
-        logger.info(f"🔍 Checking {language} syntax...")
+        results: List[Optional[CompilerResult]] = [None] * len(submissions)
         
-        if language.lower() == 'python':
-            # Python syntax check using ast.parse
-            syntax_check_code = f'''
-import ast
-import sys
-
-try:
-    code = """{code}"""
-    ast.parse(code)
-    print("✅ Syntax is valid")
-except SyntaxError as e:
-    print(f"❌ SyntaxError: {{e}}")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ Error: {{e}}")
-    sys.exit(1)
-'''
-            return self.compile_and_run(syntax_check_code, 'python', 10)
+        # Validate every item first so bad entries never reach Judge0
+        pending = []
+        for index, item in enumerate(submissions):
+            language = str(item.get('language') or 'python').lower().strip()
+            language_id = self.language_map.get(language)
+            if not language_id:
+                results[index] = self._unsupported_language(language)
+                continue
+            item_timeout = item.get('timeout', timeout)
+            submission_data = self._build_submission(item.get('code', ''), language_id, item_timeout,
+                                                     item.get('stdin') or '')
+            cached = self.cache.get(make_key(submission_data)) if use_cache else None
+            if cached is not None:
+                results[index] = cached
+                continue
+            pending.append((index, submission_data))
         
-        else:
-            # For compiled languages, compilation IS syntax checking
-            return self.compile_and_run(code, language, 10)
-    
-    def get_supported_languages(self) -> list:
-        """Get list of supported programming languages"""
-        return list(self.language_map.keys())
+        # Judge0 rejects batches above its configured size, so chunk them
+        for offset in range(0, len(pending), self.max_batch_size):
+            chunk = pending[offset:offset + self.max_batch_size]
+            tried, chunk_results = [], []
+            while True:
+                try:
+                    picked = self._route(tried, [result for _, result in chunk_results], len(chunk))
+                except (QuotaExceeded, CircuitOpenError) as error:
+                    if offset == 0:
+                        raise
+                    # Chunks already run keep their results; the rest fail fast
+                    chunk_results = [(index, CompilerResult(False, "", str(error), 1, 0.0))
+                                     for index, _ in chunk]
+                    break
+                if picked is None:
+                    break
+                endpoint, wait = picked
+                if wait:
+                    with span('quota_wait', endpoint=endpoint.name):
+                        time.sleep(wait)
+                try:
+                    chunk_results = self._run_batch(endpoint, chunk)
+                finally:
+                    self.endpoints.release(endpoint, len(chunk))
+                self._record_outcome(endpoint, [result for _, result in chunk_results])
+                tried.append(endpoint)
+            payloads = dict(chunk)
+            for index, result in chunk_results:
+                results[index] = result
+                if use_cache and is_cacheable(result):
+                    self.cache.put(make_key(payloads[index]), result, len(result.output) + len(result.error))
+        
+        return results
     
-    def is_available(self) -> bool:
-        """Check if Judge0 API is accessible"""
+    def _run_batch(self, endpoint: Endpoint, chunk: List[tuple]) -> List[tuple]:
+        """Submit one chunk through an endpoint's /submissions/batch and poll until it finishes"""
+        start_time = time.time()
+        transfer = {'sent': 0, 'received': 0}
+        
+        def _fail(message: str, exit_code: int = 1) -> List[tuple]:
+            return [(index, CompilerResult(False, "", message, exit_code, time.time() - start_time))
+                    for index, _ in chunk]
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/about",
-                headers=self.headers,
-                timeout=5
+            logger.info(f"📤 Submitting batch of {len(chunk)} programs to Judge0 API...")
+            
+            submit_started = time.perf_counter()
+            response = self._request(
+                endpoint, 'POST', '/submissions/batch', charge=False, transfer=transfer,
+                params=self._params(),
+                json={'submissions': [self._encode_submission(payload) for _, payload in chunk]},
+                timeout=30
             )
-            return response.status_code == 200
-        except:
-            return False
+            add_span('batch_submit', time.perf_counter() - submit_started, endpoint=endpoint.name,
+                     size=len(chunk), http_status=response.status_code)
+            
+            if response.status_code != 201:
+                error_msg = f"Batch submission failed: HTTP {response.status_code} - {response.text}"
+                logger.error(f"❌ {error_msg}")
+                return _fail(error_msg)
+            
+            # Judge0 answers with one entry per submission: a token or its validation errors
+            tokens = {}
+            finished = []
+            for (index, _), entry in zip(chunk, response.json()):
+                if isinstance(entry, dict) and entry.get('token'):
+                    tokens[entry['token']] = index
+                else:
+                    error_msg = f"Submission rejected: {json.dumps(entry)}"
+                    finished.append((index, CompilerResult(False, "", error_msg, 1, time.time() - start_time)))
+            
+            logger.info(f"✅ Batch submitted successfully - {len(tokens)} tokens")
+            
+            # Poll for execution results until the slowest item's deadline
+            budget = self.polling.budget(max(payload['wall_time_limit'] for _, payload in chunk))
+            
+            poll_count = -1
+            for poll_count, delay in enumerate(self.polling.delays(None, budget)):
+                if not tokens:
+                    break
+                time.sleep(delay)
+                
+                poll_started = time.perf_counter()
+                # Running items come back without output and finished ones leave
+                # `tokens`, so each output is fetched once without status-only polls
+                result_response = self._request(
+                    endpoint, 'GET', '/submissions/batch', transfer=transfer,
+                    params=self._params(RESULT_FIELDS, tokens=','.join(tokens)),
+                    timeout=10
+                )
+                
+                if result_response.status_code != 200:
+                    add_span('batch_poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                             http_status=result_response.status_code)
+                    logger.warning(f"⚠️ Batch status check failed: {result_response.status_code}")
+                    continue
+                
+                for result in result_response.json().get('submissions', []):
+                    if not result or result.get('token') not in tokens:
+                        continue
+                    if result.get('status', {}).get('id') in [1, 2]:  # Still processing
+                        continue
+                    finished.append((tokens.pop(result['token']),
+                                     self._build_result(self._decode_result(result), start_time)))
+                
+                add_span('batch_poll', time.perf_counter() - poll_started, attempt=poll_count + 1,
+                         running=len(tokens))
+            
+            POLLS.observe(poll_count + 1, 'batch')
+            
+            # Polling timeout for whatever has not finished yet
+            if tokens:
+                logger.error(f"⏰ Polling timeout - {len(tokens)} batch results not ready")
+            for index in tokens.values():
+                finished.append((index, CompilerResult(
+                    False, "", 
+                    f"Execution timeout - results not available within {budget:.0f} seconds", 
+                    124, time.time() - start_time
+                )))
+            
+            return finished
+            
+        except requests.RequestException as e:
+            logger.error(f"❌ Judge0 batch request failed: {e}")
+            return _fail(f"API request failed: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Unexpected error in Judge0 batch execution: {e}")
+            return _fail(f"Execution error: {str(e)}")
+        finally:
+            self._record_transfer(transfer, len(chunk))
+    
+    
+    def check_syntax(self, code: str, language: str = 'python', use_cache: bool = True,
+                     on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """
+        Check code syntax without full execution
+        
+        Answered locally with structured diagnostics when a local checker
+        exists for the language, otherwise by a Judge0 run.
+        """
+        result = self.syntax_checker.check(code, language, on_status=on_status)
+        if result is not None:
+            return result
+        
+        logger.info(f"🔍 Checking {language} syntax via Judge0...")
+        source, language = self._syntax_check_source(code, language)
+        return self.compile_and_run(source, language, 10, use_cache=use_cache, on_status=on_status)
+    
+    def is_available(self) -> bool:
+        """Check if any Judge0 endpoint is accessible"""
+        for endpoint in self.endpoints:
+            try:
+                if self._request(endpoint, 'GET', '/about', timeout=5).status_code == 200:
+                    return True
+            except:
+                pass
+        return False
     
     def get_language_info(self) -> dict:
-        """Get detailed language information from Judge0"""
-        try:
-            response = requests.get(
-                f"{self.base_url}/languages",
-                headers=self.headers,
-                timeout=10
-            )
-            if response.status_code == 200:
-                return response.json()
-            return {}
-        except:
-            return {}
+        """Get detailed language information from the first Judge0 endpoint that answers"""
+        for endpoint in self.endpoints:
+            try:
+                response = self._request(endpoint, 'GET', '/languages', timeout=10)
+                if response.status_code == 200:
+                    return response.json()
+            except:
+                pass
+        return {}
+
+def parse_response_fields(value) -> Optional[frozenset]:
+    """
+    Parse a request's `fields` option ("output,errors" or a list)
+    
+    Returns:
+        The optional response parts to build, or None for all of them
+        
+    Raises:
+        ValueError: If a field name is unknown
+    """
+    if value is None or value == '':
+        return None
+    names = value.split(',') if isinstance(value, str) else value
+    if not isinstance(names, (list, tuple)):
+        raise ValueError('"fields" must be a comma-separated string or a list')
+    fields = {str(name).strip() for name in names} - {''}
+    unknown = fields - set(RESPONSE_FIELDS) - set(BASE_RESPONSE_FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}. '
+                         f'Optional fields: {", ".join(RESPONSE_FIELDS)}')
+    return frozenset(fields & set(RESPONSE_FIELDS))
 
-def format_judge0_output(result: CompilerResult, language: str = 'unknown') -> dict:
+def truncate_output(text: str, limit: int = DEFAULT_MAX_RESPONSE_OUTPUT) -> tuple:
+    """
+    Keep the head and tail of `text` within `limit` characters
+    
+    Returns:
+        (text, number of characters dropped from the middle)
+    """
+    if limit <= 0 or len(text) <= limit:
+        return text, 0
+    head = limit // 2
+    omitted = len(text) - limit
+    return f"{text[:head]}\n... [{omitted} characters truncated] ...\n{text[len(text) - (limit - head):]}", omitted
+
+def format_judge0_output(result: CompilerResult, language: str = 'unknown',
+                         compiler: str = 'Judge0 API', fields: Optional[frozenset] = None,
+                         max_output: int = DEFAULT_MAX_RESPONSE_OUTPUT) -> dict:
     """
     Format Judge0 execution result for consistent API response
     
+    Output and errors are capped at `max_output` characters each (head and
+    tail kept, `truncated` set) before anything is built from them, and the
+    line lists and display text are only built when `fields` asks for them.
+    
     Args:
         result: CompilerResult from Judge0 execution
         language: Programming language used
+        compiler: Display name of the backend that produced the result
+        fields: Optional parts to build (see RESPONSE_FIELDS); None builds all
+        max_output: Most characters of output and of errors returned
         
     Returns:
         Formatted dictionary for API response
     """
+    fields = RESPONSE_FIELDS if fields is None else fields
+    output, output_omitted = truncate_output(result.output or '', max_output)
+    error, error_omitted = truncate_output(result.error or '', max_output)
     
-    # Split output and errors into lines
-    output_lines = result.output.split('\n') if result.output else []
-    error_lines = result.error.split('\n') if result.error else []
+    response = {'success': result.success}
     
-    # Remove empty lines
-    output_lines = [line for line in output_lines if line.strip()]
-    error_lines = [line for line in error_lines if line.strip()]
+    # Split output and errors into lines, dropping empty ones
+    if 'output' in fields:
+        response['output'] = [line for line in output.split('\n') if line.strip()]
+    if 'errors' in fields:
+        response['errors'] = [line for line in error.split('\n') if line.strip()]
     
-    # Create status message
-    status = "✅ SUCCESS" if result.success else "❌ FAILED"
+    response.update({
+        'exit_code': result.exit_code,
+        'execution_time': result.execution_time,
+        'language': language,
+    })
     
     # Build formatted output for display
-    formatted_output = f"""=== JUDGE0 EXECUTION RESULT: {status} ===
+    if 'formatted_output' in fields:
+        status = "✅ SUCCESS" if result.success else "❌ FAILED"
+        title = 'JUDGE0' if compiler == 'Judge0 API' else compiler.upper()
+        formatted_output = f"""=== {title} EXECUTION RESULT: {status} ===
 Language: {language.upper()}
 Exit Code: {result.exit_code}
 Execution Time: {result.execution_time:.2f}s
 
 📄 PROGRAM OUTPUT:
 {'─' * 50}
-{result.output if result.output else '(no output)'}
+{output if output else '(no output)'}
 {'─' * 50}
 
-{f'❌ ERRORS:' if error_lines else ''}
-{result.error if result.error else ''}
+{f'❌ ERRORS:' if error.strip() else ''}
+{error}
 
-🏛️ Powered by Judge0 API
+🏛️ Powered by {compiler}
 ═══════════════════════════════════════════════════"""
+        response['formatted_output'] = formatted_output.strip()
     
-    return {
-        'success': result.success,
-        'output': output_lines,
-        'errors': error_lines,
-        'exit_code': result.exit_code,
-        'execution_time': result.execution_time,
-        'language': language,
-        'formatted_output': formatted_output.strip(),
-        'compiler': 'Judge0 API',
-        'platform_compatible': True
-    }
+    response.update({
+        'compiler': compiler,
+        'platform_compatible': True,
+        'truncated': bool(output_omitted or error_omitted),
+    })
+    if response['truncated']:
+        response['omitted_chars'] = {'output': output_omitted, 'errors': error_omitted}
+    
+    # Structured syntax diagnostics from local checks
+    if result.diagnostics:
+        response['diagnostics'] = [diagnostic._asdict() for diagnostic in result.diagnostics]
+    
+    return response
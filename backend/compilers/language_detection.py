@@ -0,0 +1,317 @@
+"""
+Language Detection Module
+This module guesses the programming language of submitted source code and
+normalizes language aliases to the names used by the Judge0 compilers.
+
+Detection tokenizes the source once with a single precompiled pattern
+(identifiers and qualified names such as `std::cout` or `fmt.Println`,
+string literals, comments, preprocessor lines and a few operators), counts
+the tokens, and scores every language in Judge0Compiler.language_map from a
+weight table looked up once per distinct token.
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+
+from .metrics import DETECTION_DURATION
+
+# Requests without a language are rejected below this confidence (0 disables)
+DEFAULT_MIN_CONFIDENCE = float(os.environ.get('DETECTION_MIN_CONFIDENCE', 0.2))
+
+# Languages the detector can answer (canonical Judge0Compiler names)
+LANGUAGES = ('python', 'javascript', 'cpp', 'c', 'java', 'csharp', 'go', 'rust', 'php', 'ruby')
+
+# Repeats of one token stop adding to the score after this many occurrences,
+# so a long file full of one weak signal (like `;` line endings) can't drown
+# out a few strong ones
+TOKEN_CAP = 5
+
+# Only tokens up to this long (identifiers, keywords, short literals) are
+# memoized; longer string literals and comments are user text that would
+# otherwise pin arbitrary amounts of memory in the cache
+CACHED_TOKEN_LENGTH = 64
+
+# Score at which a winner with no close runner-up gets full confidence
+CONFIDENT_SCORE = 8.0
+
+TOKEN_PATTERN = re.compile(r'''
+      [A-Za-z_]\w*(?:(?:\.|::)[A-Za-z_]\w*)*!?     # identifiers, qualified names, rust macros
+    | "(?:[^"\\\n]|\\.)*"                          # string literals
+    | '(?:[^'\\\n]|\\.)*'
+    | //[^\n]*                                      # line comments
+    | \#[^\n]*                                      # preprocessor lines, attributes, # comments
+    | <\?php | <[\w./+]+> | [$@]\w+                 # php tag, header names, sigils
+    | \|\w+(?:,\s*\w+)*\|                           # ruby block parameters
+    | :: | := | => | -> | === | !== | &mut\b | &self\b
+    | [;:](?=[ \t]*\r?$)                            # line-ending ; and :
+''', re.MULTILINE | re.VERBOSE)
+
+# Weights of exact tokens, of the first segment of qualified names
+# (`fmt` in `fmt.Println`) and of their last segment (`unwrap` in `x.unwrap`)
+C_FAMILY = ('c', 'cpp', 'java', 'csharp', 'javascript', 'php', 'rust')
+TOKEN_WEIGHTS = {
+    # python
+    'def': {'python': 2, 'ruby': 2},
+    'elif': {'python': 6},
+    'except': {'python': 5},
+    'self': {'python': 2, 'ruby': 1, 'rust': 1},
+    'None': {'python': 3},
+    'True': {'python': 2},
+    'False': {'python': 2},
+    'pass': {'python': 3},
+    'lambda': {'python': 2},
+    'print': {'python': 4, 'ruby': 1, 'php': 1},
+    'input': {'python': 3},
+    'range': {'python': 2, 'go': 1},
+    'len': {'python': 2, 'go': 1},
+    'import': {'python': 2, 'java': 1, 'go': 1, 'javascript': 1},
+    'from': {'python': 1, 'javascript': 1},
+    '__name__': {'python': 6},
+    '__init__': {'python': 6},
+    ':': {'python': 2},
+    # javascript
+    'console.log': {'javascript': 7},
+    'console': {'javascript': 5},
+    'function': {'javascript': 4, 'php': 2},
+    'const': {'javascript': 2, 'cpp': 1, 'rust': 1},
+    'let': {'javascript': 2, 'rust': 1},
+    'var': {'javascript': 2, 'csharp': 1, 'go': 1},
+    'require': {'javascript': 3, 'ruby': 1},
+    'module.exports': {'javascript': 6},
+    'document': {'javascript': 4},
+    'window': {'javascript': 4},
+    'undefined': {'javascript': 4},
+    'process': {'javascript': 2},
+    '===': {'javascript': 3, 'php': 1},
+    '!==': {'javascript': 3, 'php': 1},
+    '=>': {'javascript': 2, 'php': 1, 'rust': 1, 'csharp': 1},
+    # cpp
+    'std': {'cpp': 6, 'rust': 1},
+    'cout': {'cpp': 6},
+    'cin': {'cpp': 6},
+    'endl': {'cpp': 6},
+    'template': {'cpp': 5},
+    'nullptr': {'cpp': 5},
+    'vector': {'cpp': 4},
+    'namespace': {'cpp': 2, 'csharp': 3, 'php': 1},
+    'using': {'cpp': 2, 'csharp': 2},
+    'auto': {'cpp': 2, 'c': 1},
+    # c
+    'printf': {'c': 3, 'cpp': 1, 'php': 1},
+    'scanf': {'c': 4, 'cpp': 1},
+    'malloc': {'c': 3, 'cpp': 1},
+    'sizeof': {'c': 3, 'cpp': 1},
+    'NULL': {'c': 3, 'cpp': 1},
+    'struct': {'c': 2, 'cpp': 1, 'rust': 1, 'go': 1},
+    'char': {'c': 2, 'cpp': 1, 'java': 1, 'csharp': 1},
+    'unsigned': {'c': 2, 'cpp': 1},
+    'int': {'c': 1, 'cpp': 1, 'java': 1, 'csharp': 1},
+    'void': {'c': 1, 'cpp': 1, 'java': 1, 'csharp': 1},
+    # java
+    'System.out.println': {'java': 8},
+    'System': {'java': 4, 'csharp': 2},
+    'java': {'java': 7},
+    'String': {'java': 3, 'rust': 1},
+    'Scanner': {'java': 6},
+    'ArrayList': {'java': 5},
+    'HashMap': {'java': 4, 'rust': 1},
+    'public': {'java': 2, 'csharp': 2, 'php': 1, 'cpp': 1},
+    'static': {'java': 1, 'csharp': 1, 'c': 1, 'cpp': 1, 'php': 1},
+    'extends': {'java': 3, 'php': 2},
+    'implements': {'java': 3, 'php': 1},
+    'throws': {'java': 5},
+    'boolean': {'java': 4},
+    '@Override': {'java': 5},
+    # csharp
+    'Console.WriteLine': {'csharp': 8},
+    'Console': {'csharp': 6},
+    'Main': {'csharp': 4},
+    'string': {'csharp': 2, 'cpp': 1},
+    'foreach': {'csharp': 3, 'php': 3},
+    'readonly': {'csharp': 3},
+    # go
+    'fmt': {'go': 8},
+    '"fmt"': {'go': 6},
+    'package': {'go': 3, 'java': 2},
+    'func': {'go': 6},
+    ':=': {'go': 5},
+    'nil': {'go': 3, 'ruby': 3},
+    'chan': {'go': 5},
+    'defer': {'go': 5},
+    'make': {'go': 2},
+    'err': {'go': 2},
+    # rust
+    'println!': {'rust': 7},
+    'print!': {'rust': 7},
+    'vec!': {'rust': 7},
+    'format!': {'rust': 7},
+    'panic!': {'rust': 7},
+    'eprintln!': {'rust': 7},
+    'fn': {'rust': 6},
+    'mut': {'rust': 5},
+    '&mut': {'rust': 5},
+    '&self': {'rust': 5},
+    'impl': {'rust': 5},
+    'pub': {'rust': 3},
+    'Vec': {'rust': 4},
+    'usize': {'rust': 4},
+    'i32': {'rust': 4},
+    'u32': {'rust': 4},
+    'i64': {'rust': 4},
+    'f64': {'rust': 3},
+    'Some': {'rust': 3},
+    'unwrap': {'rust': 4},
+    'match': {'rust': 3},
+    'crate': {'rust': 4},
+    'use': {'rust': 2, 'php': 1},
+    # php
+    '<?php': {'php': 10},
+    '$this': {'php': 6},
+    'echo': {'php': 5},
+    'isset': {'php': 5},
+    'array': {'php': 2},
+    '->': {'php': 1, 'cpp': 1, 'c': 1, 'rust': 1},
+    # ruby
+    'puts': {'ruby': 6},
+    'end': {'ruby': 3},
+    'elsif': {'ruby': 6},
+    'unless': {'ruby': 5},
+    'do': {'ruby': 2},
+    'each': {'ruby': 2},
+    'attr_accessor': {'ruby': 6},
+    'require_relative': {'ruby': 6},
+    'initialize': {'ruby': 5},
+    # line endings and comments
+    ';': dict.fromkeys(C_FAMILY, 1),
+    '//': dict.fromkeys(C_FAMILY + ('go',), 1),
+    '#': {'python': 1, 'ruby': 1},
+}
+
+# Standard headers that only C++ has
+CPP_HEADERS = {
+    'iostream', 'vector', 'string', 'map', 'set', 'algorithm', 'bits/stdc++.h', 'cstdio',
+    'cstring', 'cmath', 'cstdlib', 'queue', 'stack', 'deque', 'unordered_map', 'unordered_set',
+    'sstream', 'iomanip', 'utility', 'climits', 'numeric', 'memory', 'fstream',
+}
+INCLUDE_PATTERN = re.compile(r'#\s*include\s*[<"]([^>"]+)[>"]')
+SHEBANGS = {'python': 'python', 'node': 'javascript', 'ruby': 'ruby', 'php': 'php'}
+
+
+def _token_weights(token: str) -> Tuple[Tuple[str, float], ...]:
+    """Resolve a distinct token to its (language, weight) pairs"""
+    if len(token) <= CACHED_TOKEN_LENGTH:
+        return _cached_token_weights(token)
+    return _classify_token(token)
+
+
+def _classify_token(token: str) -> Tuple[Tuple[str, float], ...]:
+    weights = TOKEN_WEIGHTS.get(token)
+    if weights is None:
+        first = token[0]
+        if first == '#':
+            weights = _directive_weights(token)
+        elif first == '"' or first == "'":
+            weights = {'ruby': 4} if '#{' in token else None
+        elif first == '$':
+            weights = {'php': 3}
+        elif first == '@':
+            weights = {'ruby': 2, 'python': 1, 'java': 1}
+        elif first == '|':
+            weights = {'ruby': 4}
+        elif first == '/':
+            weights = TOKEN_WEIGHTS['//']
+        elif first == '<':
+            weights = {'cpp': 3} if token[1:-1] in CPP_HEADERS else None
+        else:
+            # Qualified names score by their first and last segments
+            segments = re.split(r'\.|::', token)
+            if len(segments) > 1:
+                merged = {}
+                for segment in (segments[0], segments[-1]):
+                    for language, weight in TOKEN_WEIGHTS.get(segment, {}).items():
+                        merged[language] = merged.get(language, 0) + weight
+                weights = merged
+    return tuple(weights.items()) if weights else ()
+
+
+_cached_token_weights = lru_cache(maxsize=8192)(_classify_token)
+
+
+def _directive_weights(token: str) -> dict:
+    """Weights of a line starting with '#': includes, directives, attributes, comments"""
+    include = INCLUDE_PATTERN.match(token)
+    if include:
+        header = include.group(1)
+        if header in CPP_HEADERS:
+            return {'cpp': 7}
+        if header.endswith('.h'):
+            return {'c': 5, 'cpp': 2}
+        return {'c': 2, 'cpp': 2}
+    if re.match(r'#\s*(?:define|ifn?def|endif|pragma|undef)\b', token):
+        return {'c': 2, 'cpp': 2}
+    if token.startswith('#['):
+        return {'rust': 5}
+    if token.startswith('#!'):
+        for interpreter, language in SHEBANGS.items():
+            if interpreter in token:
+                return {language: 8}
+        return {}
+    return TOKEN_WEIGHTS['#']
+
+
+class Detection(NamedTuple):
+    """Detected language with a 0-1 confidence and the per-language scores"""
+    language: str
+    confidence: float
+    scores: Dict[str, float]
+
+
+def detect(code: str) -> Detection:
+    """
+    Detect the language of `code` with a confidence score
+
+    Confidence combines how far the winner is ahead of the runner-up with
+    how much evidence it has; code with no recognizable tokens scores 0.
+    """
+    start = time.perf_counter()
+    detection = _detect(code)
+    DETECTION_DURATION.observe(time.perf_counter() - start, detection.language)
+    return detection
+
+
+def _detect(code: str) -> Detection:
+    counts = Counter(TOKEN_PATTERN.findall(code))
+
+    scores = dict.fromkeys(LANGUAGES, 0.0)
+    for token, count in counts.items():
+        weights = _token_weights(token)
+        if weights:
+            capped = count if count < TOKEN_CAP else TOKEN_CAP
+            for language, weight in weights:
+                scores[language] += weight * capped
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    best, runner_up = scores[ranked[0]], scores[ranked[1]]
+    if best <= 0:
+        return Detection('python', 0.0, scores)
+
+    margin = (best - runner_up) / best
+    evidence = min(1.0, best / CONFIDENT_SCORE)
+    return Detection(ranked[0], round(margin * evidence, 3), scores)
+
+
+def detect_language(code):
+    """Detect programming language based on code content"""
+    return detect(code).language
+
+def normalize_language(language):
+    """Map language aliases onto the names used by Judge0Compiler"""
+    if language in ['js', 'javascript']:
+        return 'javascript'
+    elif language in ['cpp', 'c++']:
+        return 'cpp'
+    return language
@@ -0,0 +1,713 @@
+"""
+Local Sandboxed Code Compiler Module
+This module compiles and runs code in subprocesses on the host, using the
+toolchains installed there, as a drop-in alternative to the Judge0 API for
+on-prem nodes. Each run is confined with resource limits (CPU time, address
+space, file size, process count), killed at a wall-clock deadline, and has
+its stdout/stderr capture bounded.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from .artifact_cache import DEFAULT_ENABLED as DEFAULT_ARTIFACT_CACHE, ArtifactCache, make_key
+from .base_compiler import BaseCompiler, CompilerResult, StatusCallback
+from .diagnostics import Diagnostic, check_python, parse_diagnostics, redact_included
+from .warm_pool import WarmPool, DEFAULT_POOL_SIZE
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_MEMORY_LIMIT_MB = int(os.environ.get('LOCAL_MEMORY_LIMIT_MB', 128))
+DEFAULT_MAX_OUTPUT = int(os.environ.get('LOCAL_MAX_OUTPUT_BYTES', 1024 * 1024))
+DEFAULT_MAX_PROCESSES = int(os.environ.get('LOCAL_MAX_PROCESSES', 64))
+DEFAULT_COMPILE_TIMEOUT = int(os.environ.get('LOCAL_COMPILE_TIMEOUT', 30))
+DEFAULT_COMPILE_MEMORY_LIMIT_MB = int(os.environ.get('LOCAL_COMPILE_MEMORY_LIMIT_MB', 1024))
+DEFAULT_WORK_DIR = os.environ.get('LOCAL_WORK_DIR') or None
+DEFAULT_MAX_PARALLEL = int(os.environ.get('LOCAL_MAX_PARALLEL', os.cpu_count() or 1))
+# Writable cgroup (v2, or the v1 pids hierarchy) under which every run gets its
+# own child with pids.max; without one the process cap falls back to RLIMIT_NPROC
+DEFAULT_CGROUP_DIR = os.environ.get('LOCAL_CGROUP_DIR') or None
+
+# Largest file a compile step may write (the binary)
+COMPILE_FILE_SIZE = 256 * 1024 * 1024
+
+# Seconds a count of the server uid's tasks is reused for RLIMIT_NPROC headroom
+UID_TASKS_TTL = 1.0
+
+# Build caches shared across runs so toolchains don't rebuild their standard libraries
+GO_BUILD_CACHE = os.environ.get('LOCAL_GO_CACHE') or os.path.join(tempfile.gettempdir(), 'sefa-gocache')
+
+# Toolchain manager settings passed through to child processes (HOME is replaced per run)
+PASSTHROUGH_ENV = ('RUSTUP_HOME', 'CARGO_HOME', 'RUSTUP_TOOLCHAIN', 'GOROOT')
+
+# Toolchains by language: source file name, syntax-only check command,
+# optional compile command (and the command reporting the compiler
+# version, part of the compiled-artifact cache key) and run command.
+# `limit_address_space` is off for runtimes that reserve large virtual memory up front.
+TOOLCHAINS = {
+    'python': {
+        'source': 'main.py',
+        'executables': ['python3', 'python'],
+        'check': ['{exe}', '-I', '-m', 'py_compile', 'main.py'],
+        'run': ['{exe}', '-I', 'main.py'],
+        'limit_address_space': True,
+    },
+    'javascript': {
+        'source': 'main.js',
+        'executables': ['node', 'nodejs'],
+        'check': ['{exe}', '--check', 'main.js'],
+        'run': ['{exe}', '--max-old-space-size={memory_mb}', 'main.js'],
+        'limit_address_space': False,
+    },
+    'c': {
+        'source': 'main.c',
+        'executables': ['gcc', 'cc', 'clang'],
+        'check': ['{exe}', '-fsyntax-only', 'main.c'],
+        'compile': ['{exe}', '-O2', '-o', 'main', 'main.c', '-lm'],
+        'version': ['{exe}', '--version'],
+        'run': ['./main'],
+        'limit_address_space': True,
+    },
+    'cpp': {
+        'source': 'main.cpp',
+        'executables': ['g++', 'clang++'],
+        'check': ['{exe}', '-fsyntax-only', '-std=c++17', 'main.cpp'],
+        'compile': ['{exe}', '-O2', '-std=c++17', '-o', 'main', 'main.cpp'],
+        'version': ['{exe}', '--version'],
+        'run': ['./main'],
+        'limit_address_space': True,
+    },
+    'go': {
+        'source': 'main.go',
+        'executables': ['go'],
+        'check': ['{exe}', 'vet', 'main.go'],
+        'compile': ['{exe}', 'build', '-o', 'main', 'main.go'],
+        'version': ['{exe}', 'version'],
+        'run': ['./main'],
+        'limit_address_space': False,
+    },
+    'rust': {
+        'source': 'main.rs',
+        'executables': ['rustc'],
+        'check': ['{exe}', '--emit=metadata', '-o', 'main.rmeta', 'main.rs'],
+        'compile': ['{exe}', '-O', '-o', 'main', 'main.rs'],
+        'version': ['{exe}', '--version'],
+        'run': ['./main'],
+        'limit_address_space': True,
+    },
+}
+
+# Language aliases accepted by compile_and_run
+ALIASES = {'js': 'javascript', 'c++': 'cpp'}
+
+
+class LocalCompiler(BaseCompiler):
+    """
+    A class to compile and run code in local subprocesses
+    Uses whatever toolchains are installed on the host
+    """
+
+    name = 'local'
+    display_name = 'Local Sandbox'
+
+    def __init__(self, memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                 max_output: int = DEFAULT_MAX_OUTPUT,
+                 max_processes: int = DEFAULT_MAX_PROCESSES,
+                 compile_timeout: int = DEFAULT_COMPILE_TIMEOUT,
+                 compile_memory_limit_mb: int = DEFAULT_COMPILE_MEMORY_LIMIT_MB,
+                 work_dir: Optional[str] = DEFAULT_WORK_DIR,
+                 warm_pool_size: int = DEFAULT_POOL_SIZE,
+                 max_parallel: int = DEFAULT_MAX_PARALLEL,
+                 artifact_cache: bool = DEFAULT_ARTIFACT_CACHE,
+                 cgroup_dir: Optional[str] = DEFAULT_CGROUP_DIR):
+        """
+        Initialize the local compiler and discover installed toolchains
+
+        Args:
+            memory_limit_mb: Address space limit for each run
+            max_output: Maximum bytes captured from stdout and from stderr
+            max_processes: Process count limit for each run
+            compile_timeout: Wall-clock limit for the compile step in seconds
+            compile_memory_limit_mb: Address space limit for compile steps and syntax checks
+            work_dir: Parent directory for per-run scratch directories
+            warm_pool_size: Warm interpreter workers kept per language (0 disables)
+            max_parallel: Programs compile_and_run_many runs at once
+            artifact_cache: Reuse the binaries of identical earlier compiles
+            cgroup_dir: Cgroup to create per-run pids.max children under (see `_limits`)
+        """
+        self.memory_limit_mb = memory_limit_mb
+        self.max_output = max_output
+        self.max_processes = max_processes
+        self.compile_timeout = compile_timeout
+        self.compile_memory_limit_mb = compile_memory_limit_mb
+        self.work_dir = work_dir
+        self.max_parallel = max(1, max_parallel)
+
+        # Per-run cgroups enforce max_processes for one run alone; RLIMIT_NPROC
+        # counts every task of the server's uid and doesn't bind root at all
+        self.cgroup_dir = cgroup_dir
+        if cgroup_dir and not os.access(os.path.join(cgroup_dir, 'cgroup.procs'), os.W_OK):
+            logger.warning(f"⚠️ {cgroup_dir} is not a writable cgroup; capping processes with RLIMIT_NPROC")
+            self.cgroup_dir = None
+        if not self.cgroup_dir and os.getuid() == 0:
+            logger.warning("⚠️ Running as root: RLIMIT_NPROC does not apply, set LOCAL_CGROUP_DIR to cap processes")
+        self._uid_tasks_cache = (0.0, 0)
+
+        # Resolve each language's toolchain once
+        self.toolchains = {}
+        for language, toolchain in TOOLCHAINS.items():
+            executable = self._find_executable(toolchain['executables'])
+            if executable:
+                self.toolchains[language] = dict(toolchain, exe=executable)
+
+        # Compiled binaries shared by runs of the same source, keyed with the compiler version
+        self.artifact_cache = None
+        self._compiler_versions = {}
+        if artifact_cache:
+            try:
+                self.artifact_cache = ArtifactCache()
+            except OSError as e:
+                logger.warning(f"⚠️ Compiled-artifact cache disabled: {e}")
+
+        # Pre-started interpreters for python/node runs
+        self.warm_pool = None
+        if warm_pool_size > 0 and resource is not None:
+            self.warm_pool = WarmPool(self, size=warm_pool_size)
+
+        logger.info(f"🖥️ Local compiler initialized - toolchains: {', '.join(self.toolchains) or 'none'}")
+
+    @staticmethod
+    def _find_executable(candidates: list) -> Optional[str]:
+        for candidate in candidates:
+            path = shutil.which(candidate)
+            if path:
+                return path
+        if 'python3' in candidates:
+            return sys.executable
+        return None
+
+    def _normalize(self, language: str) -> str:
+        language = language.lower().strip()
+        return ALIASES.get(language, language)
+
+    def get_supported_languages(self) -> list:
+        """Get list of languages with a toolchain on this host"""
+        languages = list(self.toolchains)
+        languages += [alias for alias, target in ALIASES.items() if target in self.toolchains]
+        return languages
+
+    def is_available(self) -> bool:
+        """Check if any local toolchain is installed"""
+        return bool(self.toolchains) and resource is not None
+
+    @staticmethod
+    def _environment(run_dir: str) -> dict:
+        """Minimal environment for child processes, rooted in the run directory"""
+        env = {
+            'PATH': os.environ.get('PATH', '/usr/bin:/bin'),
+            'HOME': run_dir,
+            'TMPDIR': run_dir,
+            'LANG': 'C.UTF-8',
+            'GOCACHE': GO_BUILD_CACHE,
+            'GOPATH': os.path.join(run_dir, '.gopath'),
+        }
+        for key in PASSTHROUGH_ENV:
+            if os.environ.get(key):
+                env[key] = os.environ[key]
+        # rustup finds its toolchains under the real home directory by default
+        default_rustup = os.path.expanduser('~/.rustup')
+        if 'RUSTUP_HOME' not in env and os.path.isdir(default_rustup):
+            env['RUSTUP_HOME'] = default_rustup
+        return env
+
+    def _limits(self, cpu_seconds: int, address_space: Optional[int], file_size: int,
+                processes: Optional[int], cpu_hard: Optional[int] = None, cgroup: Optional[str] = None):
+        """
+        Build a preexec_fn applying resource limits in the child process
+
+        `processes` caps the processes and threads a run may have. In a
+        `cgroup` from `_create_cgroup` the child joins it and pids.max holds
+        the run alone to the cap. Otherwise RLIMIT_NPROC is used, which
+        counts every task of the real uid (the server's own threads, other
+        workers, concurrent runs), so it is raised by the tasks the uid has
+        now: the run may add about `processes` while that count holds, and
+        concurrent runs share the slack. It never applies to root.
+        """
+        nproc = processes + self._uid_tasks() if processes and cgroup is None else None
+        cgroup_procs = os.path.join(cgroup, 'cgroup.procs') if cgroup is not None else None
+
+        def apply():
+            if cgroup_procs is not None:
+                fd = os.open(cgroup_procs, os.O_WRONLY)
+                try:
+                    os.write(fd, str(os.getpid()).encode())
+                finally:
+                    os.close(fd)
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_hard or cpu_seconds + 1))
+            resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+            resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+            if address_space:
+                resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
+            if nproc:
+                resource.setrlimit(resource.RLIMIT_NPROC, (nproc, nproc))
+        return apply
+
+    def _toolchain_limits(self, toolchain: dict, file_size: int, cgroup: Optional[str] = None):
+        """`_limits` for a compile step or syntax check of `toolchain` (they see untrusted code too)"""
+        address_space = (self.compile_memory_limit_mb * 1024 * 1024
+                         if toolchain['limit_address_space'] else None)
+        return self._limits(self.compile_timeout, address_space, file_size, self.max_processes,
+                            cgroup=cgroup)
+
+    def _uid_tasks(self) -> int:
+        """Processes and threads of the server's real uid, as RLIMIT_NPROC counts them (cached briefly)"""
+        checked_at, count = self._uid_tasks_cache
+        if time.monotonic() - checked_at < UID_TASKS_TTL:
+            return count
+        uid, count = str(os.getuid()), 0
+        try:
+            entries = os.listdir('/proc')
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/status') as handle:
+                    fields = dict(line.split(':', 1) for line in handle if line.startswith(('Uid:', 'Threads:')))
+                if fields['Uid'].split()[0] == uid:
+                    count += int(fields['Threads'])
+            except (OSError, KeyError, ValueError, IndexError):
+                continue
+        count = count or threading.active_count()
+        self._uid_tasks_cache = (time.monotonic(), count)
+        return count
+
+    def _create_cgroup(self) -> Optional[str]:
+        """A new cgroup holding one run to max_processes tasks, or None to fall back to RLIMIT_NPROC"""
+        if not self.cgroup_dir or not self.max_processes:
+            return None
+        path = os.path.join(self.cgroup_dir, f'sefa-{uuid.uuid4().hex[:16]}')
+        try:
+            os.mkdir(path)
+            with open(os.path.join(path, 'pids.max'), 'w') as handle:
+                handle.write(str(self.max_processes))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not create run cgroup {path}: {e}")
+            self.remove_cgroup(path)
+            return None
+        return path
+
+    @staticmethod
+    def remove_cgroup(path: Optional[str]):
+        """Kill whatever a run left in its cgroup (e.g. daemonized children) and remove it"""
+        if path is None:
+            return
+        for _ in range(50):
+            try:
+                os.rmdir(path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                pass
+            try:
+                with open(os.path.join(path, 'cgroup.procs')) as handle:
+                    pids = [int(pid) for pid in handle.read().split()]
+            except (OSError, ValueError):
+                pids = []
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            time.sleep(0.01)
+        logger.warning(f"⚠️ Could not remove run cgroup {path}")
+
+    def _read_capped(self, path: str) -> str:
+        with open(path, 'rb') as handle:
+            data = handle.read(self.max_output + 1)
+        text = data[:self.max_output].decode('utf-8', errors='replace')
+        if len(data) > self.max_output:
+            text += "\n... [output truncated]"
+        return text
+
+    def _run_process(self, command: list, cwd: str, stdin_data: str, wall_timeout: float,
+                     preexec_fn, env: dict, label: str) -> tuple:
+        """
+        Run `command` with bounded output capture and a wall-clock kill
+
+        Returns:
+            (returncode, stdout, stderr, timed_out)
+        """
+        stdout_path = os.path.join(cwd, f'.{label}.stdout')
+        stderr_path = os.path.join(cwd, f'.{label}.stderr')
+        with open(stdout_path, 'wb') as stdout_file, open(stderr_path, 'wb') as stderr_file:
+            process = subprocess.Popen(
+                command, cwd=cwd, env=env,
+                stdin=subprocess.PIPE, stdout=stdout_file, stderr=stderr_file,
+                preexec_fn=preexec_fn, start_new_session=True
+            )
+            timed_out = False
+            try:
+                process.communicate(stdin_data.encode('utf-8'), timeout=wall_timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                # Kill the whole process group so forked children die too
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                process.wait()
+        return process.returncode, self._read_capped(stdout_path), self._read_capped(stderr_path), timed_out
+
+    @staticmethod
+    def _notify(on_status: Optional[StatusCallback], event: str, **data):
+        if on_status is None:
+            return
+        try:
+            on_status(event, data)
+        except Exception as e:
+            logger.warning(f"⚠️ Status callback failed for {event}: {e}")
+
+    def compile_and_run(self, code: str, language: str = 'python', timeout: int = 30,
+                        use_cache: bool = True,
+                        on_status: Optional[StatusCallback] = None,
+                        stdin: str = '') -> CompilerResult:
+        """
+        Compile and execute code in a local sandboxed subprocess
+
+        Args:
+            code: Source code to execute
+            language: Programming language ('python', 'javascript', 'cpp', etc.)
+            timeout: Execution timeout in seconds
+            use_cache: Reuse the binary of an identical earlier compile (runs themselves are not cached)
+            on_status: Called with (event, data) on every status transition
+            stdin: Input fed to the program
+
+        Returns:
+            CompilerResult with execution details
+        """
+        start_time = time.time()
+        language = self._normalize(language)
+
+        toolchain = self.toolchains.get(language)
+        if not toolchain or resource is None:
+            supported = ', '.join(self.get_supported_languages())
+            return CompilerResult(
+                False, "",
+                f"Unsupported language: {language}. Supported: {supported}",
+                1, 0.0
+            )
+
+        cpu_limit = max(1, min(int(timeout), 15))
+
+        # Interpreted languages run in a pre-started worker when one is pooled
+        if self.warm_pool is not None and 'compile' not in toolchain:
+            self._notify(on_status, 'processing', status='Running')
+            run_started = time.perf_counter()
+            try:
+                outcome = self.warm_pool.run(language, code, stdin, max(float(timeout), 1.0), cpu_limit)
+            except OSError as e:
+                logger.warning(f"⚠️ Warm {language} worker failed, running cold: {e}")
+                outcome = None
+            if outcome is not None:
+                return self._build_run_result(outcome, timeout, cpu_limit, start_time, on_status,
+                                              time.perf_counter() - run_started)
+
+        try:
+            with tempfile.TemporaryDirectory(prefix='sefa-run-', dir=self.work_dir) as run_dir:
+                with open(os.path.join(run_dir, toolchain['source']), 'w', encoding='utf-8') as handle:
+                    handle.write(code)
+
+                env = self._environment(run_dir)
+                fmt = {'exe': toolchain['exe'], 'memory_mb': self.memory_limit_mb}
+
+                if 'compile' in toolchain:
+                    self._notify(on_status, 'processing', status='Compiling')
+                    returncode, compile_output, compiled = self._compile(
+                        language, toolchain, code, run_dir, env, fmt, use_cache
+                    )
+                    self._notify(on_status, 'compiled', compile_output=compile_output, compiled=compiled)
+                    if not compiled:
+                        self._notify(on_status, 'finished', status='Compilation Error')
+                        return CompilerResult(
+                            False, "", f"Compilation Error:\n{compile_output.strip()}",
+                            returncode if returncode else 1, time.time() - start_time,
+                            status='Compilation Error'
+                        )
+
+                self._notify(on_status, 'processing', status='Running')
+                command = [part.format(**fmt) for part in toolchain['run']]
+                address_space = self.memory_limit_mb * 1024 * 1024 if toolchain['limit_address_space'] else None
+                cgroup = self._create_cgroup()
+                run_started = time.perf_counter()
+                try:
+                    returncode, stdout, stderr, timed_out = self._run_process(
+                        command, run_dir, stdin, max(float(timeout), 1.0),
+                        self._limits(cpu_limit, address_space, self.max_output, self.max_processes,
+                                     cgroup=cgroup),
+                        env, 'run'
+                    )
+                finally:
+                    self.remove_cgroup(cgroup)
+        except OSError as e:
+            logger.error(f"❌ Local execution failed to start: {e}")
+            return CompilerResult(False, "", f"Execution error: {str(e)}", 1, time.time() - start_time)
+
+        return self._build_run_result((returncode, stdout, stderr, timed_out),
+                                      timeout, cpu_limit, start_time, on_status,
+                                      time.perf_counter() - run_started)
+
+    def _compile_step(self, toolchain: dict, run_dir: str, env: dict, fmt: dict) -> tuple:
+        """
+        Run the compile command in `run_dir`
+
+        Returns:
+            (returncode, compiler output, timed_out)
+        """
+        command = [part.format(**fmt) for part in toolchain['compile']]
+        cgroup = self._create_cgroup()
+        try:
+            returncode, _, compile_output, timed_out = self._run_process(
+                command, run_dir, "", self.compile_timeout,
+                self._toolchain_limits(toolchain, COMPILE_FILE_SIZE, cgroup),
+                env, 'compile'
+            )
+        finally:
+            self.remove_cgroup(cgroup)
+        if timed_out:
+            compile_output = f"Compilation timed out after {self.compile_timeout} seconds"
+        return returncode, compile_output, timed_out
+
+    def _compiler_version(self, language: str, toolchain: dict) -> str:
+        """First line of the compiler's version output (its path if that fails), looked up once"""
+        version = self._compiler_versions.get(language)
+        if version is None:
+            command = [part.format(exe=toolchain['exe']) for part in toolchain['version']]
+            try:
+                completed = subprocess.run(command, capture_output=True, text=True, timeout=10)
+                version = (completed.stdout or completed.stderr).strip().split('\n')[0]
+            except (OSError, subprocess.SubprocessError):
+                version = ''
+            version = self._compiler_versions[language] = f"{os.path.realpath(toolchain['exe'])} {version}"
+        return version
+
+    def _compile(self, language: str, toolchain: dict, code: str, run_dir: str, env: dict,
+                 fmt: dict, use_cache: bool) -> tuple:
+        """
+        Produce the binary for `code` in `run_dir`, from the artifact cache when possible
+
+        Concurrent misses on the same source wait on the cache's compile lock
+        and then copy the binary the first of them built, so a batch of test
+        cases for one submission compiles once. Timed-out compiles are not
+        cached. A copy keeps the cached binary safe from the program itself.
+
+        Returns:
+            (returncode, compiler output, compiled)
+        """
+        cache = self.artifact_cache if use_cache else None
+        if cache is None:
+            returncode, compile_output, timed_out = self._compile_step(toolchain, run_dir, env, fmt)
+            return returncode, compile_output, returncode == 0 and not timed_out
+
+        flags = [part.format(**fmt) for part in toolchain['compile']]
+        key = make_key(language, code, self._compiler_version(language, toolchain), flags)
+        binary = os.path.join(run_dir, 'main')
+
+        artifact = cache.get(key, binary)
+        if artifact is None:
+            with cache.lock(key):
+                artifact = cache.get(key, binary)
+                if artifact is None:
+                    returncode, compile_output, timed_out = self._compile_step(toolchain, run_dir, env, fmt)
+                    compiled = returncode == 0 and not timed_out
+                    if not timed_out:
+                        cache.put(key, returncode, compile_output, binary if compiled else None)
+                    return returncode, compile_output, compiled
+        return artifact.returncode, artifact.output, artifact.path is not None
+
+    def compile_and_run_many(self, submissions: List[dict], timeout: int = 30,
+                             use_cache: bool = True) -> List[CompilerResult]:
+        """Compile and execute several programs, up to `max_parallel` at a time, in input order"""
+        if self.max_parallel == 1 or len(submissions) <= 1:
+            return super().compile_and_run_many(submissions, timeout, use_cache)
+
+        def run(item: dict) -> CompilerResult:
+            return self.compile_and_run(
+                item.get('code', ''), str(item.get('language') or 'python'),
+                item.get('timeout', timeout), use_cache=use_cache, stdin=item.get('stdin') or ''
+            )
+
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(submissions)),
+                                thread_name_prefix='local-run') as executor:
+            return list(executor.map(run, submissions))
+
+    def _build_run_result(self, outcome: tuple, timeout: int, cpu_limit: int, start_time: float,
+                          on_status: Optional[StatusCallback], run_time: Optional[float] = None) -> CompilerResult:
+        """
+        Map a finished run's (returncode, stdout, stderr, timed_out) to a CompilerResult
+
+        `run_time` is the wall time of the run step alone (without compiling).
+        """
+        returncode, stdout, stderr, timed_out = outcome
+        execution_time = time.time() - start_time
+
+        # Build error message
+        error_parts = []
+        if stderr.strip():
+            error_parts.append(f"Runtime Error:\n{stderr.strip()}")
+        if timed_out:
+            status = 'Time Limit Exceeded'
+            exit_code = 124
+            error_parts.append(f"Time Limit Exceeded: killed after {timeout} seconds")
+        elif returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            status = 'Time Limit Exceeded'
+            exit_code = 128 - returncode
+            error_parts.append(f"Time Limit Exceeded: CPU limit of {cpu_limit} seconds reached")
+        elif returncode == -signal.SIGXFSZ:
+            status = 'Output Limit Exceeded'
+            exit_code = 128 - returncode
+            error_parts.append(f"Output Limit Exceeded: more than {self.max_output} bytes written")
+        elif returncode < 0:
+            status = 'Runtime Error'
+            exit_code = 128 - returncode
+            error_parts.append(f"Runtime Error: killed by signal {signal.Signals(-returncode).name}")
+        else:
+            status = 'Accepted' if returncode == 0 else 'Runtime Error'
+            exit_code = returncode
+
+        success = status == 'Accepted'
+        self._notify(on_status, 'finished', status=status)
+
+        if success:
+            logger.info(f"🎉 Local execution successful - Output: {stdout[:50]}...")
+        else:
+            logger.warning(f"⚠️ Local execution failed - Status: {status}")
+
+        return CompilerResult(
+            success=success,
+            output=stdout,
+            error="\n\n".join(error_parts),
+            exit_code=exit_code,
+            execution_time=execution_time,
+            status=status,
+            run_time=run_time
+        )
+
+    def check_syntax(self, code: str, language: str = 'python', use_cache: bool = True,
+                     on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """
+        Check code syntax without running it
+
+        Python is compiled in-process; other languages use the toolchain's
+        syntax-only mode. Failures carry structured diagnostics.
+        """
+        logger.info(f"🔍 Checking {language} syntax locally...")
+        start_time = time.time()
+        language = self._normalize(language)
+
+        if language == 'python':
+            return self.check_python_syntax(code, on_status)
+
+        toolchain = self.toolchains.get(language)
+        if not toolchain or resource is None:
+            supported = ', '.join(self.get_supported_languages())
+            return CompilerResult(
+                False, "",
+                f"Unsupported language: {language}. Supported: {supported}",
+                1, 0.0
+            )
+
+        try:
+            with tempfile.TemporaryDirectory(prefix='sefa-check-', dir=self.work_dir) as run_dir:
+                with open(os.path.join(run_dir, toolchain['source']), 'w', encoding='utf-8') as handle:
+                    handle.write(code)
+                self._notify(on_status, 'processing', status='Checking syntax')
+                command = [part.format(exe=toolchain['exe'], memory_mb=self.memory_limit_mb)
+                           for part in toolchain['check']]
+                # A check writes nothing but diagnostics, so its files are capped like run output
+                cgroup = self._create_cgroup()
+                try:
+                    returncode, stdout, stderr, timed_out = self._run_process(
+                        command, run_dir, "", self.compile_timeout,
+                        self._toolchain_limits(toolchain, self.max_output, cgroup),
+                        self._environment(run_dir), 'check'
+                    )
+                finally:
+                    self.remove_cgroup(cgroup)
+        except OSError as e:
+            logger.error(f"❌ Local syntax check failed to start: {e}")
+            return CompilerResult(False, "", f"Execution error: {str(e)}", 1, time.time() - start_time)
+
+        if timed_out:
+            message = "Syntax check timed out"
+            diagnostics = [Diagnostic(1, 1, message)]
+        elif returncode == 0:
+            message, diagnostics = '', []
+        else:
+            message = redact_included(language, stderr.strip() or stdout.strip(), toolchain['source'])
+            diagnostics = parse_diagnostics(language, message)
+            if not diagnostics:
+                diagnostics = [Diagnostic(1, 1, message.splitlines()[0] if message else 'Syntax check failed')]
+        return self._syntax_result(diagnostics, message, returncode if returncode > 0 else 1,
+                                   start_time, on_status)
+
+    @classmethod
+    def check_python_syntax(cls, code: str, on_status: Optional[StatusCallback] = None) -> CompilerResult:
+        """Compile Python source in-process (needs no toolchain, so no LocalCompiler instance either)"""
+        start_time = time.time()
+        cls._notify(on_status, 'processing', status='Checking syntax')
+        diagnostics, message = check_python(code)
+        return cls._syntax_result(diagnostics, message, 1, start_time, on_status)
+
+    @classmethod
+    def _syntax_result(cls, diagnostics: list, message: str, exit_code: int, start_time: float,
+                       on_status: Optional[StatusCallback]) -> CompilerResult:
+        """Build the CompilerResult of a syntax check from its diagnostics"""
+        success = not any(diagnostic.severity == 'error' for diagnostic in diagnostics)
+        cls._notify(on_status, 'finished', status='Accepted' if success else 'Compilation Error')
+        if success:
+            return CompilerResult(True, "✅ Syntax is valid\n", "", 0, time.time() - start_time,
+                                  tuple(diagnostics))
+        return CompilerResult(
+            False, "", f"Compilation Error:\n{message}",
+            exit_code, time.time() - start_time, tuple(diagnostics)
+        )
+
+    def get_toolchains(self) -> dict:
+        """Get the executable used for each supported language"""
+        return {language: toolchain['exe'] for language, toolchain in self.toolchains.items()}
+
+    def get_artifact_cache_stats(self) -> dict:
+        """Get compiled-artifact cache statistics"""
+        if self.artifact_cache is None:
+            return {'enabled': False}
+        return self.artifact_cache.stats()
+
+    def get_warm_pool_stats(self) -> dict:
+        """Get warm interpreter pool statistics"""
+        if self.warm_pool is None:
+            return {'enabled': False}
+        return dict(self.warm_pool.stats(), enabled=True)
+
+    def close(self):
+        """Kill the idle warm pool workers (runs in progress finish normally)"""
+        if self.warm_pool is not None:
+            self.warm_pool.close()
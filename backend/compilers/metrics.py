@@ -0,0 +1,258 @@
+"""
+Prometheus-Style Metrics
+This module keeps the counters, gauges and histograms exported by
+/api/metrics in the Prometheus text format. Updates never take a lock:
+every thread writes to its own shard and a scrape sums the shards, so the
+metrics are cheap enough to leave on in production.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, from a cached answer to a long Judge0 run
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DETECTION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+POLL_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+# Bytes, from a status-only exchange to multi-megabyte program output
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Registry:
+    """Named metrics rendered together by `render`"""
+
+    def __init__(self):
+        self._metrics: Dict[str, '_Metric'] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: '_Metric'):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return ''.join(metric.render() for metric in metrics)
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    """
+    A labelled metric whose samples are sharded per thread
+
+    Each thread updates a dict only it writes to, so the hot path is a
+    thread-local lookup and a dict update. A scrape copies every shard
+    (atomic under the GIL) and folds the shards of finished threads into
+    one, so thread churn doesn't grow memory.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _merge(self, into: dict, shard: dict):
+        for key, value in shard.items():
+            into[key] = into.get(key, 0) + value
+
+    def _collect(self) -> dict:
+        """Sum of every shard, keyed by label values"""
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+            total = {}
+            self._merge(total, self._retired)
+            for _, shard in live:
+                self._merge(total, shard.copy())
+        return total
+
+    def _header(self) -> str:
+        return f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+
+    def render(self) -> str:
+        lines = [self._header()]
+        for key, value in sorted(self._collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}\n")
+        return ''.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. submissions in flight"""
+
+    kind = 'gauge'
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Registry = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels, registry)
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        # Per-bucket counts followed by the sum and the count
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 3)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def _merge(self, into: dict, shard: dict):
+        for key, counts in shard.items():
+            merged = into.get(key)
+            if merged is None:
+                into[key] = list(counts)
+            else:
+                for index, value in enumerate(counts):
+                    merged[index] += value
+
+    def render(self) -> str:
+        lines = [self._header()]
+        for key, counts in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}\n")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(counts[-2])}\n")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}\n")
+        return ''.join(lines)
+
+
+# API requests
+REQUESTS = Counter(
+    'edurun_requests_total', 'Execution API requests by route, language and outcome',
+    ('route', 'language', 'outcome')
+)
+REQUEST_DURATION = Histogram(
+    'edurun_request_duration_seconds', 'Execution API request latency by route, language and outcome',
+    ('route', 'language', 'outcome')
+)
+DETECTION_DURATION = Histogram(
+    'edurun_language_detection_seconds', 'Time spent detecting the language of submitted code',
+    ('language',), buckets=DETECTION_BUCKETS
+)
+
+# Judge0 upstream
+UPSTREAM_DURATION = Histogram(
+    'judge0_request_duration_seconds', 'Judge0 HTTP request latency by endpoint and operation',
+    ('endpoint', 'operation')
+)
+UPSTREAM_RESPONSES = Counter(
+    'judge0_responses_total', 'Judge0 HTTP responses by endpoint, operation and status (error = no response)',
+    ('endpoint', 'operation', 'status')
+)
+QUEUE_WAIT = Histogram(
+    'judge0_queue_wait_seconds', 'Time polled submissions spent In Queue or Processing',
+    ('language',)
+)
+POLLS = Histogram(
+    'judge0_polls_per_submission', 'Status polls needed per Judge0 submission or batch',
+    ('language',), buckets=POLL_BUCKETS
+)
+SUBMISSION_BYTES = Histogram(
+    'judge0_submission_bytes', 'Judge0 request (sent) and response (received) body bytes per submission',
+    ('direction',), buckets=BYTE_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    'judge0_in_flight_submissions', 'Submissions currently owned by each Judge0 endpoint',
+    ('endpoint',)
+)
+
+
+def upstream_operation(method: str, path: str) -> str:
+    """Name a Judge0 request for metric labels without embedding its token"""
+    path = path.split('?', 1)[0].rstrip('/')
+    if path == '/submissions':
+        return 'submit'
+    if path == '/submissions/batch':
+        return 'batch_submit' if method == 'POST' else 'batch_poll'
+    if path.startswith('/submissions/'):
+        return 'poll'
+    return path.lstrip('/') or 'root'
+
+
+def request_outcome(status_code: int, success: bool = True) -> str:
+    """Classify an API response: success, failure (the program failed), rejected, shed or error"""
+    if status_code in (429, 503):
+        return 'shed'
+    if status_code >= 500:
+        return 'error'
+    if status_code >= 400:
+        return 'rejected'
+    return 'success' if success else 'failure'
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format"""
+    return REGISTRY.render()
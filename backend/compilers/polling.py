@@ -0,0 +1,123 @@
+"""
+Adaptive Result Polling for Judge0
+This module decides when and how often to ask Judge0 for a submission's
+status: a short first delay tuned per language from observed completion
+times, jittered exponential backoff, and a deadline derived from the
+request's timeout instead of a fixed number of polls
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Iterator, Optional
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_INITIAL_DELAY = float(os.environ.get('JUDGE0_POLL_INITIAL_DELAY', 0.1))
+DEFAULT_MAX_INTERVAL = float(os.environ.get('JUDGE0_POLL_MAX_INTERVAL', 2.0))
+DEFAULT_QUEUE_GRACE = float(os.environ.get('JUDGE0_POLL_QUEUE_GRACE', 10.0))
+DEFAULT_SYNC_WAIT_LIMIT = float(os.environ.get('JUDGE0_SYNC_WAIT_LIMIT', 20.0))
+DEFAULT_USE_SYNC_WAIT = os.environ.get('JUDGE0_SYNC_WAIT', 'true').lower() == 'true'
+
+
+class PollingStrategy:
+    """
+    Poll scheduling shared by every Judge0Compiler call
+
+    The first poll is scheduled near the language's typical completion time
+    (an exponentially weighted average of previous runs), after which the
+    interval grows by `multiplier` up to `max_interval`. Each delay gets
+    +/- `jitter` so concurrent polls do not synchronise.
+    """
+
+    def __init__(self, initial_delay: float = DEFAULT_INITIAL_DELAY,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 multiplier: float = 1.6,
+                 jitter: float = 0.2,
+                 queue_grace: float = DEFAULT_QUEUE_GRACE,
+                 sync_wait_limit: float = DEFAULT_SYNC_WAIT_LIMIT,
+                 use_sync_wait: bool = DEFAULT_USE_SYNC_WAIT,
+                 smoothing: float = 0.2):
+        self.initial_delay = initial_delay
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.queue_grace = queue_grace
+        self.sync_wait_limit = sync_wait_limit
+        self.use_sync_wait = use_sync_wait
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._observed = {}  # language -> {'avg': float, 'count': int}
+
+    def budget(self, timeout: float) -> float:
+        """Seconds to keep polling: the run's own timeout plus time to sit in Judge0's queue"""
+        return max(float(timeout), 1.0) + self.queue_grace
+
+    def should_wait(self, wall_time_limit: float) -> bool:
+        """Whether a submission is short enough for Judge0's synchronous wait=true mode"""
+        return self.use_sync_wait and wall_time_limit <= self.sync_wait_limit
+
+    def first_delay(self, language: Optional[str]) -> float:
+        """First poll delay, learned from how long this language usually takes"""
+        with self._lock:
+            observed = self._observed.get(language)
+        if not observed:
+            return self.initial_delay
+        # Poll slightly before the expected finish so fast runs return promptly
+        return min(max(observed['avg'] * 0.8, self.initial_delay), self.max_interval)
+
+    def delays(self, language: Optional[str], budget: float) -> Iterator[float]:
+        """
+        Yield the sleep before each poll until `budget` seconds have elapsed
+
+        Args:
+            language: Language key used for per-language tuning
+            budget: Total seconds allowed for polling
+
+        Yields:
+            Seconds to sleep before the next status request
+        """
+        deadline = time.monotonic() + budget
+        delay = self.first_delay(language)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            jittered = delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            yield min(jittered, remaining)
+            delay = min(delay * self.multiplier, self.max_interval)
+
+    def record(self, language: Optional[str], elapsed: float):
+        """Record an observed submit-to-finish time for a language"""
+        if language is None:
+            return
+        with self._lock:
+            observed = self._observed.get(language)
+            if observed is None:
+                self._observed[language] = {'avg': elapsed, 'count': 1}
+            else:
+                observed['avg'] += self.smoothing * (elapsed - observed['avg'])
+                observed['count'] += 1
+
+    def stats(self) -> dict:
+        """Return the learned per-language completion times"""
+        with self._lock:
+            return {
+                language: {'avg_completion': round(observed['avg'], 4), 'samples': observed['count']}
+                for language, observed in self._observed.items()
+            }
+
+
+_shared_strategy: Optional[PollingStrategy] = None
+_shared_strategy_lock = threading.Lock()
+
+
+def get_shared_strategy() -> PollingStrategy:
+    """Return the process-wide polling strategy, creating it on first use"""
+    global _shared_strategy
+    if _shared_strategy is None:
+        with _shared_strategy_lock:
+            if _shared_strategy is None:
+                _shared_strategy = PollingStrategy()
+    return _shared_strategy
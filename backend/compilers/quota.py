@@ -0,0 +1,284 @@
+"""
+Quota-Aware Admission Control for Upstream APIs
+This module paces calls to a metered upstream (the RapidAPI Judge0 plan)
+with a token bucket sized to the plan's requests per second and per day,
+queues callers for a bounded time when the bucket is empty, and sheds new
+work with a retry hint once the queue is full or the plan quota reported
+by the upstream's rate-limit headers runs out.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import logging
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_RATE = float(os.environ.get('JUDGE0_QUOTA_RPS', 10.0))
+DEFAULT_BURST = int(os.environ.get('JUDGE0_QUOTA_BURST', 20))
+DEFAULT_DAILY_LIMIT = int(os.environ.get('JUDGE0_QUOTA_PER_DAY', 0))
+DEFAULT_MAX_WAIT = float(os.environ.get('JUDGE0_QUOTA_MAX_WAIT', 5.0))
+DEFAULT_MAX_QUEUE = int(os.environ.get('JUDGE0_QUOTA_MAX_QUEUE', 100))
+
+DAY_SECONDS = 24 * 60 * 60
+
+# RapidAPI reports every plan quota as X-RateLimit-<quota>-Limit/-Remaining/-Reset
+RATE_LIMIT_HEADER = re.compile(r'x-ratelimit-([\w-]+?)-(limit|remaining|reset)$')
+
+
+class QuotaExceeded(Exception):
+    """
+    Raised instead of admitting a call the quota cannot serve in time
+
+    `status_code` is 429 when the plan quota itself is used up and 503 when
+    the local wait queue is saturated.
+    """
+
+    def __init__(self, retry_after: int, reason: str, status_code: int = 503):
+        super().__init__(f"{reason} - retry in {retry_after} seconds")
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class QuotaLimiter:
+    """
+    Thread-safe token bucket with reservations and a bounded virtual queue
+
+    Every upstream request, submissions and polls alike, takes one token.
+    Tokens refill at `rate` per second up to `burst`. A caller that finds
+    the bucket empty reserves a future token and sleeps until it is due, so
+    the bucket's debt is the queue. `admit` is used for new work: it sheds
+    the call when its wait would exceed `max_wait`, the queue already holds
+    `max_queue` reservations, or the day's quota is gone. `reserve` is used
+    for requests belonging to admitted work (polls) and only paces them.
+    """
+
+    def __init__(self, name: str = 'upstream', rate: float = DEFAULT_RATE,
+                 burst: int = DEFAULT_BURST, daily_limit: int = DEFAULT_DAILY_LIMIT,
+                 max_wait: float = DEFAULT_MAX_WAIT, max_queue: int = DEFAULT_MAX_QUEUE):
+        """
+        Args:
+            name: Upstream name used in logs and errors
+            rate: Requests per second allowed by the plan (0 disables pacing)
+            burst: Requests that may be sent back to back after an idle period
+            daily_limit: Requests allowed per day (0 relies on the upstream's headers)
+            max_wait: Longest time new work may queue for a token (seconds)
+            max_queue: Most reservations allowed to wait at once
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.daily_limit = daily_limit
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._day_started = time.monotonic()
+        self._used_today = 0
+
+        # Plan quotas reported by the upstream: name -> {limit, remaining, reset_at}
+        self._remote = {}
+
+        self._admitted = 0
+        self._reserved = 0
+        self._queued = 0
+        self._wait_seconds = 0.0
+        self._shed = {429: 0, 503: 0}
+        self._throttled = 0
+        self._refunded = 0
+
+    def _refill(self, now: float):
+        if now - self._day_started >= DAY_SECONDS:
+            self._day_started = now
+            self._used_today = 0
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _exhausted_for(self, now: float) -> Optional[float]:
+        """Seconds until the plan quota resets, or None while quota remains"""
+        waits = []
+        if self.daily_limit and self._used_today >= self.daily_limit:
+            waits.append(self._day_started + DAY_SECONDS - now)
+        for quota in self._remote.values():
+            if quota.get('remaining') == 0 and quota.get('reset_at', 0) > now:
+                waits.append(quota['reset_at'] - now)
+        return max(waits) if waits else None
+
+    def _take(self, cost: int, now: float) -> float:
+        """Take `cost` tokens, returning how long the caller must wait for them"""
+        self._used_today += cost
+        if self.rate <= 0:
+            return 0.0
+        self._tokens -= cost
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._queued += 1
+            self._wait_seconds += wait
+        return wait
+
+    def admit(self, cost: int = 1) -> float:
+        """
+        Admit new work, reserving tokens for its first request
+
+        Returns:
+            Seconds the caller must sleep before sending the request
+
+        Raises:
+            QuotaExceeded: 429 if the plan quota is used up, 503 if the wait
+                queue is full or the wait would exceed `max_wait`
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            reset_in = self._exhausted_for(now)
+            if reset_in is not None:
+                self._shed[429] += 1
+                raise QuotaExceeded(max(1, math.ceil(reset_in)),
+                                    f"{self.name} quota exhausted", 429)
+
+            if self.rate > 0 and self._tokens < cost:
+                wait = (cost - self._tokens) / self.rate
+                queued = math.ceil(-self._tokens) if self._tokens < 0 else 0
+                if wait > self.max_wait or queued >= self.max_queue:
+                    self._shed[503] += 1
+                    raise QuotaExceeded(max(1, math.ceil(wait - self.max_wait)),
+                                        f"{self.name} request queue full", 503)
+
+            self._admitted += 1
+            return self._take(cost, now)
+
+    def refund(self, cost: int = 1, wait: float = 0.0):
+        """
+        Give back what `admit` took for work that was then never sent
+
+        Args:
+            cost: The cost passed to `admit`
+            wait: The wait `admit` returned
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._used_today = max(0, self._used_today - cost)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + cost)
+            self._admitted -= 1
+            self._refunded += 1
+            if wait > 0:
+                self._queued -= 1
+                self._wait_seconds -= wait
+
+    def reserve(self, cost: int = 1) -> float:
+        """
+        Reserve tokens for a request of already admitted work (never sheds)
+
+        Returns:
+            Seconds the caller must sleep before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._reserved += 1
+            return self._take(cost, now)
+
+    def acquire(self, cost: int = 1):
+        """Reserve tokens and sleep until they are due"""
+        wait = self.reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Record the plan quotas reported by an upstream response
+
+        Reads RapidAPI's X-RateLimit-<quota>-Limit/-Remaining/-Reset headers;
+        a 429 answer marks the plan exhausted until its Retry-After (or the
+        reported reset) passes.
+        """
+        now = time.monotonic()
+        reported = {}
+        for header, value in headers.items():
+            match = RATE_LIMIT_HEADER.match(header.lower())
+            if not match:
+                continue
+            try:
+                number = int(float(value))
+            except ValueError:
+                continue
+            quota, field = match.groups()
+            reported.setdefault(quota, {})[field] = number
+
+        with self._lock:
+            for quota, fields in reported.items():
+                entry = self._remote.setdefault(quota, {})
+                if 'limit' in fields:
+                    entry['limit'] = fields['limit']
+                if 'remaining' in fields:
+                    entry['remaining'] = fields['remaining']
+                if 'reset' in fields:
+                    entry['reset_at'] = now + fields['reset']
+
+            if status_code == 429:
+                self._throttled += 1
+                try:
+                    retry_after = float(headers.get('Retry-After') or headers.get('retry-after') or 0)
+                except ValueError:
+                    retry_after = 0
+                entry = self._remote.setdefault('throttle', {})
+                entry['remaining'] = 0
+                entry['reset_at'] = now + max(1.0, retry_after)
+                logger.warning(f"⚠️ {self.name} answered 429 - shedding new work for "
+                               f"{max(1.0, retry_after):.0f}s")
+
+    def stats(self) -> dict:
+        """Return bucket occupancy, shed counters and the plan quotas last reported"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                'queued_now': math.ceil(-self._tokens) if self._tokens < 0 else 0,
+                'max_wait': self.max_wait,
+                'max_queue': self.max_queue,
+                'daily_limit': self.daily_limit,
+                'used_today': self._used_today,
+                'admitted': self._admitted,
+                'reserved': self._reserved,
+                'refunded': self._refunded,
+                'queued': self._queued,
+                'total_wait_seconds': round(self._wait_seconds, 3),
+                'shed_429': self._shed[429],
+                'shed_503': self._shed[503],
+                'upstream_429': self._throttled,
+                'upstream': {
+                    quota: {
+                        'limit': entry.get('limit'),
+                        'remaining': entry.get('remaining'),
+                        'reset_in': (round(max(0.0, entry['reset_at'] - now), 1)
+                                     if 'reset_at' in entry else None),
+                    }
+                    for quota, entry in self._remote.items()
+                },
+            }
+
+
+_shared_limiter: Optional[QuotaLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_limiter() -> QuotaLimiter:
+    """Return the process-wide Judge0 quota limiter, creating it on first use"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_limiter_lock:
+            if _shared_limiter is None:
+                _shared_limiter = QuotaLimiter('Judge0 API')
+    return _shared_limiter
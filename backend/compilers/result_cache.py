@@ -0,0 +1,129 @@
+"""
+Content-Addressed Result Cache
+This module keeps finished execution results in memory, keyed on a hash of
+everything that determines a deterministic run, so identical re-runs are
+answered without another Judge0 submission
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_MAX_ENTRIES = int(os.environ.get('JUDGE0_CACHE_SIZE', 512))
+DEFAULT_MAX_BYTES = int(os.environ.get('JUDGE0_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+DEFAULT_TTL = float(os.environ.get('JUDGE0_CACHE_TTL', 600))
+DEFAULT_ENABLED = os.environ.get('JUDGE0_CACHE', 'true').lower() == 'true'
+
+# Fields of a Judge0 submission payload that determine its result
+KEY_FIELDS = ('source_code', 'language_id', 'stdin', 'cpu_time_limit', 'memory_limit', 'wall_time_limit')
+
+
+def make_key(submission: dict) -> str:
+    """Hash the result-determining fields of a Judge0 submission payload"""
+    material = json.dumps([submission.get(field) for field in KEY_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a time-to-live
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or `max_bytes` (approximate size of cached output and error text) is
+    exceeded, and are dropped on lookup once older than `ttl` seconds.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL,
+                 enabled: bool = DEFAULT_ENABLED):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None on a miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value, size: int = 0):
+        """Store `value` under `key`, evicting old entries to stay within bounds"""
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return cache occupancy and hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+_shared_cache: Optional[ResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it on first use"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResultCache()
+    return _shared_cache
@@ -0,0 +1,154 @@
+"""
+Single-Flight Request Coalescing
+This module lets concurrent callers asking for the same work share one
+execution: the first caller for a key runs it, callers arriving while it is
+in flight wait for that result instead of starting their own. A classroom
+submitting the same example at once costs one Judge0 submission.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_ENABLED = os.environ.get('JUDGE0_COALESCE', 'true').lower() == 'true'
+
+
+class _Call:
+    """One in-flight execution and the result its followers wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception: Optional[BaseException] = None
+        self.followers = 0
+
+
+class _Counters:
+    """Counters shared by the thread and asyncio variants"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._leaders = 0
+        self._saved = 0
+        self._max_followers = 0
+
+    def _stats(self, in_flight: int) -> dict:
+        calls = self._leaders + self._saved
+        return {
+            'enabled': self.enabled,
+            'in_flight': in_flight,
+            'executions': self._leaders,
+            'saved_calls': self._saved,
+            'max_followers': self._max_followers,
+            'saved_ratio': round(self._saved / calls, 3) if calls else 0.0,
+        }
+
+
+class SingleFlight(_Counters):
+    """
+    Thread-safe coalescing of identical concurrent calls
+
+    The leader runs `fn` in its own thread; followers block until it
+    finishes and receive the same result, or the same exception.
+    """
+
+    def __init__(self, enabled: bool = DEFAULT_ENABLED):
+        super().__init__(enabled)
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run `fn` once for all concurrent callers with the same `key`
+
+        Returns:
+            (result, shared) where `shared` is True for callers that joined
+            an execution started by another caller
+        """
+        if not self.enabled:
+            return fn(), False
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                call.followers += 1
+                self._saved += 1
+                self._max_followers = max(self._max_followers, call.followers)
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict:
+        """Return in-flight executions and how many upstream calls coalescing saved"""
+        with self._lock:
+            return self._stats(len(self._calls))
+
+
+class AsyncSingleFlight(_Counters):
+    """
+    Asyncio coalescing of identical concurrent calls
+
+    The execution runs in its own task, so a leader whose request is
+    cancelled (client disconnect) doesn't cancel it for its followers.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, enabled: bool = DEFAULT_ENABLED):
+        super().__init__(enabled)
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._followers: Dict[str, int] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await `fn()` once for all concurrent callers with the same `key`
+
+        Returns:
+            (result, shared) where `shared` is True for callers that joined
+            an execution started by another caller
+        """
+        if not self.enabled:
+            return await fn(), False
+
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self._saved += 1
+            self._followers[key] += 1
+            self._max_followers = max(self._max_followers, self._followers[key])
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._followers[key] = 0
+            self._leaders += 1
+            task.add_done_callback(lambda _: self._forget(key))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str):
+        self._calls.pop(key, None)
+        self._followers.pop(key, None)
+
+    def stats(self) -> dict:
+        """Return in-flight executions and how many upstream calls coalescing saved"""
+        return self._stats(len(self._calls))
@@ -0,0 +1,94 @@
+"""
+Local Syntax Checking Engine
+This module answers syntax-only requests without a Judge0 round trip:
+Python is compiled in-process and, on hosts where local execution is
+enabled, c/cpp/javascript go through the local toolchain's syntax-only
+mode when one is installed. Languages without a local checker fall back
+to the remote check.
+"""
+
+import os
+import threading
+import logging
+from typing import Optional
+
+from .base_compiler import CompilerResult, StatusCallback
+from .local_compiler import ALIASES, LocalCompiler
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_ENABLED = os.environ.get('LOCAL_SYNTAX_CHECK', 'true').lower() == 'true'
+# Toolchains process untrusted code on this host, so they follow the local execution opt-in
+DEFAULT_TOOLCHAIN_CHECKS = (
+    os.environ.get('EXECUTION_BACKEND', 'judge0').lower() == 'local'
+    or os.environ.get('LOCAL_EXECUTION', 'false').lower() == 'true'
+)
+
+# Languages checked with a local toolchain (python needs none)
+TOOLCHAIN_LANGUAGES = ('c', 'cpp', 'javascript')
+
+
+class SyntaxChecker:
+    """
+    Routes syntax checks to the fastest local checker for each language
+    """
+
+    def __init__(self, local: Optional[LocalCompiler] = None, enabled: bool = DEFAULT_ENABLED,
+                 toolchains: bool = DEFAULT_TOOLCHAIN_CHECKS):
+        """
+        Args:
+            local: LocalCompiler whose toolchains run syntax-only checks
+                   (a private one without a warm pool is created by default)
+            enabled: When False every check falls back to the remote backend
+            toolchains: Check c/cpp/javascript with local toolchains; when
+                        False only Python is checked locally
+        """
+        self.enabled = enabled
+        self.toolchains = enabled and toolchains
+        self.local = local or (LocalCompiler(warm_pool_size=0) if self.toolchains else None)
+
+    def supports(self, language: str) -> bool:
+        """Whether `language` can be checked without a remote execution"""
+        if not self.enabled:
+            return False
+        language = ALIASES.get(language.lower().strip(), language.lower().strip())
+        if language == 'python':
+            return True
+        return (self.toolchains and language in TOOLCHAIN_LANGUAGES
+                and language in self.local.toolchains and self.local.is_available())
+
+    def check(self, code: str, language: str,
+              on_status: Optional[StatusCallback] = None) -> Optional[CompilerResult]:
+        """
+        Check `code` locally
+
+        Returns:
+            CompilerResult with structured diagnostics, or None when no local
+            checker exists for `language`
+        """
+        if not self.supports(language):
+            return None
+        if self.local is None:
+            return LocalCompiler.check_python_syntax(code, on_status)
+        return self.local.check_syntax(code, language, on_status=on_status)
+
+    def get_checked_languages(self) -> list:
+        """Languages answered locally on this host"""
+        if not self.enabled:
+            return []
+        return ['python'] + [language for language in TOOLCHAIN_LANGUAGES if self.supports(language)]
+
+
+# Shared checker for all compiler instances in the process
+_shared_checker: Optional[SyntaxChecker] = None
+_shared_checker_lock = threading.Lock()
+
+def get_shared_checker() -> SyntaxChecker:
+    """Return the process-wide syntax checker, creating it on first use"""
+    global _shared_checker
+    if _shared_checker is None:
+        with _shared_checker_lock:
+            if _shared_checker is None:
+                _shared_checker = SyntaxChecker()
+    return _shared_checker
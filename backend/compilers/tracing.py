@@ -0,0 +1,192 @@
+"""
+Per-Request Tracing
+This module records lightweight spans (language detection, job queueing,
+quota waits, the Judge0 submit, every poll, formatting) against a request
+id carried in a context variable, so the stages of one request can be
+told apart. A finished trace is logged as one structured JSON line and can
+be returned to the client as a `timing` block.
+"""
+
+import contextvars
+import json
+import os
+import re
+import time
+import uuid
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_TRACE_LOG = os.environ.get('TRACE_LOG', 'true').lower() == 'true'
+DEFAULT_TRACE_LOG_MIN_MS = float(os.environ.get('TRACE_LOG_MIN_MS', 0))
+
+# Client-supplied request ids are kept only if they look like ids
+REQUEST_ID_PATTERN = re.compile(r'^[\w.:-]{1,64}$')
+
+_current: contextvars.ContextVar[Optional['Trace']] = contextvars.ContextVar('trace', default=None)
+
+
+class Span:
+    """One timed stage of a request; offsets are relative to the trace start"""
+
+    __slots__ = ('name', 'start', 'duration', 'attrs')
+
+    def __init__(self, name: str, start: float, attrs: dict):
+        self.name = name
+        self.start = start
+        self.duration: Optional[float] = None
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin: float) -> dict:
+        span = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 2),
+            'duration_ms': round((self.duration or 0.0) * 1000, 2),
+        }
+        span.update(self.attrs)
+        return span
+
+
+class _SpanContext:
+    def __init__(self, trace: 'Trace', name: str, attrs: dict):
+        self._trace = trace
+        self._span = Span(name, time.perf_counter(), attrs)
+
+    def __enter__(self) -> Span:
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.duration = time.perf_counter() - self._span.start
+        if exc_type is not None:
+            self._span.attrs['error'] = exc_type.__name__
+        self._trace.spans.append(self._span)
+        return False
+
+
+class _NoSpan:
+    """Stands in for a span when no trace is active"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Trace:
+    """
+    The spans of one request
+
+    Spans are appended from whichever thread or task runs the stage (list
+    appends are atomic), so background jobs and coalesced executions report
+    into the trace of the request that started them.
+    """
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        self.name = name
+        self.request_id = (request_id if request_id and REQUEST_ID_PATTERN.match(request_id)
+                           else uuid.uuid4().hex[:16])
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+        self.attrs = {}
+
+    def span(self, name: str, **attrs) -> _SpanContext:
+        return _SpanContext(self, name, attrs)
+
+    def add(self, name: str, duration: float, **attrs):
+        """Record a stage that just ended after `duration` seconds"""
+        span = Span(name, time.perf_counter() - duration, attrs)
+        span.duration = duration
+        self.spans.append(span)
+
+    def annotate(self, **attrs):
+        """Attach request-level attributes such as the language or a cache hit"""
+        self.attrs.update(attrs)
+
+    def count(self, **amounts):
+        """Add to request-level totals such as the Judge0 bytes transferred"""
+        for name, amount in amounts.items():
+            self.attrs[name] = self.attrs.get(name, 0) + amount
+
+    def timing(self) -> dict:
+        """Total time, time per stage and every span, in milliseconds"""
+        stages = {}
+        for span in self.spans:
+            stages[span.name] = stages.get(span.name, 0.0) + (span.duration or 0.0) * 1000
+        timing = {
+            'request_id': self.request_id,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'stages_ms': {name: round(total, 2) for name, total in stages.items()},
+            'spans': [span.to_dict(self.started) for span in sorted(self.spans, key=lambda span: span.start)],
+        }
+        timing.update(self.attrs)
+        return timing
+
+    def log(self, **attrs):
+        """Emit the trace as one JSON log line (subject to TRACE_LOG and TRACE_LOG_MIN_MS)"""
+        if not DEFAULT_TRACE_LOG:
+            return
+        record = {'trace': self.name}
+        record.update(self.timing())
+        record.update(attrs)
+        if record['total_ms'] >= DEFAULT_TRACE_LOG_MIN_MS:
+            logger.info(json.dumps(record, default=str))
+
+
+def start_trace(name: str, request_id: Optional[str] = None) -> tuple:
+    """
+    Make a new trace current
+
+    Returns:
+        (trace, token) - pass the token to `end_trace` to restore the previous trace
+    """
+    trace = Trace(name, request_id)
+    return trace, _current.set(trace)
+
+
+def end_trace(token: contextvars.Token):
+    _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def span(name: str, **attrs):
+    """Time a stage of the current request (a no-op outside a trace)"""
+    trace = _current.get()
+    if trace is None:
+        return _NO_SPAN
+    return trace.span(name, **attrs)
+
+
+def add_span(name: str, duration: float, **attrs):
+    """Record a stage of the current request that just ended after `duration` seconds"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, duration, **attrs)
+
+
+def annotate(**attrs):
+    """Attach attributes to the current request's trace"""
+    trace = _current.get()
+    if trace is not None:
+        trace.annotate(**attrs)
+
+
+def count(**amounts):
+    """Add to totals on the current request's trace"""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(**amounts)
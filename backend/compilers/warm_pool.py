@@ -0,0 +1,415 @@
+"""
+Warm Interpreter Pools for Local Execution
+This module keeps pre-started, resource-limited python/node worker processes
+waiting for jobs, so a local run of an interpreted language skips the
+interpreter start-up that otherwise dominates short student programs
+"""
+
+import json
+import os
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import logging
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults can be overridden per deployment through the environment
+DEFAULT_POOL_SIZE = int(os.environ.get('LOCAL_WARM_POOL_SIZE', 2))
+DEFAULT_MAX_JOBS = int(os.environ.get('LOCAL_WARM_POOL_MAX_JOBS', 1))
+DEFAULT_MAX_RSS_MB = int(os.environ.get('LOCAL_WARM_POOL_MAX_RSS_MB', 64))
+
+# Python worker: preloads common modules, then for every control line resets
+# its stdio files, tightens RLIMIT_CPU for the job, runs main.py as __main__
+# with the argv of a cold `python -I main.py` and reports the exit code on the
+# status pipe. The control and status pipes stay open for the next job but
+# are not inherited by processes the program starts.
+PYTHON_BOOTSTRAP = r'''
+import io, json, os, resource, runpy, sys, traceback
+import collections, itertools, math, random, re, string
+control = os.fdopen(int(sys.argv[1]), 'r')
+status = os.fdopen(int(sys.argv[2]), 'w')
+for pipe in (control, status):
+    os.set_inheritable(pipe.fileno(), False)
+executable = sys.executable
+for line in control:
+    job = json.loads(line)
+    os.lseek(0, 0, os.SEEK_SET)
+    for fd in (1, 2):
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+    sys.stdin = io.TextIOWrapper(open(0, 'rb', closefd=False))
+    sys.stdout = io.TextIOWrapper(open(1, 'wb', closefd=False), write_through=True)
+    sys.stderr = io.TextIOWrapper(open(2, 'wb', closefd=False), write_through=True)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = min(int(usage.ru_utime + usage.ru_stime) + job['cpu'], hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    path = job['source']
+    sys.argv = [path]
+    if hasattr(sys, 'orig_argv'):
+        sys.orig_argv = [executable, '-I', path]
+    code = 0
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        code = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    status.write(json.dumps({'exit_code': code}) + '\n')
+    status.flush()
+'''
+
+# Node worker: waits for one control line, closes the control pipe and runs
+# main.js as the main module (require.main, process.argv and execArgv as in a
+# cold `node main.js`). Node cannot re-point its stdio at new files, so every
+# node worker serves a single job.
+NODE_BOOTSTRAP = r'''
+const fs = require('fs');
+const path = require('path');
+const Module = require('module');
+const fd = parseInt(process.argv[1], 10);
+const buf = Buffer.alloc(1);
+let line = '';
+for (;;) {
+  if (fs.readSync(fd, buf, 0, 1, null) === 0) process.exit(0);
+  if (buf[0] === 10) break;
+  line += String.fromCharCode(buf[0]);
+}
+fs.closeSync(fd);
+const job = JSON.parse(line);
+process.argv = [process.argv[0], path.resolve(job.source)];
+process.execArgv = process.execArgv.filter((arg, index, all) => arg !== '-e' && all[index - 1] !== '-e');
+Module.runMain();
+'''
+
+
+class WarmWorker:
+    """A pre-started interpreter process waiting for a job in its own directory"""
+
+    def __init__(self, language: str, process: subprocess.Popen, work_dir: str,
+                 source: str, control_fd: int, status_fd: Optional[int], cgroup: Optional[str] = None,
+                 remove_cgroup: Optional[Callable[[Optional[str]], None]] = None):
+        self.language = language
+        self.process = process
+        self.work_dir = work_dir
+        self.source = source
+        self.control_fd = control_fd
+        self.status_fd = status_fd
+        self.cgroup = cgroup
+        self._remove_cgroup = remove_cgroup
+        self.jobs = 0
+        self.returning = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def rss_mb(self) -> float:
+        """Resident memory of the worker from /proc (0 when unavailable)"""
+        try:
+            with open(f'/proc/{self.process.pid}/statm') as handle:
+                pages = int(handle.read().split()[1])
+            return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        except (OSError, ValueError, IndexError):
+            return 0.0
+
+    def destroy(self):
+        """Kill the worker's process group and remove its directory and cgroup"""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for fd in (self.control_fd, self.status_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        if self._remove_cgroup is not None:
+            self._remove_cgroup(self.cgroup)
+
+
+class WarmPool:
+    """
+    Per-language pools of warm interpreter workers
+
+    A background thread keeps `size` idle workers per language. A job borrows
+    one, and afterwards the worker is recycled (killed and replaced) once it
+    has served `max_jobs` jobs, exceeds `max_rss_mb`, or did not finish
+    cleanly; otherwise it goes back to the pool. Node workers always serve a
+    single job.
+    """
+
+    # Languages that can run in a warm worker
+    LANGUAGES = ('python', 'javascript')
+
+    def __init__(self, compiler, languages: Optional[list] = None,
+                 size: int = DEFAULT_POOL_SIZE,
+                 max_jobs: int = DEFAULT_MAX_JOBS,
+                 max_rss_mb: int = DEFAULT_MAX_RSS_MB):
+        """
+        Args:
+            compiler: LocalCompiler whose toolchains and limits the workers use
+            languages: Languages to pool (defaults to every supported one installed)
+            size: Idle workers kept per language
+            max_jobs: Jobs a python worker serves before it is recycled
+            max_rss_mb: Resident memory above which a worker is recycled
+        """
+        self.compiler = compiler
+        self.languages = [
+            language for language in (languages or self.LANGUAGES)
+            if language in self.LANGUAGES and language in compiler.toolchains
+        ]
+        self.size = size
+        self.max_jobs = max(1, max_jobs)
+        self.max_rss_mb = max_rss_mb
+
+        self._idle = {language: deque() for language in self.languages}
+        # Borrowed workers that may come back to the pool, so refill doesn't overshoot
+        self._returning = {language: 0 for language in self.languages}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._counters = {
+            language: {'hits': 0, 'misses': 0, 'spawned': 0, 'recycled': 0,
+                       'recycled_memory': 0, 'reused': 0}
+            for language in self.languages
+        }
+
+        self._thread = threading.Thread(target=self._refill_loop, name='warm-pool', daemon=True)
+        self._thread.start()
+
+    def _spawn(self, language: str) -> WarmWorker:
+        """Start one worker for `language`, rlimited like a cold run"""
+        compiler = self.compiler
+        toolchain = compiler.toolchains[language]
+        work_dir = tempfile.mkdtemp(prefix='sefa-warm-', dir=compiler.work_dir)
+        paths = {name: os.path.join(work_dir, f'.run.{name}') for name in ('stdin', 'stdout', 'stderr')}
+        for path in paths.values():
+            open(path, 'wb').close()
+
+        control_r, control_w = os.pipe()
+        status_r, status_w = (os.pipe() if language == 'python' else (None, None))
+        pass_fds = [control_r] + ([status_w] if status_w is not None else [])
+
+        cpu_limit = 15
+        jobs = self.max_jobs if language == 'python' else 1
+        address_space = (compiler.memory_limit_mb * 1024 * 1024
+                         if toolchain['limit_address_space'] else None)
+        if language == 'python':
+            command = [toolchain['exe'], '-I', '-c', PYTHON_BOOTSTRAP, str(control_r), str(status_w)]
+        else:
+            command = [toolchain['exe'], f'--max-old-space-size={compiler.memory_limit_mb}',
+                       '-e', NODE_BOOTSTRAP, str(control_r)]
+
+        cgroup = compiler._create_cgroup()
+        try:
+            with open(paths['stdin'], 'rb') as stdin_file, \
+                    open(paths['stdout'], 'wb') as stdout_file, \
+                    open(paths['stderr'], 'wb') as stderr_file:
+                process = subprocess.Popen(
+                    command, cwd=work_dir, env=compiler._environment(work_dir),
+                    stdin=stdin_file, stdout=stdout_file, stderr=stderr_file,
+                    pass_fds=pass_fds, start_new_session=True,
+                    preexec_fn=compiler._limits(cpu_limit, address_space, compiler.max_output,
+                                                compiler.max_processes, cpu_hard=cpu_limit * jobs + 1,
+                                                cgroup=cgroup)
+                )
+        except OSError:
+            compiler.remove_cgroup(cgroup)
+            raise
+        os.close(control_r)
+        if status_w is not None:
+            os.close(status_w)
+
+        with self._cond:
+            self._counters[language]['spawned'] += 1
+        return WarmWorker(language, process, work_dir, toolchain['source'], control_w, status_r,
+                          cgroup, compiler.remove_cgroup)
+
+    def _deficit(self) -> dict:
+        deficit = {}
+        for language in self.languages:
+            missing = self.size - len(self._idle[language]) - self._returning[language]
+            if missing > 0:
+                deficit[language] = missing
+        return deficit
+
+    def _refill_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._deficit(), timeout=5)
+                if self._closed:
+                    return
+                deficit = self._deficit()
+            for language, missing in deficit.items():
+                for _ in range(missing):
+                    try:
+                        worker = self._spawn(language)
+                    except OSError as e:
+                        logger.error(f"❌ Failed to start warm {language} worker: {e}")
+                        time.sleep(1)
+                        break
+                    with self._cond:
+                        if self._closed:
+                            worker.destroy()
+                            return
+                        self._idle[language].append(worker)
+
+    def _acquire(self, language: str) -> WarmWorker:
+        """Borrow an idle worker, or start one synchronously if none is warm"""
+        with self._cond:
+            idle = self._idle[language]
+            while idle:
+                worker = idle.popleft()
+                if worker.alive:
+                    self._counters[language]['hits'] += 1
+                    self._borrow(worker)
+                    return worker
+                worker.destroy()
+            self._counters[language]['misses'] += 1
+            self._cond.notify()
+        worker = self._spawn(language)
+        with self._cond:
+            self._borrow(worker)
+        return worker
+
+    def _borrow(self, worker: WarmWorker):
+        """Account for a borrowed worker; call with the lock held"""
+        worker.returning = worker.status_fd is not None and worker.jobs + 1 < self.max_jobs
+        if worker.returning:
+            self._returning[worker.language] += 1
+        else:
+            self._cond.notify()
+
+    def _release(self, worker: WarmWorker, clean: bool):
+        """Return a worker to its pool or recycle it"""
+        counters = self._counters[worker.language]
+        over_memory = self.max_rss_mb and worker.rss_mb() > self.max_rss_mb
+        reusable = (clean and worker.status_fd is not None and worker.alive
+                    and worker.jobs < self.max_jobs and not over_memory)
+        with self._cond:
+            if worker.returning:
+                self._returning[worker.language] -= 1
+            if reusable and not self._closed and len(self._idle[worker.language]) < self.size:
+                counters['reused'] += 1
+                self._idle[worker.language].append(worker)
+                return
+            counters['recycled'] += 1
+            if over_memory:
+                counters['recycled_memory'] += 1
+            self._cond.notify()
+        worker.destroy()
+
+    def run(self, language: str, code: str, stdin_data: str, wall_timeout: float,
+            cpu_limit: int) -> Optional[tuple]:
+        """
+        Run `code` in a warm worker
+
+        Returns:
+            (returncode, stdout, stderr, timed_out) like a cold run,
+            or None if `language` is not pooled
+        """
+        if language not in self._idle or self._closed:
+            return None
+
+        worker = self._acquire(language)
+        worker.jobs += 1
+        try:
+            with open(os.path.join(worker.work_dir, worker.source), 'w', encoding='utf-8') as handle:
+                handle.write(code)
+            with open(os.path.join(worker.work_dir, '.run.stdin'), 'wb') as handle:
+                handle.write(stdin_data.encode('utf-8'))
+
+            job = json.dumps({'source': worker.source, 'cpu': cpu_limit}) + '\n'
+            os.write(worker.control_fd, job.encode('utf-8'))
+        except OSError:
+            self._release(worker, clean=False)
+            return None
+
+        deadline = time.monotonic() + wall_timeout
+        returncode, timed_out, clean = self._wait(worker, deadline)
+
+        stdout = self.compiler._read_capped(os.path.join(worker.work_dir, '.run.stdout'))
+        stderr = self.compiler._read_capped(os.path.join(worker.work_dir, '.run.stderr'))
+        self._release(worker, clean)
+        return returncode, stdout, stderr, timed_out
+
+    def _wait(self, worker: WarmWorker, deadline: float) -> tuple:
+        """Wait for the job to finish; returns (returncode, timed_out, worker_still_usable)"""
+        if worker.status_fd is not None:
+            buffer = b''
+            while time.monotonic() < deadline:
+                ready, _, _ = select.select([worker.status_fd], [], [], max(0.0, deadline - time.monotonic()))
+                if not ready:
+                    continue
+                chunk = os.read(worker.status_fd, 4096)
+                if not chunk:
+                    break  # Worker died (os._exit, signal, rlimit)
+                buffer += chunk
+                if buffer.endswith(b'\n'):
+                    return json.loads(buffer)['exit_code'], False, True
+        try:
+            worker.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            return worker.process.returncode, False, False
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(worker.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            worker.process.wait()
+            return worker.process.returncode, True, False
+
+    def stats(self) -> dict:
+        """Return pool sizes, hit rates and recycle counts per language"""
+        with self._cond:
+            languages = {}
+            for language in self.languages:
+                counters = dict(self._counters[language])
+                borrowed = counters['hits'] + counters['misses']
+                counters['idle'] = len(self._idle[language])
+                counters['hit_rate'] = round(counters['hits'] / borrowed, 4) if borrowed else 0.0
+                languages[language] = counters
+            return {
+                'size': self.size,
+                'max_jobs': self.max_jobs,
+                'max_rss_mb': self.max_rss_mb,
+                'languages': languages,
+            }
+
+    def close(self):
+        """Stop refilling and kill every idle worker"""
+        with self._cond:
+            self._closed = True
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            for idle in self._idle.values():
+                idle.clear()
+            self._cond.notify_all()
+        for worker in workers:
+            worker.destroy()
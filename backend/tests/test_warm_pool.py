@@ -0,0 +1,70 @@
+"""
+Warm Pool Parity Tests
+A program must behave the same in a warm worker as in a cold run: same
+output, same argv, same main-module detection.
+
+Run with: python -m pytest backend/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compilers.local_compiler import LocalCompiler
+
+PROGRAMS = {
+    'javascript': [
+        'function main() { console.log("hi", process.argv.length); }\n'
+        'if (require.main === module) main();\n',
+        'console.log(JSON.stringify(process.execArgv), require.main === module, process.mainModule === module);\n',
+    ],
+    'python': [
+        'import sys\nprint(sys.argv)\n',
+        'import os\n'
+        'def inheritable(fd):\n'
+        '    try:\n'
+        '        return os.get_inheritable(fd)\n'
+        '    except OSError:\n'
+        '        return False\n'
+        'print([fd for fd in range(3, 256) if inheritable(fd)])\n',
+    ],
+}
+
+
+class WarmPoolParityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cold = LocalCompiler(warm_pool_size=0)
+        cls.warm = LocalCompiler(warm_pool_size=1)
+        if cls.warm.warm_pool is None:
+            raise unittest.SkipTest('warm pools need the resource module')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.warm.close()
+
+    def assert_same(self, language, code):
+        if language not in self.warm.warm_pool.languages:
+            self.skipTest(f'no {language} toolchain')
+        cold = self.cold.compile_and_run(code, language, timeout=10)
+        warm = self.warm.compile_and_run(code, language, timeout=10)
+        self.assertTrue(cold.success, cold.error)
+        self.assertEqual((warm.success, warm.output), (cold.success, cold.output))
+
+    def test_node_main_module_guard(self):
+        self.assert_same('javascript', PROGRAMS['javascript'][0])
+
+    def test_node_argv_and_main_module(self):
+        self.assert_same('javascript', PROGRAMS['javascript'][1])
+
+    def test_python_argv(self):
+        self.assert_same('python', PROGRAMS['python'][0])
+
+    def test_python_control_pipes_not_inherited(self):
+        self.assert_same('python', PROGRAMS['python'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
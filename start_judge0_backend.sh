@@ -33,4 +33,4 @@ fi
 # Start the Flask backend
 echo "🌐 Starting Flask backend server..."
 cd backend
-python -m api.web_interface
+python -m api.serve